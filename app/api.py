@@ -0,0 +1,348 @@
+import asyncio
+import bisect
+import hashlib
+import json
+from typing import Any
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import HTMLResponse
+from reflex.config import get_config
+from app.middleware import PathGZipMiddleware
+from app.services.analytics_service import (
+    EVENT_STATS,
+    track_event,
+    get_event_writer,
+    get_stats_aggregator,
+)
+from app.services.firebase_service import (
+    settings_cache,
+    provider_cache,
+    provider_catalog,
+    prerendered_pages,
+    single_flight,
+    catalog_columns,
+    decode_provider_cursor,
+    encode_provider_cursor,
+    get_app_settings,
+    get_provider,
+    get_providers,
+    query_providers,
+    search_catalog,
+)
+from app.services.columns import ProviderColumns
+from app.services.metrics import render_prometheus
+from app.services.prerender import (
+    HOME_PATH,
+    HOME_SECTION_LIMIT,
+    PRERENDERED_PREFIX,
+    PrerenderedPage,
+    business_path,
+    render_business_page,
+    render_home_page,
+)
+from app.services.resilience import supabase_breaker, retry_budget
+from app.state import DEFAULT_APP_SETTINGS
+
+api = FastAPI()
+# Reflex mounts the whole app inside ``api``, so compression is limited to
+# the routes defined here.
+api.add_middleware(
+    PathGZipMiddleware, prefixes=("/api/", PRERENDERED_PREFIX), minimum_size=1000
+)
+PRERENDER_MAX_AGE = getattr(get_config(), "prerender_max_age_seconds", 60)
+CATALOG_PAGE_SIZE = 20
+CATALOG_MAX_PAGE_SIZE = 100
+
+
+@api.post("/api/track", status_code=204)
+async def track(request: Request) -> Response:
+    """Beacon endpoint for provider interaction events.
+
+    navigator.sendBeacon posts the payload as text/plain, so the body is
+    decoded by hand instead of through a pydantic model.
+    """
+    try:
+        payload = json.loads(await request.body())
+        event_type = payload["event_type"]
+        provider_id = int(payload["provider_id"])
+    except (ValueError, KeyError, TypeError):
+        return Response(status_code=400)
+    if event_type not in EVENT_STATS:
+        return Response(status_code=400)
+    # Unknown ids would otherwise be counted (and flushed) as real providers.
+    if await get_provider(provider_id) is None:
+        return Response(status_code=400)
+    await track_event(event_type, provider_id)
+    return Response(status_code=204)
+
+
+def _gauges() -> dict[str, float]:
+    gauges = {}
+    for prefix, values in (
+        ("analytics_events", get_event_writer().metrics()),
+        ("analytics_stats", get_stats_aggregator().metrics()),
+        ("settings_cache", settings_cache.metrics()),
+        ("provider_catalog", provider_catalog.metrics()),
+        ("provider_cache", provider_cache.metrics()),
+        ("prerendered_pages", prerendered_pages.metrics()),
+        ("single_flight", single_flight.metrics()),
+        ("retry_budget", retry_budget.metrics()),
+    ):
+        for key, value in values.items():
+            gauges[f"urbanhand_{prefix}_{key}"] = value
+    breaker = supabase_breaker.metrics()
+    for key, value in breaker.items():
+        if key != "state":
+            gauges[f"urbanhand_supabase_breaker_{key}"] = value
+    for state in ("closed", "open", "half_open"):
+        gauges[f"urbanhand_supabase_breaker_{state}"] = int(breaker["state"] == state)
+    return gauges
+
+
+@api.get("/metrics")
+async def metrics() -> Response:
+    """Data-layer metrics in the Prometheus text exposition format."""
+    return Response(
+        content=render_prometheus(_gauges()),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already names ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {c.strip().removeprefix("W/") for c in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _page_response(request: Request, page: PrerenderedPage) -> Response:
+    headers = {
+        "ETag": page.etag,
+        "Cache-Control": f"public, max-age={PRERENDER_MAX_AGE}, "
+        f"stale-while-revalidate={PRERENDER_MAX_AGE * 5}",
+    }
+    if _etag_matches(request, page.etag):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(page.html, headers=headers)
+
+
+async def _render_home() -> PrerenderedPage | None:
+    settings, providers = await asyncio.gather(get_app_settings(), get_providers())
+    columns = catalog_columns() if providers else None
+    if columns is None:
+        return None
+    featured = columns.featured_providers()[:HOME_SECTION_LIMIT]
+    top_rated = columns.top_rated()[:HOME_SECTION_LIMIT]
+    return prerendered_pages.set(
+        HOME_PATH,
+        render_home_page(settings or DEFAULT_APP_SETTINGS, featured, top_rated),
+        frozenset(p["id"] for p in featured + top_rated),
+        top_rated[-1]["rating"] if len(top_rated) == HOME_SECTION_LIMIT else None,
+    )
+
+
+async def _render_business(provider_id: int) -> PrerenderedPage | None:
+    settings, provider = await asyncio.gather(
+        get_app_settings(), get_provider(provider_id)
+    )
+    if provider is None:
+        return None
+    return prerendered_pages.set(
+        business_path(provider_id),
+        render_business_page(settings or DEFAULT_APP_SETTINGS, provider),
+        frozenset((provider_id,)),
+    )
+
+
+@api.get(PRERENDERED_PREFIX)
+async def prerendered_home(request: Request) -> Response:
+    """Static HTML of the home page, for visitors the app has not reached yet.
+
+    Shared links and crawlers get content in the first response instead of
+    after the websocket connects; links on the page lead into the live app.
+    """
+    page = prerendered_pages.get(HOME_PATH)
+    if page is None:
+        page = await single_flight.do("prerender:/", _render_home)
+    if page is None:
+        # The catalog could not be loaded; serve the bare page uncached.
+        return HTMLResponse(
+            render_home_page(DEFAULT_APP_SETTINGS, [], []),
+            headers={"Cache-Control": "no-store"},
+        )
+    return _page_response(request, page)
+
+
+@api.get(PRERENDERED_PREFIX + "/business/{provider_id}")
+async def prerendered_business(request: Request, provider_id: int) -> Response:
+    """Static HTML of one business profile."""
+    page = prerendered_pages.get(business_path(provider_id))
+    if page is None:
+        page = await single_flight.do(
+            f"prerender:{business_path(provider_id)}",
+            lambda: _render_business(provider_id),
+        )
+    if page is None:
+        return Response(status_code=404)
+    return _page_response(request, page)
+
+
+def _catalog_headers(etag: str) -> dict[str, str]:
+    # Clients may keep a copy but must revalidate it, which costs a 304.
+    return {"ETag": etag, "Cache-Control": "public, no-cache"}
+
+
+def _content_etag(payload: Any) -> str:
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode())
+    return '"' + digest.hexdigest()[:32] + '"'
+
+
+def _json_response(request: Request, etag: str, payload: Any) -> Response:
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=_catalog_headers(etag))
+    return Response(
+        json.dumps(payload, separators=(",", ":")),
+        media_type="application/json",
+        headers=_catalog_headers(etag),
+    )
+
+
+async def _catalog() -> ProviderColumns:
+    await get_providers()
+    columns = catalog_columns()
+    if columns is None:
+        raise HTTPException(status_code=503, detail="Catalog unavailable")
+    return columns
+
+
+def _page(items: list[dict], limit: int, offset: int, more: bool) -> dict[str, Any]:
+    return {
+        "items": items,
+        "limit": limit,
+        "offset": offset,
+        "next_offset": offset + limit if more else None,
+    }
+
+
+def _paginate(providers: list[dict], limit: int, offset: int) -> dict[str, Any]:
+    end = offset + limit
+    return _page(providers[offset:end], limit, offset, end < len(providers))
+
+
+def _rank_key(provider: dict) -> tuple[float, int]:
+    return -float(provider.get("rating") or 0), provider["id"]
+
+
+def _cursor_key(cursor: str) -> tuple[float, int]:
+    """The ``_rank_key`` of the last provider a cursor was issued for."""
+    try:
+        rating, provider_id = decode_provider_cursor(cursor)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(rating, (int, float)) or not isinstance(provider_id, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return -float(rating), provider_id
+
+
+@api.get("/api/providers")
+async def list_providers(
+    request: Request,
+    category: str | None = None,
+    min_rating: float = Query(0.0, ge=0, le=5),
+    featured: bool | None = None,
+    limit: int = Query(CATALOG_PAGE_SIZE, ge=1, le=CATALOG_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    cursor: str | None = None,
+) -> Response:
+    """Providers best rated first (ties by id), optionally filtered.
+
+    A worker without the catalog loaded pages in Postgres through
+    ``query_providers`` rather than pulling every row for one page; both
+    paths return the same order. Each page carries a ``next_cursor``;
+    passing it back as ``cursor`` (which takes precedence over ``offset``)
+    seeks past the last provider seen, so a deep page costs Postgres an
+    index seek rather than an offset scan.
+    """
+    after = None if cursor is None else _cursor_key(cursor)
+    if after is not None:
+        offset = 0
+    columns = None
+    if provider_catalog.loaded:
+        # Reloads a snapshot past its TTL; a fresh one costs nothing.
+        await get_providers()
+        columns = catalog_columns()
+    if columns is None:
+        items, next_cursor = await query_providers(
+            category=category,
+            min_rating=min_rating,
+            featured=featured,
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
+        )
+        payload = _page(items, limit, offset, next_cursor is not None)
+        if after is not None:
+            payload["next_offset"] = None
+        payload["next_cursor"] = next_cursor
+        return _json_response(request, _content_etag(payload), payload)
+    etag = await provider_catalog.etag()
+    if _etag_matches(request, etag):
+        return _json_response(request, etag, None)
+    providers = columns.ranked(category, min_rating, featured)
+    if after is not None:
+        providers = providers[bisect.bisect_right(providers, after, key=_rank_key) :]
+    payload = _paginate(providers, limit, offset)
+    items = payload["items"]
+    more = payload["next_offset"] is not None
+    if after is not None:
+        payload["next_offset"] = None
+    payload["next_cursor"] = (
+        encode_provider_cursor(items[-1]["rating"], items[-1]["id"]) if more else None
+    )
+    return _json_response(request, etag, payload)
+
+
+@api.get("/api/providers/search")
+async def search_providers(
+    request: Request,
+    q: str,
+    category: str | None = None,
+    min_rating: float = Query(0.0, ge=0, le=5),
+    limit: int = Query(CATALOG_PAGE_SIZE, ge=1, le=CATALOG_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+) -> Response:
+    """Providers matching ``q``, best match first, as on the search page."""
+    columns = await _catalog()
+    etag = await provider_catalog.etag()
+    if _etag_matches(request, etag):
+        return _json_response(request, etag, None)
+    # One extra match tells whether there is a next page.
+    end = offset + limit + 1
+    providers = search_catalog(q, end, columns.accepts(category, min_rating))
+    if providers is None:
+        providers = columns.filter(category, min_rating, limit=end)
+    return _json_response(request, etag, _paginate(providers, limit, offset))
+
+
+@api.get("/api/providers/{provider_id}")
+async def provider_detail(request: Request, provider_id: int) -> Response:
+    """One provider, from the catalog or the single-provider cache."""
+    # Looked up before any validator check, so If-None-Match: * cannot turn
+    # an unknown id into a 304.
+    provider = await get_provider(provider_id)
+    if provider is None:
+        raise HTTPException(status_code=404, detail="Provider not found")
+    return _json_response(request, _content_etag(provider), provider)
+
+
+@api.get("/api/categories")
+async def list_categories(request: Request) -> Response:
+    """Enabled service categories from the app settings."""
+    settings = await get_app_settings() or DEFAULT_APP_SETTINGS
+    categories = [
+        category
+        for category in settings.get("service_categories", [])
+        if category.get("enabled", True)
+    ]
+    return _json_response(request, _content_etag(categories), categories)
\ No newline at end of file
@@ -17,6 +17,7 @@ from app.pages.owner.dashboard import owner_dashboard_page
 from app.state import UIState
 from app.states.admin_state import AdminState
 from app.states.business_owner_auth_state import BusinessOwnerAuthState
+from app.api import api
 
 
 def index() -> rx.Component:
@@ -44,15 +45,19 @@ app = rx.App(
             rel="stylesheet",
         ),
     ],
+    api_transformer=api,
 )
-from app.states.analytics_state import AnalyticsState
+from app.services.lifespan import services_lifespan
+from app.middleware import StateSizeMiddleware
 
+app.register_lifespan_task(services_lifespan)
+app.add_middleware(StateSizeMiddleware())
 app.add_page(index, on_load=UIState.load_initial_data)
-app.add_page(search_page, route="/search")
+app.add_page(search_page, route="/search", on_load=UIState.load_initial_data)
 app.add_page(
     business_detail_page,
     route="/business/[id]",
-    on_load=lambda: AnalyticsState.track_page_view(UIState.current_provider["id"]),
+    on_load=UIState.load_business_page,
 )
 app.add_page(get_listed_page, route="/get-listed")
 app.add_page(admin_login_page, route="/admin/login")
@@ -0,0 +1,58 @@
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+from reflex.event import Event
+from reflex.middleware import Middleware
+from reflex.state import BaseState, StateUpdate
+from reflex.utils import format
+from reflex.utils.exceptions import StateSerializationError
+from app.services.metrics import record_state_size
+
+
+class StateSizeMiddleware(Middleware):
+    """Measures every substate that appears in an outgoing delta.
+
+    Each one is pickled the way the state manager persists it, and the
+    delta is JSON-encoded the way it goes over the websocket, so bloated
+    states show up on /metrics long before they hurt the state manager or
+    the socket.
+    """
+
+    async def preprocess(
+        self, app, state: BaseState, event: Event
+    ) -> StateUpdate | None:
+        return None
+
+    async def postprocess(
+        self, app, state: BaseState, event: Event, update: StateUpdate
+    ) -> StateUpdate:
+        for name, delta in update.delta.items():
+            try:
+                substate = state.get_substate(name.split("."))
+                serialized = substate._serialize()
+            except (ValueError, StateSerializationError):
+                continue
+            record_state_size(
+                type(substate).__name__, len(serialized), len(format.json_dumps(delta))
+            )
+        return update
+
+
+class PathGZipMiddleware:
+    """GZip for HTTP requests under ``prefixes`` only.
+
+    Everything else, including the Reflex app mounted into the API, is
+    passed through untouched.
+    """
+
+    def __init__(
+        self, app: ASGIApp, prefixes: tuple[str, ...], minimum_size: int = 500
+    ):
+        self.app = app
+        self.prefixes = prefixes
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["path"].startswith(self.prefixes):
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
\ No newline at end of file
@@ -1335,6 +1335,14 @@ def payment_review_modal() -> rx.Component:
                                 ),
                                 class_name="flex justify-end gap-3 mt-4",
                             ),
+                            rx.cond(
+                                AdminPaymentSubmissionsState.review_error,
+                                rx.el.p(
+                                    AdminPaymentSubmissionsState.review_error,
+                                    class_name="text-red-500 text-sm mt-2",
+                                ),
+                                None,
+                            ),
                         ),
                         rx.el.div(
                             rx.el.p(
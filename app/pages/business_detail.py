@@ -1,7 +1,26 @@
+import json
 import reflex as rx
+from reflex.config import get_config
 from app.state import UIState
 from app.components import header, footer
-from app.states.analytics_state import AnalyticsState
+from app.services.prerender import PRERENDERED_PREFIX, business_path
+from app.states.analytics_state import track_beacon
+
+
+def share_profile(provider_id: rx.Var) -> rx.event.EventSpec:
+    """Share the profile's pre-rendered URL.
+
+    That page has its content, title and og tags in the first response, so
+    the people it is shared with (and link previews) do not wait for the
+    websocket. Falls back to copying the link where the Web Share API is
+    missing.
+    """
+    base = json.dumps(f"{get_config().api_url}{PRERENDERED_PREFIX}{business_path('')}")
+    return rx.call_script(
+        f"(() => {{ const url = {base} + {provider_id}; "
+        "if (navigator.share) { navigator.share({title: document.title, url})"
+        ".catch(() => {}); } else { navigator.clipboard.writeText(url); } })()"
+    )
 
 
 def business_detail_page() -> rx.Component:
@@ -63,8 +82,8 @@ def business_detail_page() -> rx.Component:
                                 rx.el.button(
                                     rx.icon("phone", class_name="h-5 w-5 mr-2"),
                                     "Call Now",
-                                    on_click=lambda: AnalyticsState.track_call_click(
-                                        UIState.current_provider["id"]
+                                    on_click=track_beacon(
+                                        "call_click", UIState.current_provider["id"]
                                     ),
                                     class_name="w-full flex items-center justify-center bg-blue-500 text-white px-6 py-3 rounded-lg text-md font-semibold hover:bg-blue-600 transition-colors",
                                 ),
@@ -73,8 +92,8 @@ def business_detail_page() -> rx.Component:
                                         "message-circle", class_name="h-5 w-5 mr-2"
                                     ),
                                     "Chat on WhatsApp",
-                                    on_click=lambda: AnalyticsState.track_whatsapp_click(
-                                        UIState.current_provider["id"]
+                                    on_click=track_beacon(
+                                        "whatsapp_click", UIState.current_provider["id"]
                                     ),
                                     class_name="w-full flex items-center justify-center bg-green-500 text-white px-6 py-3 rounded-lg text-md font-semibold hover:bg-green-600 transition-colors",
                                 ),
@@ -86,9 +105,13 @@ def business_detail_page() -> rx.Component:
                                 rx.el.button(
                                     rx.icon("share-2", class_name="h-5 w-5 mr-2"),
                                     "Share Profile",
-                                    on_click=lambda: AnalyticsState.track_share_click(
-                                        UIState.current_provider["id"]
-                                    ),
+                                    on_click=[
+                                        track_beacon(
+                                            "share_click",
+                                            UIState.current_provider["id"],
+                                        ),
+                                        share_profile(UIState.current_provider["id"]),
+                                    ],
                                     class_name="w-full flex items-center justify-center bg-gray-200 text-gray-800 px-6 py-3 rounded-lg text-md font-semibold hover:bg-gray-300 transition-colors",
                                 ),
                                 class_name="space-y-4",
@@ -34,33 +34,18 @@ class RegistrationState(rx.State):
 
     @rx.event
     async def submit_application(self, form_data: dict[str, Any]):
-        screenshot_file = self.payment_screenshot[0] if self.payment_screenshot else ""
-        if self.form_data["plan"] != "basic":
-            from app.states.admin_payment_submissions_state import (
-                AdminPaymentSubmissionsState,
-            )
+        """Queue the application for review; nothing is listed until approved.
 
-            submissions_state = await self.get_state(AdminPaymentSubmissionsState)
-            await submissions_state.add_submission(self.form_data, screenshot_file)
-        else:
-            from app.states.admin_listings_state import AdminListingsState
+        Basic (free) applications go through the same admin review as paid
+        ones, so an anonymous visitor can never publish a listing directly.
+        """
+        from app.states.admin_payment_submissions_state import (
+            AdminPaymentSubmissionsState,
+        )
 
-            listing_state = await self.get_state(AdminListingsState)
-            new_listing_id = (
-                len(listing_state.all_listings) + 1 if listing_state.all_listings else 1
-            )
-            listing_data = {
-                "id": new_listing_id,
-                "name": self.form_data["business_name"],
-                "category": self.form_data["category"],
-                "location": self.form_data["address"],
-                "rating": 0.0,
-                "reviews": 0,
-                "image_url": f"https://api.dicebear.com/9.x/notionists/svg?seed={self.form_data['business_name'].replace(' ', '')}",
-                "featured": False,
-            }
-            listing_state.all_listings.append(listing_data)
-            yield listing_state.sync_ui_state_providers
+        screenshot_file = self.payment_screenshot[0] if self.payment_screenshot else ""
+        submissions_state = await self.get_state(AdminPaymentSubmissionsState)
+        await submissions_state.add_submission(self.form_data, screenshot_file)
         self.form_submitted = True
 
 
@@ -201,8 +186,10 @@ def get_listed_page() -> rx.Component:
                                             cat["name"], value=cat["name"]
                                         ),
                                     ),
-                                    on_change=lambda val: RegistrationState.handle_form_change(
-                                        "category", val
+                                    on_change=lambda val: (
+                                        RegistrationState.handle_form_change(
+                                            "category", val
+                                        )
                                     ),
                                     name="category",
                                     class_name="mt-1 block w-full pl-3 pr-10 py-2 text-base border-gray-300 focus:outline-none focus:ring-teal-500 focus:border-teal-500 sm:text-sm rounded-md",
@@ -233,8 +220,10 @@ def get_listed_page() -> rx.Component:
                                 rx.el.textarea(
                                     name="description",
                                     placeholder="Tell customers about what you do...",
-                                    on_change=lambda val: RegistrationState.handle_form_change(
-                                        "description", val
+                                    on_change=lambda val: (
+                                        RegistrationState.handle_form_change(
+                                            "description", val
+                                        )
                                     ),
                                     class_name="mt-1 block w-full px-3 py-2 bg-white border border-gray-300 rounded-md shadow-sm placeholder-gray-400 focus:outline-none focus:ring-teal-500 focus:border-teal-500 sm:text-sm",
                                     rows=4,
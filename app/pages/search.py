@@ -76,6 +76,18 @@ def search_results() -> rx.Component:
             rx.foreach(UIState.filtered_providers, provider_card),
             class_name="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-8",
         ),
+        rx.cond(
+            UIState.filtered_providers.length() >= UIState.search_result_limit,
+            rx.el.div(
+                rx.el.button(
+                    "Show more",
+                    on_click=UIState.show_more_results,
+                    class_name="px-6 py-2 rounded-lg border border-teal-500 text-teal-600 font-semibold hover:bg-teal-50",
+                ),
+                class_name="flex justify-center mt-8",
+            ),
+            None,
+        ),
         rx.cond(
             UIState.filtered_providers.length() == 0,
             rx.el.div(
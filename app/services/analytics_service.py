@@ -1,9 +1,195 @@
 import reflex as rx
+import asyncio
 import logging
-from app.services.firebase_service import get_supabase_client
+import time
+import uuid
+from reflex.config import get_config
+from app.services.firebase_service import get_supabase_client, get_business_analytics
+from app.services.resilience import is_rejection, resilient_call
 from typing import Any
 import datetime
 
+BUSINESS_STATS = ("total_views", "total_calls", "total_whatsapp", "total_shares")
+EVENT_STATS = {
+    "page_view": "total_views",
+    "call_click": "total_calls",
+    "whatsapp_click": "total_whatsapp",
+    "share_click": "total_shares",
+}
+
+
+class AnalyticsEventWriter:
+    """Buffers analytics events in memory and writes them as multi-row inserts.
+
+    A batch is flushed when it reaches ``batch_size`` events or when
+    ``flush_interval`` seconds have passed since its first event, whichever
+    comes first. The queue is bounded; events arriving while it is full are
+    dropped and counted rather than growing memory without limit. A batch
+    that fails for a reason that may pass (a timeout, an unhealthy upstream,
+    an open circuit) goes back on the queue, as far as it has room, and the
+    writer waits one interval before trying again.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_queue_size: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_queue_size)
+        self._task: asyncio.Task | None = None
+        self._closed = asyncio.Event()
+        self.dropped_events = 0
+        self.flushed_events = 0
+        self.flush_count = 0
+        self.failed_flushes = 0
+        self.last_batch_size = 0
+        self.last_flush_seconds = 0.0
+
+    def enqueue(self, event: dict) -> bool:
+        if self._task is None or self._task.done():
+            self._closed.clear()
+            self._task = asyncio.create_task(self._run())
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped_events += 1
+            return False
+        return True
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while not self._closed.is_set():
+            first = await self._next_event(self.flush_interval)
+            if first is None:
+                continue
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                event = await self._next_event(remaining)
+                if event is None:
+                    break
+                batch.append(event)
+            if not await self._write(batch):
+                try:
+                    await asyncio.wait_for(
+                        self._closed.wait(), timeout=self.flush_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _next_event(self, timeout: float) -> dict | None:
+        """The next queued event, or None after ``timeout`` or on close."""
+        get = asyncio.ensure_future(self._queue.get())
+        closed = asyncio.ensure_future(self._closed.wait())
+        await asyncio.wait(
+            (get, closed), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        closed.cancel()
+        if get.done():
+            return get.result()
+        # Queue.get only takes the item once it resumes, so nothing is lost.
+        get.cancel()
+        return None
+
+    async def _write(self, batch: list[dict]) -> bool:
+        """Insert ``batch``; returns False if it was put back for a retry."""
+        supabase = await get_supabase_client()
+        if not supabase:
+            logging.warning(
+                "Supabase client not available. Dropping analytics event batch."
+            )
+            return True
+        start = time.perf_counter()
+        requeued = False
+        try:
+            await resilient_call(
+                "log_event", supabase.table("user_analytics").insert(batch).execute
+            )
+            self.flushed_events += len(batch)
+        except Exception as e:
+            self.failed_flushes += 1
+            if is_rejection(e):
+                logging.exception(f"Dropping analytics event batch: {e}")
+            else:
+                logging.warning(f"Analytics event batch failed, will retry: {e}")
+                self._requeue(batch)
+                requeued = True
+        self.flush_count += 1
+        self.last_batch_size = len(batch)
+        self.last_flush_seconds = time.perf_counter() - start
+        return not requeued
+
+    def _requeue(self, batch: list[dict]):
+        for event in batch:
+            try:
+                self._queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.dropped_events += 1
+
+    async def flush(self) -> bool:
+        """Write every queued event now, in ``batch_size`` chunks.
+
+        Stops at the first batch that has to be retried, leaving it and the
+        rest queued; returns whether the queue was written out.
+        """
+        remaining = self._queue.qsize()
+        while remaining > 0:
+            batch = []
+            while len(batch) < min(self.batch_size, remaining):
+                batch.append(self._queue.get_nowait())
+            remaining -= len(batch)
+            if not await self._write(batch):
+                return False
+        return True
+
+    async def close(self):
+        """Stop the background writer and flush whatever is still queued.
+
+        Events the final flush could not write are dropped and counted.
+        """
+        self._closed.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        if not await self.flush():
+            left = self._queue.qsize()
+            self.dropped_events += left
+            logging.error(f"Dropping {left} analytics events not written at shutdown")
+            while not self._queue.empty():
+                self._queue.get_nowait()
+
+    def metrics(self) -> dict[str, int | float]:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "dropped_events": self.dropped_events,
+            "flushed_events": self.flushed_events,
+            "flush_count": self.flush_count,
+            "failed_flushes": self.failed_flushes,
+            "last_batch_size": self.last_batch_size,
+            "last_flush_seconds": self.last_flush_seconds,
+        }
+
+
+_event_writer: AnalyticsEventWriter | None = None
+
+
+def get_event_writer() -> AnalyticsEventWriter:
+    global _event_writer
+    if _event_writer is None:
+        config = get_config()
+        _event_writer = AnalyticsEventWriter(
+            batch_size=getattr(config, "analytics_batch_size", 100),
+            flush_interval=getattr(config, "analytics_flush_interval_ms", 1000) / 1000,
+            max_queue_size=getattr(config, "analytics_max_queue_size", 10000),
+        )
+    return _event_writer
+
+
+async def close_event_writer():
+    if _event_writer is not None:
+        await _event_writer.close()
+
 
 async def log_event(
     event_type: str,
@@ -12,63 +198,258 @@ async def log_event(
     search_query: str | None = None,
     metadata: dict | None = None,
 ):
-    """Logs a user interaction event to the user_analytics table."""
-    supabase = get_supabase_client()
-    if not supabase:
-        logging.warning(
-            "Supabase client not available. Skipping analytics event logging."
-        )
-        return
-    try:
-        event_data = {
-            "event_type": event_type,
-            "provider_id": provider_id,
-            "category": category,
-            "search_query": search_query,
-            "metadata": metadata or {},
-        }
-        supabase.table("user_analytics").insert(event_data).execute()
-        logging.info(f"Logged analytics event: {event_type}")
-    except Exception as e:
-        logging.exception(f"Error logging analytics event: {e}")
+    """Queues a user interaction event for the user_analytics table."""
+    event_data = {
+        "event_type": event_type,
+        "provider_id": provider_id,
+        "category": category,
+        "search_query": search_query,
+        "metadata": metadata or {},
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    }
+    if not get_event_writer().enqueue(event_data):
+        logging.warning(f"Analytics queue full. Dropped analytics event: {event_type}")
+
 
+async def increment_business_stats(
+    deltas: dict[tuple[int, str], int], batch_id: str | None = None
+):
+    """Applies many merged counter increments in one round trip.
 
-async def update_business_stats(provider_id: int, stat_to_increment: str):
-    """Atomically increments a statistic for a given provider."""
-    supabase = get_supabase_client()
+    The increments are applied server-side in one transaction, so either all
+    of them land or none do; a failure is raised to the caller. With a
+    ``batch_id`` the function applies the batch at most once, which makes it
+    safe to send again (and to retry here) when an attempt's outcome is
+    unknown.
+    """
+    if not deltas:
+        return
+    supabase = await get_supabase_client()
     if not supabase:
         logging.warning(
             "Supabase client not available. Skipping business stats update."
         )
         return
-    try:
-        response = (
-            supabase.table("business_analytics")
-            .select("provider_id")
-            .eq("provider_id", provider_id)
-            .execute()
-        )
-        if not response.data:
-            supabase.table("business_analytics").insert(
-                {"provider_id": provider_id, stat_to_increment: 1}
-            ).execute()
-        else:
-            current_stat_resp = (
-                supabase.table("business_analytics")
-                .select(stat_to_increment)
-                .eq("provider_id", provider_id)
-                .single()
-                .execute()
+    keys = list(deltas)
+    await resilient_call(
+        "increment_business_stats",
+        supabase.rpc(
+            "increment_business_stats",
+            {
+                "p_provider_ids": [provider_id for provider_id, _ in keys],
+                "p_stats": [stat for _, stat in keys],
+                "p_amounts": [deltas[key] for key in keys],
+                "p_batch_id": batch_id,
+            },
+        ).execute,
+        idempotent=batch_id is not None,
+    )
+
+
+class BusinessStatsAggregator:
+    """Write-behind aggregation of per-provider counters.
+
+    Increments are summed in memory per ``(provider_id, stat)`` and written as
+    one bulk RPC every ``flush_interval`` seconds, so a popular provider costs
+    one row write per interval instead of one per event. At most
+    ``max_pending_keys`` keys are held; increments for new keys beyond that
+    are dropped and counted, like events arriving at a full writer queue.
+
+    Each written batch carries an id the RPC applies at most once. A batch
+    whose write failed without a clear rejection may still have committed,
+    so it is kept as it is and sent again with the same id before anything
+    newer, never merged into later deltas.
+    """
+
+    def __init__(self, flush_interval: float, max_pending_keys: int):
+        self.flush_interval = flush_interval
+        self.max_pending_keys = max_pending_keys
+        self._deltas: dict[tuple[int, str], int] = {}
+        # Batches whose write may or may not have been applied.
+        self._unconfirmed: list[tuple[str, dict[tuple[int, str], int]]] = []
+        self._task: asyncio.Task | None = None
+        self._closed = asyncio.Event()
+        self.flush_count = 0
+        self.failed_flushes = 0
+        self.last_flush_rows = 0
+        self.dropped_increments = 0
+        self.rejected_keys = 0
+        self.abandoned_increments = 0
+
+    def add(self, provider_id: int, stat: str, amount: int = 1):
+        if stat not in BUSINESS_STATS:
+            logging.warning(f"Unknown business stat: {stat}")
+            return
+        if self._task is None or self._task.done():
+            self._closed.clear()
+            self._task = asyncio.create_task(self._run())
+        self._merge({(provider_id, stat): amount})
+
+    def _merge(self, deltas: dict[tuple[int, str], int]):
+        for key, amount in deltas.items():
+            if key not in self._deltas and len(self._deltas) >= self.max_pending_keys:
+                self.dropped_increments += amount
+                continue
+            self._deltas[key] = self._deltas.get(key, 0) + amount
+
+    async def _run(self):
+        while not self._closed.is_set():
+            try:
+                await asyncio.wait_for(self._closed.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    async def flush(self):
+        unconfirmed, self._unconfirmed = self._unconfirmed, []
+        for batch_id, deltas in unconfirmed:
+            await self._write(deltas, batch_id)
+        if self._unconfirmed:
+            # Still failing; newer deltas wait for the next flush.
+            self.failed_flushes += 1
+            return
+        deltas, self._deltas = self._deltas, {}
+        if not deltas:
+            return
+        self.flush_count += 1
+        self.last_flush_rows = len(deltas)
+        await self._write(deltas, str(uuid.uuid4()))
+        if self._unconfirmed:
+            self.failed_flushes += 1
+
+    async def _write(self, deltas: dict[tuple[int, str], int], batch_id: str):
+        """Write ``deltas`` as batch ``batch_id``.
+
+        A failed batch Supabase did not reject is kept for the next flush
+        under the same id. A batch Supabase rejects outright (say, a provider
+        id out of range) was rolled back; it is split in halves, under new
+        ids, until the offending keys are isolated and dropped, so one bad
+        key cannot hold back every other counter.
+        """
+        try:
+            await increment_business_stats(deltas, batch_id)
+        except Exception as e:
+            if not is_rejection(e):
+                logging.warning(f"Business stats flush failed, will retry: {e}")
+                self._unconfirmed.append((batch_id, deltas))
+                return
+            if len(deltas) == 1:
+                self.rejected_keys += 1
+                logging.error(
+                    f"Dropping business stats Supabase rejected {deltas}: {e}"
+                )
+                return
+            keys = list(deltas)
+            middle = len(keys) // 2
+            for half in (keys[:middle], keys[middle:]):
+                await self._write({key: deltas[key] for key in half}, str(uuid.uuid4()))
+
+    async def close(self):
+        """Stop the flush loop after writing any pending deltas.
+
+        Whatever the final flush could not write is dropped, logged and
+        counted in ``abandoned_increments``.
+        """
+        self._closed.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+        left = [deltas for _, deltas in self._unconfirmed]
+        if self._deltas:
+            left.append(self._deltas)
+        abandoned = sum(sum(deltas.values()) for deltas in left)
+        if abandoned:
+            self.abandoned_increments += abandoned
+            logging.error(
+                f"Dropping {abandoned} business stat increments not written "
+                "before shutdown"
             )
-            current_value = current_stat_resp.data.get(stat_to_increment, 0)
-            supabase.table("business_analytics").update(
-                {stat_to_increment: current_value + 1}
-            ).eq("provider_id", provider_id).execute()
-        if stat_to_increment == "total_views":
-            supabase.table("business_analytics").update(
-                {"last_viewed": datetime.datetime.now().isoformat()}
-            ).eq("provider_id", provider_id).execute()
-    except Exception as e:
-        logging.exception(
-            f"Error updating business stats for provider {provider_id}: {e}"
-        )
\ No newline at end of file
+        self._unconfirmed = []
+        self._deltas = {}
+
+    def _pending_deltas(self) -> list[dict[tuple[int, str], int]]:
+        return [deltas for _, deltas in self._unconfirmed] + [self._deltas]
+
+    def pending(self, provider_id: int) -> dict[str, int]:
+        """Not-yet-confirmed increments for ``provider_id``, by stat."""
+        pending = {}
+        for deltas in self._pending_deltas():
+            for (pid, stat), amount in deltas.items():
+                if pid == provider_id:
+                    pending[stat] = pending.get(stat, 0) + amount
+        return pending
+
+    def overlay(self, stats: list[dict]) -> list[dict]:
+        """Return ``stats`` with the not-yet-flushed deltas added on top.
+
+        Batches of unknown outcome are included, so a dashboard may briefly
+        count one twice rather than hide it.
+        """
+        pending = {}
+        for deltas in self._pending_deltas():
+            for key, amount in deltas.items():
+                pending[key] = pending.get(key, 0) + amount
+        if not pending:
+            return stats
+        by_provider = {row["provider_id"]: dict(row) for row in stats}
+        for (provider_id, stat), amount in pending.items():
+            row = by_provider.get(provider_id)
+            if row is None:
+                row = {"provider_id": provider_id, "last_viewed": ""}
+                row.update({name: 0 for name in BUSINESS_STATS})
+                by_provider[provider_id] = row
+            row[stat] = (row.get(stat) or 0) + amount
+        return list(by_provider.values())
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "pending_keys": len(self._deltas),
+            "pending_increments": sum(self._deltas.values()),
+            "unconfirmed_batches": len(self._unconfirmed),
+            "flush_count": self.flush_count,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_rows": self.last_flush_rows,
+            "dropped_increments": self.dropped_increments,
+            "rejected_keys": self.rejected_keys,
+            "abandoned_increments": self.abandoned_increments,
+        }
+
+
+_stats_aggregator: BusinessStatsAggregator | None = None
+
+
+def get_stats_aggregator() -> BusinessStatsAggregator:
+    global _stats_aggregator
+    if _stats_aggregator is None:
+        config = get_config()
+        _stats_aggregator = BusinessStatsAggregator(
+            flush_interval=getattr(config, "analytics_stats_flush_interval_ms", 5000)
+            / 1000,
+            max_pending_keys=getattr(config, "analytics_stats_max_pending_keys", 50000),
+        )
+    return _stats_aggregator
+
+
+async def close_stats_aggregator():
+    if _stats_aggregator is not None:
+        await _stats_aggregator.close()
+
+
+def record_business_stat(provider_id: int, stat_to_increment: str):
+    """Counts one event towards a provider's statistic, written back in bulk."""
+    get_stats_aggregator().add(provider_id, stat_to_increment)
+
+
+async def get_live_business_analytics() -> list[dict]:
+    """Stored business analytics plus any increments not yet flushed."""
+    stats = await get_business_analytics()
+    if _stats_aggregator is None:
+        return stats
+    return _stats_aggregator.overlay(stats)
+
+
+async def track_event(event_type: str, provider_id: int):
+    """Logs a tracked provider interaction and counts it towards its statistic."""
+    await log_event(event_type=event_type, provider_id=provider_id)
+    record_business_stat(provider_id, EVENT_STATS[event_type])
\ No newline at end of file
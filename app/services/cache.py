@@ -0,0 +1,435 @@
+import asyncio
+import collections
+import copy
+import hashlib
+import json
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+from app.services.columns import ProviderColumns
+from app.services.search import ProviderSearchIndex
+
+_MISSING = object()
+
+
+class TTLCache:
+    """A small in-process read-through cache with per-entry expiry.
+
+    Values are deep-copied on the way in and out so callers can mutate what
+    they get back (Reflex state does) without corrupting the shared entry.
+    With ``max_entries`` set, the least recently used entry is evicted once
+    the cache is full.
+    """
+
+    def __init__(self, name: str, ttl: float, max_entries: int | None = None):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: collections.OrderedDict[str, tuple[float, Any]] = (
+            collections.OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING or entry[0] < time.monotonic():
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return copy.deepcopy(entry[1])
+
+    def get_stale(self, key: str, default: Any = None) -> Any:
+        """Return the last stored value for ``key`` even if it has expired."""
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        return copy.deepcopy(entry[1])
+
+    def expire(self, key: str | None = None):
+        """Mark entries stale without dropping them, so ``get_stale`` still works."""
+        keys = list(self._entries) if key is None else [key]
+        for name in keys:
+            entry = self._entries.get(name)
+            if entry is not None:
+                self._entries[name] = (0.0, entry[1])
+
+    def set(self, key: str, value: Any, ttl: float | None = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        if self.max_entries is not None and len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: str | None = None):
+        self.invalidations += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+
+DIGEST_MODULUS = 1 << 128
+
+
+def _row_digest(provider: dict) -> int:
+    encoded = json.dumps(provider, sort_keys=True, separators=(",", ":")).encode()
+    return int.from_bytes(hashlib.blake2b(encoded, digest_size=16).digest(), "big")
+
+
+def _digest_rows(
+    providers: tuple[dict, ...], previous: dict[int, tuple[dict, int]]
+) -> tuple[dict[int, tuple[dict, int]], int]:
+    """Per-id (row, digest) pairs for ``providers`` and the sum of the digests.
+
+    Summing makes the result independent of row order; rows equal to their
+    entry in ``previous`` are not hashed again.
+    """
+    row_digests = {}
+    for provider in providers:
+        entry = previous.get(provider["id"])
+        if entry is None or entry[0] != provider:
+            entry = (provider, _row_digest(provider))
+        row_digests[provider["id"]] = entry
+    return row_digests, sum(d for _, d in row_digests.values()) % DIGEST_MODULUS
+
+
+# A reload that changed more rows than this is indexed from scratch in a
+# worker thread rather than row by row on the event loop.
+INDEX_SYNC_MAX_CHANGES = 1000
+
+
+def _reuse_rows(previous: tuple[dict, ...], providers: list[dict]) -> list[dict]:
+    """``providers``, with each row equal to its entry in ``previous`` swapped
+    for that entry, so unchanged rows keep their identity across reloads."""
+    by_id = {p["id"]: p for p in previous}
+    reused = []
+    for provider in providers:
+        old = by_id.get(provider["id"])
+        reused.append(old if old == provider else provider)
+    return reused
+
+
+def _changed_rows(
+    previous: tuple[dict, ...], providers: tuple[dict, ...]
+) -> tuple[list[dict], list[int]]:
+    """Rows of ``providers`` that are not rows of ``previous``, and the ids
+    that are gone. Rows are compared by identity; see ``_reuse_rows``."""
+    by_id = {p["id"]: p for p in previous}
+    upserted = [p for p in providers if by_id.pop(p["id"], None) is not p]
+    return upserted, list(by_id)
+
+
+class ProviderCatalog:
+    """Process-wide, versioned snapshot of the provider catalog.
+
+    Every reader in the worker shares the same provider dicts, so they must
+    be treated as read-only; writes go through ``replace`` or ``apply``,
+    which publish a new snapshot and bump ``version``.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.version = 0
+        self._loaded = False
+        self._providers: tuple[dict, ...] = ()
+        self._expires_at = 0.0
+        self._search_index = ProviderSearchIndex()
+        self._search_index_version: int | None = None
+        self._indexed_providers: tuple[dict, ...] = ()
+        self._index_task: asyncio.Task | None = None
+        self._columns: ProviderColumns | None = None
+        self._columns_version: int | None = None
+        # Per-id (row, digest) pairs and their order-independent sum, behind
+        # ``etag``.
+        self._row_digests: dict[int, tuple[dict, int]] = {}
+        self._digest = 0
+        self._digest_version: int | None = None
+        self._digest_task: asyncio.Task | None = None
+        self._digest_task_version: int | None = None
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def is_fresh(self) -> bool:
+        fresh = self._expires_at >= time.monotonic()
+        if fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return fresh
+
+    def snapshot(self) -> list[dict]:
+        return list(self._providers)
+
+    def replace(self, providers: list[dict], if_version: int | None = None):
+        """Publish a freshly loaded catalog.
+
+        A load that started at ``if_version`` is discarded if a local write
+        has published a newer snapshot in the meantime, so a slow read can
+        never roll back an admin edit. A load whose rows are all the current
+        ones (see ``reuse_rows``) only renews the TTL, so the search index,
+        columns and etag of the current version stay valid.
+        """
+        if if_version is not None and self.loaded and self.version != if_version:
+            return
+        self._expires_at = time.monotonic() + self.ttl
+        self.refreshes += 1
+        if (
+            self.loaded
+            and len(providers) == len(self._providers)
+            and all(new is old for new, old in zip(providers, self._providers))
+        ):
+            return
+        self._providers = tuple(providers)
+        self._loaded = True
+        self.version += 1
+
+    async def reuse_rows(self, providers: list[dict]) -> list[dict]:
+        """``providers`` with the rows that did not change since the current
+        snapshot replaced by the snapshot's own dicts.
+
+        Compares in a worker thread. Readers keep sharing one dict per row
+        across reloads, and ``replace`` and the index sync can tell changed
+        rows apart by identity.
+        """
+        return await asyncio.to_thread(_reuse_rows, self._providers, providers)
+
+    def apply(self, upserted: list[dict] = (), deleted_ids: list[int] = ()):
+        """Fold a persisted change set into the loaded snapshot."""
+        if not self.loaded:
+            return
+        by_id = {p["id"]: p for p in self._providers}
+        index_current = self._search_index_version == self.version
+        digest_current = self._digest_version == self.version
+        for provider_id in deleted_ids:
+            by_id.pop(provider_id, None)
+            if index_current:
+                self._search_index.remove(provider_id)
+        for provider in upserted:
+            by_id[provider["id"]] = dict(provider)
+            if index_current:
+                self._search_index.add(by_id[provider["id"]])
+        self._providers = tuple(by_id.values())
+        self.version += 1
+        if index_current:
+            self._index_synced()
+        if digest_current:
+            self._apply_digests(upserted, deleted_ids)
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = None,
+        accept: Callable[[dict], bool] | None = None,
+    ) -> list[dict] | None:
+        """Providers whose name, location or category match ``query``.
+
+        The index is normally built by ``prepare_search_index`` when a
+        snapshot is loaded, and kept in step with ``apply``; if a search
+        arrives before that build has finished, the index is synced here.
+        Returns None for a query without searchable text.
+        """
+        if self._search_index_version != self.version:
+            self._search_index.sync(self._providers)
+            self._index_synced()
+        return self._search_index.search(query, limit, accept)
+
+    def prepare_search_index(self) -> asyncio.Task | None:
+        """Start bringing the search index up to the current snapshot.
+
+        The rows that changed since the indexed snapshot are found in a
+        worker thread and, when there are at most INDEX_SYNC_MAX_CHANGES of
+        them, re-indexed one by one; otherwise (and for the first load) a
+        fresh index is built in the thread. Either way the work is only
+        published if no newer snapshot has appeared meanwhile. Returns the
+        task, or None if the index is already current.
+        """
+        if self._search_index_version == self.version:
+            return None
+        self._index_task = asyncio.create_task(
+            self._build_search_index(
+                self.version,
+                self._providers,
+                self._search_index_version,
+                self._indexed_providers,
+            )
+        )
+        return self._index_task
+
+    async def _build_search_index(
+        self,
+        version: int,
+        providers: tuple[dict, ...],
+        base_version: int | None,
+        base: tuple[dict, ...],
+    ):
+        if base_version is not None:
+            upserted, deleted_ids = await asyncio.to_thread(
+                _changed_rows, base, providers
+            )
+            if len(upserted) + len(deleted_ids) <= INDEX_SYNC_MAX_CHANGES:
+                if self.version == version and self._search_index_version == (
+                    base_version
+                ):
+                    for provider_id in deleted_ids:
+                        self._search_index.remove(provider_id)
+                    for provider in upserted:
+                        self._search_index.add(provider)
+                    self._index_synced()
+                return
+        index = ProviderSearchIndex()
+        await asyncio.to_thread(index.rebuild, providers)
+        if self.version == version and self._search_index_version != version:
+            self._search_index = index
+            self._index_synced()
+
+    def _index_synced(self):
+        self._search_index_version = self.version
+        self._indexed_providers = self._providers
+
+    def columns(self) -> ProviderColumns:
+        """Columnar view of the current snapshot, built once per version."""
+        if self._columns_version != self.version:
+            self._columns = ProviderColumns(self._providers)
+            self._columns_version = self.version
+        return self._columns
+
+    async def etag(self) -> str:
+        """Strong validator for any response derived from the current snapshot.
+
+        It is a digest of the rows' content, independent of their order, so
+        every worker holding the same catalog hands out the same validator
+        and a reload that changes nothing keeps it. The digest is normally
+        ready by the time it is asked for; otherwise this waits for it.
+        """
+        while self._digest_version != self.version:
+            await self.prepare_etag()
+        return f'"{self._digest:032x}"'
+
+    def prepare_etag(self) -> asyncio.Task:
+        """Start digesting the current snapshot in a worker thread.
+
+        Rows unchanged since the last digested snapshot keep their digest,
+        so a periodic reload only hashes what changed. Returns the task,
+        which is shared by everyone waiting on the same version.
+        """
+        task = self._digest_task
+        if task is None or task.done() or self._digest_task_version != self.version:
+            self._digest_task_version = self.version
+            task = self._digest_task = asyncio.create_task(
+                self._build_digest(self.version, self._providers, self._row_digests)
+            )
+        return task
+
+    async def _build_digest(
+        self,
+        version: int,
+        providers: tuple[dict, ...],
+        previous: dict[int, tuple[dict, int]],
+    ):
+        row_digests, digest = await asyncio.to_thread(_digest_rows, providers, previous)
+        if self.version == version:
+            self._row_digests = row_digests
+            self._digest = digest
+            self._digest_version = version
+
+    def _apply_digests(self, upserted: list[dict], deleted_ids: list[int]):
+        # Copied rather than mutated: a digest build may be reading the old one.
+        row_digests = dict(self._row_digests)
+        digest = self._digest
+        for provider_id in deleted_ids:
+            entry = row_digests.pop(provider_id, None)
+            if entry is not None:
+                digest -= entry[1]
+        for provider in upserted:
+            entry = row_digests.get(provider["id"])
+            if entry is not None:
+                digest -= entry[1]
+            row_digest = _row_digest(provider)
+            row_digests[provider["id"]] = (provider, row_digest)
+            digest += row_digest
+        self._row_digests = row_digests
+        self._digest = digest % DIGEST_MODULUS
+        self._digest_version = self.version
+
+    def expire(self):
+        """Reload on the next read, keeping the snapshot to fall back on.
+
+        Used when a write fails and the stored rows may no longer match the
+        snapshot; readers keep getting the last good catalog if the reload
+        cannot reach Supabase either.
+        """
+        self._expires_at = 0.0
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "version": self.version,
+            "size": len(self._providers),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+        }
+
+
+class SingleFlight:
+    """Coalesces concurrent identical reads into one in-flight call per key.
+
+    The first caller for a key starts the fetch; everyone arriving while it
+    is running awaits the same future and gets its result or its exception.
+    Each waiter is bounded by the key's timeout, but a waiter timing out does
+    not cancel the shared fetch.
+    """
+
+    def __init__(
+        self, default_timeout: float, timeouts: dict[str, float] | None = None
+    ):
+        self.default_timeout = default_timeout
+        self.timeouts = timeouts or {}
+        self._calls: dict[str, asyncio.Future] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._calls.get(key)
+        if future is None:
+            self.leaders += 1
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._finish(key, f))
+        else:
+            self.followers += 1
+        return await asyncio.wait_for(
+            asyncio.shield(future), self.timeouts.get(key, self.default_timeout)
+        )
+
+    def _finish(self, key: str, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            # Mark the exception as retrieved even if every waiter timed out.
+            future.exception()
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "followers": self.followers,
+        }
\ No newline at end of file
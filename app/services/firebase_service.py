@@ -1,129 +1,549 @@
 import reflex as rx
 import os
-from supabase import create_client, Client
+import asyncio
+import base64
+import copy
+import json
+import httpx
+from reflex.config import get_config
+from app.services.cache import TTLCache, ProviderCatalog, SingleFlight
+from app.services.columns import ProviderColumns
+from app.services.prerender import PrerenderCache
+from app.services.resilience import resilient_call
+from app.services.metrics import record_response_bytes
+from supabase import acreate_client, AsyncClient, AsyncClientOptions
+from collections.abc import Callable
 from typing import Any
 import logging
 import uuid
 
+_supabase_client: AsyncClient | None = None
+_http_client: httpx.AsyncClient | None = None
+_client_lock = asyncio.Lock()
 
-def get_supabase_client() -> Client | None:
+PROVIDER_WRITE_BATCH_SIZE = 500
+
+settings_cache = TTLCache(
+    "settings", ttl=getattr(get_config(), "settings_cache_ttl_seconds", 300)
+)
+provider_catalog = ProviderCatalog(
+    ttl=getattr(get_config(), "catalog_cache_ttl_seconds", 60)
+)
+provider_cache = TTLCache(
+    "provider",
+    ttl=getattr(get_config(), "provider_cache_ttl_seconds", 60),
+    max_entries=getattr(get_config(), "provider_cache_max_entries", 1000),
+)
+# Ids found not to exist are remembered for a short while, so a dead link
+# or a made-up id does not reach Supabase on every request.
+PROVIDER_MISSING_TTL = getattr(get_config(), "provider_missing_ttl_seconds", 10)
+_NOT_CACHED = object()
+prerendered_pages = PrerenderCache(
+    ttl=getattr(get_config(), "prerender_ttl_seconds", 300)
+)
+single_flight = SingleFlight(
+    default_timeout=getattr(get_config(), "single_flight_timeout_seconds", 15)
+)
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    """Build the pooled HTTP client shared by every Supabase call in this worker."""
+    config = get_config()
+    return httpx.AsyncClient(
+        http2=getattr(config, "supabase_http2", True),
+        limits=httpx.Limits(
+            max_connections=getattr(config, "supabase_max_connections", 20),
+            max_keepalive_connections=getattr(
+                config, "supabase_max_keepalive_connections", 10
+            ),
+            keepalive_expiry=getattr(config, "supabase_keepalive_expiry", 30.0),
+        ),
+        timeout=httpx.Timeout(
+            getattr(config, "supabase_timeout", 10.0),
+            connect=getattr(config, "supabase_connect_timeout", 5.0),
+        ),
+        follow_redirects=True,
+        event_hooks={"response": [record_response_bytes]},
+    )
+
+
+async def get_supabase_client() -> AsyncClient | None:
+    """Return the process-wide async Supabase client, creating it on first use."""
+    global _supabase_client, _http_client
+    if _supabase_client is not None:
+        return _supabase_client
     url = os.environ.get("SUPABASE_URL")
     key = os.environ.get("SUPABASE_KEY")
     if not url or not key:
         return None
-    return create_client(url, key)
+    async with _client_lock:
+        if _supabase_client is None:
+            _http_client = _build_http_client()
+            _supabase_client = await acreate_client(
+                url, key, options=AsyncClientOptions(httpx_client=_http_client)
+            )
+    return _supabase_client
+
+
+async def close_supabase_client():
+    """Close the pooled HTTP connections and drop the cached client."""
+    global _supabase_client, _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+    _supabase_client = None
+    _http_client = None
 
 
 async def get_app_settings() -> dict[
     str, str | int | bool | list[dict[str, str | bool]]
 ]:
-    supabase = get_supabase_client()
+    cached = settings_cache.get("app_settings")
+    if cached is not None:
+        return cached
+    supabase = await get_supabase_client()
     if not supabase:
         return {}
     try:
-        response = supabase.table("app_settings").select("settings").single().execute()
-        return response.data.get("settings", {})
+        settings = await single_flight.do(
+            "app_settings", lambda: _load_app_settings(supabase)
+        )
+        return copy.deepcopy(settings)
     except Exception as e:
         logging.exception(f"Error fetching settings: {e}")
-        return {}
+        return settings_cache.get_stale("app_settings", {})
+
+
+async def _load_app_settings(supabase: AsyncClient) -> dict:
+    response = await resilient_call(
+        "get_app_settings",
+        supabase.table("app_settings").select("settings").single().execute,
+        idempotent=True,
+    )
+    settings = response.data.get("settings", {})
+    settings_cache.set("app_settings", settings)
+    return settings
 
 
 async def save_app_settings(
     settings: dict[str, str | int | bool | list[dict[str, str | bool]]],
 ):
-    supabase = get_supabase_client()
+    supabase = await get_supabase_client()
     if not supabase:
         return
     try:
-        supabase.table("app_settings").upsert({"id": 1, "settings": settings}).execute()
+        await resilient_call(
+            "save_app_settings",
+            supabase.table("app_settings")
+            .upsert({"id": 1, "settings": settings})
+            .execute,
+        )
     except Exception as e:
         logging.exception(f"Error saving settings: {e}")
+    settings_cache.invalidate("app_settings")
+    prerendered_pages.invalidate()
 
 
 async def get_providers() -> list[dict[str, str | int | bool | float]]:
-    supabase = get_supabase_client()
+    """Return the provider catalog from the shared snapshot, loading it if stale.
+
+    The provider dicts are shared across the worker and must not be mutated.
+    """
+    if provider_catalog.is_fresh():
+        return provider_catalog.snapshot()
+    supabase = await get_supabase_client()
     if not supabase:
         return []
     try:
-        response = supabase.table("providers").select("data").execute()
-        return [item["data"] for item in response.data]
+        await single_flight.do("providers", lambda: _load_providers(supabase))
+        return provider_catalog.snapshot()
     except Exception as e:
         logging.exception(f"Error fetching providers: {e}")
-        return []
+        return provider_catalog.snapshot()
+
 
+async def _load_providers(supabase: AsyncClient):
+    started_at_version = provider_catalog.version
+    response = await resilient_call(
+        "get_providers",
+        supabase.table("providers").select("data").order("id").execute,
+        idempotent=True,
+    )
+    providers = await provider_catalog.reuse_rows(
+        [item["data"] for item in response.data]
+    )
+    provider_catalog.replace(providers, if_version=started_at_version)
+    provider_catalog.prepare_search_index()
+    provider_catalog.prepare_etag()
 
-async def save_providers(providers: list[dict[str, str | int | bool | float]]):
-    supabase = get_supabase_client()
+
+async def get_provider(provider_id: int) -> dict[str, str | int | bool | float] | None:
+    """Return one provider, without loading the whole catalog for it.
+
+    Served from the catalog when this worker has a fresh snapshot with the
+    id in it; otherwise the single row is fetched and kept in a per-id LRU,
+    so a shared profile link opened cold costs one small round trip and an
+    expired snapshot never answers for an edit made on another worker. A
+    listing created elsewhere is found this way until the next reload, and
+    ids that do not exist are cached too, for PROVIDER_MISSING_TTL.
+    """
+    columns = catalog_columns()
+    if columns is not None and provider_catalog.is_fresh():
+        provider = columns.get(provider_id)
+        if provider is not None:
+            return provider
+    key = str(provider_id)
+    cached = provider_cache.get(key, _NOT_CACHED)
+    if cached is not _NOT_CACHED:
+        return cached
+    supabase = await get_supabase_client()
+    if not supabase:
+        return None
+    try:
+        provider = await single_flight.do(
+            f"provider:{key}", lambda: _load_provider(supabase, provider_id)
+        )
+        return copy.deepcopy(provider)
+    except Exception as e:
+        logging.exception(f"Error fetching provider {provider_id}: {e}")
+        return provider_cache.get_stale(key)
+
+
+async def _load_provider(supabase: AsyncClient, provider_id: int) -> dict | None:
+    response = await resilient_call(
+        "get_provider",
+        supabase.table("providers")
+        .select("data")
+        .eq("id", provider_id)
+        .limit(1)
+        .execute,
+        idempotent=True,
+    )
+    if not response.data:
+        provider_cache.set(str(provider_id), None, ttl=PROVIDER_MISSING_TTL)
+        return None
+    provider = response.data[0]["data"]
+    provider_cache.set(str(provider_id), provider)
+    return provider
+
+
+def get_catalog_version() -> int:
+    return provider_catalog.version
+
+
+def catalog_columns() -> ProviderColumns | None:
+    """Columnar view of the loaded catalog, or None if it is not loaded."""
+    if not provider_catalog.loaded:
+        return None
+    return provider_catalog.columns()
+
+
+def search_catalog(
+    text: str,
+    limit: int | None = None,
+    accept: Callable[[dict], bool] | None = None,
+) -> list[dict[str, str | int | bool | float]] | None:
+    """Match ``text`` against the loaded catalog through its search index.
+
+    ``limit`` and ``accept`` are passed on to ``ProviderCatalog.search``.
+    Returns None when the catalog is not loaded or ``text`` has nothing to
+    search for, so callers can fall back to their own provider list.
+    """
+    if not provider_catalog.loaded:
+        return None
+    return provider_catalog.search(text, limit, accept)
+
+
+PROVIDER_SORTS = {
+    "rating": ("rating", True),
+    "reviews": ("reviews", True),
+    "name": ("name", False),
+}
+
+
+def _postgrest_quote(value: str) -> str:
+    """Quote a value for use inside a PostgREST ``or=(...)`` filter."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def encode_provider_cursor(sort_value: str | int | float, provider_id: int) -> str:
+    return base64.urlsafe_b64encode(
+        json.dumps([sort_value, provider_id]).encode()
+    ).decode()
+
+
+def decode_provider_cursor(cursor: str) -> tuple[str | int | float, int]:
+    sort_value, provider_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return sort_value, provider_id
+
+
+async def query_providers(
+    text: str = "",
+    category: str | None = None,
+    min_rating: float = 0.0,
+    featured: bool | None = None,
+    sort: str = "rating",
+    offset: int = 0,
+    limit: int = 20,
+    cursor: str | None = None,
+) -> tuple[list[dict[str, str | int | bool | float]], str | None]:
+    """Filter, sort and page the catalog in Postgres.
+
+    Runs against the indexed ``name``/``category``/``location``/``rating``/
+    ``reviews``/``featured`` columns. Pass the returned cursor back to fetch
+    the next page with a keyset seek instead of an offset scan. Returns the
+    page and the cursor for the following page, or None on the last page;
+    one row beyond the page is read to tell the two apart.
+    Rows written before the columns existed are only found once
+    ``supabase/scripts/providers_backfill.sql`` has run.
+    """
+    supabase = await get_supabase_client()
+    if not supabase:
+        return [], None
+    column, descending = PROVIDER_SORTS[sort]
+    try:
+        query = supabase.table("providers").select(f"id, {column}, data")
+        alternatives = []
+        if text:
+            pattern = _postgrest_quote(f"*{text}*")
+            alternatives.append(f"name.ilike.{pattern},location.ilike.{pattern}")
+        if category and category != "All":
+            query = query.eq("category", category)
+        if min_rating:
+            query = query.gte("rating", min_rating)
+        if featured is not None:
+            query = query.eq("featured", featured)
+        if cursor:
+            last_value, last_id = decode_provider_cursor(cursor)
+            op = "lt" if descending else "gt"
+            value = (
+                _postgrest_quote(last_value)
+                if isinstance(last_value, str)
+                else last_value
+            )
+            alternatives.append(
+                f"{column}.{op}.{value},and({column}.eq.{value},id.gt.{last_id})"
+            )
+            query = query.limit(limit + 1)
+        else:
+            query = query.range(offset, offset + limit)
+        if len(alternatives) == 1:
+            query = query.or_(alternatives[0])
+        elif alternatives:
+            query = query.or_("and(" + ",".join(f"or({a})" for a in alternatives) + ")")
+        response = await resilient_call(
+            "query_providers",
+            query.order(column, desc=descending).order("id").execute,
+            idempotent=True,
+        )
+        rows = response.data[:limit]
+        next_cursor = (
+            encode_provider_cursor(rows[-1][column], rows[-1]["id"])
+            if len(response.data) > limit
+            else None
+        )
+        return [row["data"] for row in rows], next_cursor
+    except Exception as e:
+        logging.exception(f"Error querying providers: {e}")
+        return [], None
+
+
+async def insert_provider(
+    provider: dict[str, str | int | bool | float],
+) -> dict[str, str | int | bool | float] | None:
+    """Create a new listing and return it with the id the database assigned.
+
+    ``provider`` carries no id: the column default allocates one and a
+    trigger stamps it into ``data``, so two concurrent registrations can
+    never pick the same id and overwrite each other.
+    """
+    supabase = await get_supabase_client()
+    if not supabase:
+        return None
+    try:
+        response = await resilient_call(
+            "insert_provider",
+            supabase.table("providers").insert({"data": provider}).execute,
+        )
+    except Exception as e:
+        logging.exception(f"Error inserting provider: {e}")
+        provider_catalog.expire()
+        return None
+    created = response.data[0]["data"]
+    provider_catalog.apply(upserted=[created])
+    provider_cache.invalidate(str(created["id"]))
+    prerendered_pages.invalidate_providers(upserted=[created])
+    return created
+
+
+async def upsert_provider(provider: dict[str, str | int | bool | float]):
+    await upsert_providers([provider])
+
+
+async def upsert_providers(
+    providers: list[dict[str, str | int | bool | float]],
+    batch_size: int = PROVIDER_WRITE_BATCH_SIZE,
+):
+    if not providers:
+        return
+    supabase = await get_supabase_client()
+    if not supabase:
+        return
+    try:
+        for start in range(0, len(providers), batch_size):
+            batch = providers[start : start + batch_size]
+            await resilient_call(
+                "upsert_providers",
+                supabase.table("providers")
+                .upsert([{"id": p["id"], "data": p} for p in batch])
+                .execute,
+            )
+            provider_catalog.apply(upserted=batch)
+            for provider in batch:
+                provider_cache.invalidate(str(provider["id"]))
+            prerendered_pages.invalidate_providers(upserted=batch)
+    except Exception as e:
+        logging.exception(f"Error upserting providers: {e}")
+        provider_catalog.expire()
+        provider_cache.expire()
+        prerendered_pages.invalidate()
+
+
+async def delete_provider(provider_id: int):
+    await delete_providers([provider_id])
+
+
+async def delete_providers(
+    provider_ids: list[int], batch_size: int = PROVIDER_WRITE_BATCH_SIZE
+):
+    if not provider_ids:
+        return
+    supabase = await get_supabase_client()
     if not supabase:
         return
     try:
-        supabase.table("providers").delete().neq("id", -1).execute()
-        if providers:
-            supabase.table("providers").insert(
-                [{"id": p["id"], "data": p} for p in providers]
-            ).execute()
+        for start in range(0, len(provider_ids), batch_size):
+            batch = provider_ids[start : start + batch_size]
+            await resilient_call(
+                "delete_providers",
+                supabase.table("providers").delete().in_("id", batch).execute,
+            )
+            provider_catalog.apply(deleted_ids=batch)
+            for provider_id in batch:
+                provider_cache.invalidate(str(provider_id))
+            prerendered_pages.invalidate_providers(deleted_ids=batch)
     except Exception as e:
-        logging.exception(f"Error saving providers: {e}")
+        logging.exception(f"Error deleting providers: {e}")
+        provider_catalog.expire()
+        provider_cache.expire()
+        prerendered_pages.invalidate()
 
 
 async def get_pricing_plans() -> list[dict[str, str | int | bool | list[str]]]:
-    supabase = get_supabase_client()
+    cached = settings_cache.get("pricing_plans")
+    if cached is not None:
+        return cached
+    supabase = await get_supabase_client()
     if not supabase:
         return []
     try:
-        response = supabase.table("pricing_plans").select("data").execute()
-        return [item["data"] for item in response.data]
+        plans = await single_flight.do(
+            "pricing_plans", lambda: _load_pricing_plans(supabase)
+        )
+        return copy.deepcopy(plans)
     except Exception as e:
         logging.exception(f"Error fetching pricing plans: {e}")
-        return []
+        return settings_cache.get_stale("pricing_plans", [])
+
+
+async def _load_pricing_plans(supabase: AsyncClient) -> list[dict]:
+    response = await resilient_call(
+        "get_pricing_plans",
+        supabase.table("pricing_plans").select("data").execute,
+        idempotent=True,
+    )
+    plans = [item["data"] for item in response.data]
+    settings_cache.set("pricing_plans", plans)
+    return plans
 
 
 async def save_pricing_plans(plans: list[dict[str, str | int | bool | list[str]]]):
-    supabase = get_supabase_client()
+    supabase = await get_supabase_client()
     if not supabase:
         return
     try:
-        supabase.table("pricing_plans").delete().neq("id", "").execute()
+        await resilient_call(
+            "save_pricing_plans",
+            supabase.table("pricing_plans").delete().neq("id", "").execute,
+        )
         if plans:
-            supabase.table("pricing_plans").insert(
-                [{"id": p["id"], "data": p} for p in plans]
-            ).execute()
+            await resilient_call(
+                "save_pricing_plans",
+                supabase.table("pricing_plans")
+                .insert([{"id": p["id"], "data": p} for p in plans])
+                .execute,
+            )
     except Exception as e:
         logging.exception(f"Error saving pricing plans: {e}")
+    settings_cache.invalidate("pricing_plans")
 
 
 async def get_payment_submissions() -> list[dict]:
-    supabase = get_supabase_client()
+    supabase = await get_supabase_client()
     if not supabase:
         return []
     try:
-        response = supabase.table("payment_submissions").select("data").execute()
+        response = await resilient_call(
+            "get_payment_submissions",
+            supabase.table("payment_submissions").select("data").execute,
+            idempotent=True,
+        )
         return [item["data"] for item in response.data]
     except Exception as e:
         logging.exception(f"Error fetching payment submissions: {e}")
         return []
 
 
-async def save_payment_submissions(submissions: list[dict]):
-    supabase = get_supabase_client()
+async def insert_payment_submission(submission: dict):
+    supabase = await get_supabase_client()
+    if not supabase:
+        return
+    try:
+        await resilient_call(
+            "insert_payment_submission",
+            supabase.table("payment_submissions")
+            .insert({"id": submission["id"], "data": submission})
+            .execute,
+        )
+    except Exception as e:
+        logging.exception(f"Error inserting payment submission: {e}")
+
+
+async def update_payment_submission(submission: dict):
+    supabase = await get_supabase_client()
     if not supabase:
         return
     try:
-        supabase.table("payment_submissions").delete().neq("id", "").execute()
-        if submissions:
-            supabase.table("payment_submissions").insert(
-                [{"id": s["id"], "data": s} for s in submissions]
-            ).execute()
+        await resilient_call(
+            "update_payment_submission",
+            supabase.table("payment_submissions")
+            .update({"data": submission})
+            .eq("id", submission["id"])
+            .execute,
+        )
     except Exception as e:
-        logging.exception(f"Error saving payment submissions: {e}")
+        logging.exception(f"Error updating payment submission: {e}")
 
 
 async def get_business_analytics() -> list[dict]:
-    supabase = get_supabase_client()
+    supabase = await get_supabase_client()
     if not supabase:
         return []
     try:
-        response = supabase.table("business_analytics").select("*").execute()
+        response = await resilient_call(
+            "get_business_analytics",
+            supabase.table("business_analytics").select("*").execute,
+            idempotent=True,
+        )
         return response.data
     except Exception as e:
         logging.exception(f"Error fetching business analytics: {e}")
@@ -131,16 +551,18 @@ async def get_business_analytics() -> list[dict]:
 
 
 async def get_recent_user_activity(limit: int = 20) -> list[dict]:
-    supabase = get_supabase_client()
+    supabase = await get_supabase_client()
     if not supabase:
         return []
     try:
-        response = (
+        response = await resilient_call(
+            "get_recent_user_activity",
             supabase.table("user_analytics")
             .select("id, event_type, provider_id, timestamp")
             .order("timestamp", desc=True)
             .limit(limit)
-            .execute()
+            .execute,
+            idempotent=True,
         )
         return response.data
     except Exception as e:
@@ -149,11 +571,15 @@ async def get_recent_user_activity(limit: int = 20) -> list[dict]:
 
 
 async def get_business_owners() -> list[dict]:
-    supabase = get_supabase_client()
+    supabase = await get_supabase_client()
     if not supabase:
         return []
     try:
-        response = supabase.table("business_owners").select("*").execute()
+        response = await resilient_call(
+            "get_business_owners",
+            supabase.table("business_owners").select("*").execute,
+            idempotent=True,
+        )
         return response.data
     except Exception as e:
         logging.exception(f"Error fetching business owners: {e}")
@@ -161,30 +587,39 @@ async def get_business_owners() -> list[dict]:
 
 
 async def save_business_owners(owners: list[dict]):
-    supabase = get_supabase_client()
+    supabase = await get_supabase_client()
     if not supabase:
         return
     try:
-        supabase.table("business_owners").delete().neq(
-            "id", str(uuid.uuid4())
-        ).execute()
+        await resilient_call(
+            "save_business_owners",
+            supabase.table("business_owners")
+            .delete()
+            .neq("id", str(uuid.uuid4()))
+            .execute,
+        )
         if owners:
-            supabase.table("business_owners").insert(owners).execute()
+            await resilient_call(
+                "save_business_owners",
+                supabase.table("business_owners").insert(owners).execute,
+            )
     except Exception as e:
         logging.exception(f"Error saving business owners: {e}")
 
 
 async def get_owner_by_email(email: str) -> dict | None:
-    supabase = get_supabase_client()
+    supabase = await get_supabase_client()
     if not supabase:
         return None
     try:
-        response = (
+        response = await resilient_call(
+            "get_owner_by_email",
             supabase.table("business_owners")
             .select("*")
             .eq("email", email)
             .single()
-            .execute()
+            .execute,
+            idempotent=True,
         )
         return response.data
     except Exception as e:
@@ -194,12 +629,16 @@ async def get_owner_by_email(email: str) -> dict | None:
 
 
 async def update_owner_password(owner_id: str, new_password_hash: str):
-    supabase = get_supabase_client()
+    supabase = await get_supabase_client()
     if not supabase:
         return
     try:
-        supabase.table("business_owners").update(
-            {"password_hash": new_password_hash}
-        ).eq("id", owner_id).execute()
+        await resilient_call(
+            "update_owner_password",
+            supabase.table("business_owners")
+            .update({"password_hash": new_password_hash})
+            .eq("id", owner_id)
+            .execute,
+        )
     except Exception as e:
         logging.exception(f"Error updating password: {e}")
\ No newline at end of file
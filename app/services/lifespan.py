@@ -0,0 +1,14 @@
+import contextlib
+from app.services.analytics_service import close_event_writer, close_stats_aggregator
+from app.services.firebase_service import close_supabase_client
+
+
+@contextlib.asynccontextmanager
+async def services_lifespan():
+    """Flush buffered analytics and release the Supabase pool on shutdown."""
+    try:
+        yield
+    finally:
+        await close_event_writer()
+        await close_stats_aggregator()
+        await close_supabase_client()
\ No newline at end of file
@@ -0,0 +1,269 @@
+import bisect
+import collections
+import contextlib
+import contextvars
+import json
+import logging
+from dataclasses import dataclass, field
+import httpx
+from reflex.config import get_config
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_QUERY_SECONDS = getattr(get_config(), "supabase_slow_query_ms", 500) / 1000
+# Supabase round trips and response bytes one cold load of each page may
+# cost. Warm loads served from the caches are expected to cost nothing.
+PAGE_BUDGETS: dict[str, tuple[int, int]] = {
+    "/": (2, 2_000_000),
+    "/search": (2, 2_000_000),
+    "/business/[id]": (2, 50_000),
+    "/admin/dashboard": (2, 2_000_000),
+    "/admin/dashboard/analytics": (3, 2_000_000),
+    "/admin/dashboard/listings": (1, 2_000_000),
+    "/admin/dashboard/plans": (1, 50_000),
+    "/admin/dashboard/payments": (1, 1_000_000),
+    "/admin/dashboard/owners": (2, 2_000_000),
+    "/owner/dashboard": (2, 2_000_000),
+} | getattr(get_config(), "page_round_trip_budgets", {})
+PAGE_BUDGET_STRICT = getattr(get_config(), "page_budget_strict", False)
+# Serialized size one session's instance of a state class may reach, by
+# class name, with a default for classes not listed.
+STATE_SIZE_BUDGETS: dict[str, int] = getattr(get_config(), "state_size_budgets", {})
+DEFAULT_STATE_SIZE_BUDGET = getattr(get_config(), "state_size_budget_bytes", 64_000)
+STATE_BUDGET_STRICT = getattr(get_config(), "state_budget_strict", False)
+STATE_SIZE_SAMPLES = 1000
+
+
+class PageBudgetExceeded(Exception):
+    """Raised in strict mode when a page load goes over its declared budget."""
+
+
+class StateBudgetExceeded(Exception):
+    """Raised in strict mode when a session's state outgrows its budget."""
+
+
+@dataclass
+class OperationStats:
+    """Per-operation counters and a fixed-bucket latency histogram."""
+
+    bucket_counts: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+    calls: int = 0
+    errors: int = 0
+    seconds_sum: float = 0.0
+    rows: int = 0
+    response_bytes: int = 0
+
+
+@dataclass
+class CallRecord:
+    """Bytes received for the request currently running in this context."""
+
+    response_bytes: int = 0
+
+
+@dataclass
+class PageLoad:
+    """Supabase traffic caused by one page (or dashboard tab) load."""
+
+    route: str
+    round_trips: int = 0
+    response_bytes: int = 0
+
+
+_operations: dict[str, OperationStats] = {}
+_page_loads: dict[str, int] = {}
+_page_budget_violations: dict[str, int] = {}
+_state_sizes: dict[str, collections.deque[int]] = {}
+_delta_sizes: dict[str, collections.deque[int]] = {}
+_state_budget_violations: dict[str, int] = {}
+_current_call: contextvars.ContextVar[CallRecord | None] = contextvars.ContextVar(
+    "supabase_current_call", default=None
+)
+_current_page: contextvars.ContextVar[PageLoad | None] = contextvars.ContextVar(
+    "supabase_current_page", default=None
+)
+
+
+def start_call() -> tuple[CallRecord, contextvars.Token]:
+    record = CallRecord()
+    return record, _current_call.set(record)
+
+
+def finish_call(
+    token: contextvars.Token,
+    record: CallRecord,
+    operation: str,
+    seconds: float,
+    result: object = None,
+    error: bool = False,
+):
+    _current_call.reset(token)
+    stats = _operations.get(operation)
+    if stats is None:
+        stats = _operations[operation] = OperationStats()
+    stats.calls += 1
+    stats.seconds_sum += seconds
+    stats.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+    stats.response_bytes += record.response_bytes
+    page = _current_page.get()
+    if page is not None:
+        page.round_trips += 1
+        page.response_bytes += record.response_bytes
+    rows = 0
+    if error:
+        stats.errors += 1
+    else:
+        data = getattr(result, "data", None)
+        rows = len(data) if isinstance(data, list) else int(bool(data))
+        stats.rows += rows
+    if seconds >= SLOW_QUERY_SECONDS:
+        logging.warning(
+            "Slow Supabase call: "
+            + json.dumps(
+                {
+                    "operation": operation,
+                    "seconds": round(seconds, 4),
+                    "rows": rows,
+                    "bytes": record.response_bytes,
+                    "error": error,
+                }
+            )
+        )
+
+
+async def record_response_bytes(response: httpx.Response):
+    """httpx response hook attributing payload size to the current call."""
+    record = _current_call.get()
+    if record is None:
+        return
+    await response.aread()
+    record.response_bytes += len(response.content)
+
+
+@contextlib.contextmanager
+def page_budget(route: str):
+    """Count the Supabase round trips made while loading ``route``.
+
+    Loads that go over the route's entry in PAGE_BUDGETS are logged and
+    counted, or raise PageBudgetExceeded when ``page_budget_strict`` is set.
+    """
+    page = PageLoad(route)
+    token = _current_page.set(page)
+    try:
+        yield page
+    finally:
+        _current_page.reset(token)
+    _page_loads[route] = _page_loads.get(route, 0) + 1
+    max_round_trips, max_bytes = PAGE_BUDGETS[route]
+    if page.round_trips <= max_round_trips and page.response_bytes <= max_bytes:
+        return
+    _page_budget_violations[route] = _page_budget_violations.get(route, 0) + 1
+    message = (
+        f"Page {route} made {page.round_trips} Supabase round trips "
+        f"({page.response_bytes} bytes), budget is {max_round_trips} "
+        f"({max_bytes} bytes)."
+    )
+    if PAGE_BUDGET_STRICT:
+        raise PageBudgetExceeded(message)
+    logging.warning(message)
+
+
+def record_state_size(state: str, state_bytes: int, delta_bytes: int):
+    """Record one session's serialized ``state`` size and the delta just sent.
+
+    Only the most recent STATE_SIZE_SAMPLES per class are kept, which is
+    enough for stable p50/p99 figures.
+    """
+    for sizes, size in ((_state_sizes, state_bytes), (_delta_sizes, delta_bytes)):
+        samples = sizes.get(state)
+        if samples is None:
+            samples = sizes[state] = collections.deque(maxlen=STATE_SIZE_SAMPLES)
+        samples.append(size)
+    budget = STATE_SIZE_BUDGETS.get(state, DEFAULT_STATE_SIZE_BUDGET)
+    if state_bytes <= budget:
+        return
+    _state_budget_violations[state] = _state_budget_violations.get(state, 0) + 1
+    message = f"{state} serializes to {state_bytes} bytes, budget is {budget}."
+    if STATE_BUDGET_STRICT:
+        raise StateBudgetExceeded(message)
+    logging.warning(message)
+
+
+def _percentile(samples: list[int], quantile: float) -> int:
+    return samples[min(len(samples) - 1, int(quantile * len(samples)))]
+
+
+def operation_stats() -> dict[str, OperationStats]:
+    return dict(_operations)
+
+
+def render_prometheus(gauges: dict[str, float] | None = None) -> str:
+    """Render the data-layer metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP supabase_request_duration_seconds Supabase round-trip latency.",
+        "# TYPE supabase_request_duration_seconds histogram",
+    ]
+    for operation, stats in sorted(_operations.items()):
+        label = f'operation="{operation}"'
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, stats.bucket_counts):
+            cumulative += count
+            lines.append(
+                f'supabase_request_duration_seconds_bucket{{{label},le="{bound}"}} {cumulative}'
+            )
+        lines.append(
+            f'supabase_request_duration_seconds_bucket{{{label},le="+Inf"}} {stats.calls}'
+        )
+        lines.append(
+            f"supabase_request_duration_seconds_sum{{{label}}} {stats.seconds_sum}"
+        )
+        lines.append(
+            f"supabase_request_duration_seconds_count{{{label}}} {stats.calls}"
+        )
+    for name, attr, help_text in (
+        ("supabase_request_errors_total", "errors", "Failed Supabase round trips."),
+        ("supabase_rows_returned_total", "rows", "Rows returned by Supabase."),
+        ("supabase_response_bytes_total", "response_bytes", "Response payload bytes."),
+    ):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for operation, stats in sorted(_operations.items()):
+            lines.append(f'{name}{{operation="{operation}"}} {getattr(stats, attr)}')
+    for name, counts, help_text in (
+        ("page_loads_total", _page_loads, "Instrumented page loads."),
+        (
+            "page_budget_violations_total",
+            _page_budget_violations,
+            "Page loads over their round-trip budget.",
+        ),
+    ):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for route, count in sorted(counts.items()):
+            lines.append(f'{name}{{route="{route}"}} {count}')
+    lines.append(
+        "# HELP state_size_budget_violations_total Session states over their size budget."
+    )
+    lines.append("# TYPE state_size_budget_violations_total counter")
+    for state, count in sorted(_state_budget_violations.items()):
+        lines.append(f'state_size_budget_violations_total{{state="{state}"}} {count}')
+    for name, sizes, help_text in (
+        ("state_serialized_bytes", _state_sizes, "Pickled size of one session state."),
+        ("state_delta_bytes", _delta_sizes, "JSON size of one state delta."),
+    ):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} summary")
+        for state, samples in sorted(sizes.items()):
+            ordered = sorted(samples)
+            for quantile in (0.5, 0.99):
+                lines.append(
+                    f'{name}{{state="{state}",quantile="{quantile}"}} '
+                    f"{_percentile(ordered, quantile)}"
+                )
+            lines.append(f'{name}_sum{{state="{state}"}} {sum(ordered)}')
+            lines.append(f'{name}_count{{state="{state}"}} {len(ordered)}')
+    for name, value in sorted((gauges or {}).items()):
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
\ No newline at end of file
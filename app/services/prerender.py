@@ -0,0 +1,220 @@
+import hashlib
+import html
+import time
+from dataclasses import dataclass
+
+# Cards per section on the pre-rendered home page; the live page still
+# lists the full sections once the app has connected.
+HOME_SECTION_LIMIT = 24
+HOME_PATH = "/"
+# Where the API serves these pages; shared profile links point here.
+PRERENDERED_PREFIX = "/prerendered"
+
+_STYLE = """
+body{margin:0;font-family:Inter,system-ui,sans-serif;color:#1f2937;background:#fff}
+a{color:inherit;text-decoration:none}
+header,main,footer{max-width:72rem;margin:0 auto;padding:1rem}
+header{display:flex;justify-content:space-between;align-items:center}
+.brand{font-weight:700;font-size:1.25rem}
+.button{background:var(--accent);color:#fff;padding:.5rem 1rem;border-radius:.5rem}
+.hero{text-align:center;padding:3rem 1rem}
+.hero h1{font-size:2.25rem;margin:0 0 1rem}
+.grid{display:grid;grid-template-columns:repeat(auto-fill,minmax(16rem,1fr));gap:1.5rem}
+.categories{display:flex;flex-wrap:wrap;gap:.5rem;justify-content:center}
+.chip{border:1px solid #e5e7eb;border-radius:9999px;padding:.25rem .75rem}
+.card{border:1px solid #e5e7eb;border-radius:.75rem;overflow:hidden}
+.card img,.profile img{width:100%;object-fit:cover;background:#f3f4f6}
+.card img{height:10rem}
+.card div{padding:1rem}
+.profile img{max-height:24rem;border-radius:.75rem}
+.muted{color:#6b7280}
+.featured{color:var(--accent);font-weight:600}
+"""
+
+
+@dataclass
+class PrerenderedPage:
+    """One rendered public page and what it was rendered from."""
+
+    html: str
+    etag: str
+    provider_ids: frozenset[int]
+    expires_at: float
+    # Lowest rating in the home page's top-rated section when that section
+    # was full, so that only a provider rated at least as high can change it.
+    rating_floor: float | None = None
+
+
+class PrerenderCache:
+    """Rendered HTML for ``/`` and ``/business/[id]``, regenerated per page.
+
+    Pages are rendered on first request and kept until they expire or a
+    provider they show changes. A write to one listing only drops that
+    listing's profile and, when the listing appears on (or could now
+    enter) the home page, the home page.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._pages: dict[str, PrerenderedPage] = {}
+        self.hits = 0
+        self.renders = 0
+        self.invalidations = 0
+
+    def get(self, path: str) -> PrerenderedPage | None:
+        page = self._pages.get(path)
+        if page is None or page.expires_at < time.monotonic():
+            return None
+        self.hits += 1
+        return page
+
+    def set(
+        self,
+        path: str,
+        page_html: str,
+        provider_ids: frozenset[int],
+        rating_floor: float | None = None,
+    ) -> PrerenderedPage:
+        self.renders += 1
+        page = PrerenderedPage(
+            html=page_html,
+            etag='"' + hashlib.sha256(page_html.encode()).hexdigest()[:32] + '"',
+            provider_ids=provider_ids,
+            expires_at=time.monotonic() + self.ttl,
+            rating_floor=rating_floor,
+        )
+        self._pages[path] = page
+        return page
+
+    def invalidate(self, path: str | None = None):
+        self.invalidations += 1
+        if path is None:
+            self._pages.clear()
+        else:
+            self._pages.pop(path, None)
+
+    def invalidate_providers(
+        self, upserted: list[dict] = (), deleted_ids: list[int] = ()
+    ):
+        """Drop only the pages that show, or could now show, these providers."""
+        changed_ids = {p["id"] for p in upserted} | set(deleted_ids)
+        for provider_id in changed_ids:
+            self.invalidate(business_path(provider_id))
+        home = self._pages.get(HOME_PATH)
+        if home is None:
+            return
+        if changed_ids & home.provider_ids or any(
+            provider.get("featured")
+            or home.rating_floor is None
+            or float(provider.get("rating") or 0) >= home.rating_floor
+            for provider in upserted
+        ):
+            self.invalidate(HOME_PATH)
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "renders": self.renders,
+            "invalidations": self.invalidations,
+            "size": len(self._pages),
+        }
+
+
+def business_path(provider_id: int) -> str:
+    return f"/business/{provider_id}"
+
+
+def _document(settings: dict, title: str, description: str, body: str) -> str:
+    e = html.escape
+    app_name = settings.get("app_name", "Urban Hand")
+    return (
+        "<!DOCTYPE html>"
+        '<html lang="en"><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f"<title>{e(title)}</title>"
+        f'<meta name="description" content="{e(description)}">'
+        f'<meta property="og:title" content="{e(title)}">'
+        f'<meta property="og:description" content="{e(description)}">'
+        f'<meta property="og:site_name" content="{e(app_name)}">'
+        f"<style>:root{{--accent:{e(settings.get('accent_color', '#14b8a6'))}}}"
+        f"{_STYLE}</style></head><body>"
+        f'<header><a class="brand" href="/">{e(app_name)}</a>'
+        f'<a class="button" href="/get-listed">'
+        f"{e(settings.get('get_listed_text', 'Get Listed'))}</a></header>"
+        f"<main>{body}</main>"
+        f'<footer class="muted">&copy; {e(app_name)}</footer>'
+        "</body></html>"
+    )
+
+
+def _provider_card(provider: dict) -> str:
+    e = html.escape
+    featured = (
+        '<span class="featured">Featured</span> ' if provider.get("featured") else ""
+    )
+    return (
+        f'<a class="card" href="{business_path(provider["id"])}">'
+        f'<img src="{e(provider.get("image_url", ""))}" alt="" loading="lazy">'
+        f"<div>{featured}<strong>{e(provider.get('name', ''))}</strong>"
+        f'<p class="muted">{e(provider.get("category", ""))} &middot; '
+        f"{e(provider.get('location', ''))}</p>"
+        f"<p>&#9733; {provider.get('rating', 0)} "
+        f'<span class="muted">({provider.get("reviews", 0)} reviews)</span></p>'
+        "</div></a>"
+    )
+
+
+def render_home_page(
+    settings: dict, featured: list[dict], top_rated: list[dict]
+) -> str:
+    e = html.escape
+    categories = "".join(
+        f'<span class="chip">{e(category["name"])}</span>'
+        for category in settings.get("service_categories", [])
+        if category.get("enabled", True)
+    )
+    sections = "".join(
+        f'<section><h2>{heading}</h2><div class="grid">'
+        + "".join(_provider_card(p) for p in providers)
+        + "</div></section>"
+        for heading, providers in (
+            ("Featured Providers", featured),
+            ("Top Rated Near You", top_rated),
+        )
+        if providers
+    )
+    body = (
+        f'<section class="hero"><h1>{e(settings.get("hero_title", ""))}</h1>'
+        f'<p class="muted">{e(settings.get("hero_subtitle", ""))}</p>'
+        f'<a class="button" href="/search">Find a provider</a></section>'
+        f'<section class="categories">{categories}</section>{sections}'
+    )
+    return _document(
+        settings,
+        settings.get("app_name", "Urban Hand"),
+        settings.get("hero_subtitle", ""),
+        body,
+    )
+
+
+def render_business_page(settings: dict, provider: dict) -> str:
+    e = html.escape
+    name = provider.get("name", "")
+    summary = f"{provider.get('category', '')} in {provider.get('location', '')}"
+    body = (
+        '<article class="profile">'
+        f'<img src="{e(provider.get("image_url", ""))}" alt="{e(name)}">'
+        f"<h1>{e(name)}</h1>"
+        + ('<p class="featured">Featured</p>' if provider.get("featured") else "")
+        + f'<p class="muted">{e(summary)}</p>'
+        f"<p>&#9733; {provider.get('rating', 0)} "
+        f'<span class="muted">({provider.get("reviews", 0)} reviews)</span></p>'
+        f'<a class="button" href="{business_path(provider["id"])}">'
+        "Contact this provider</a></article>"
+    )
+    return _document(
+        settings,
+        f"{name} | {settings.get('app_name', 'Urban Hand')}",
+        summary,
+        body,
+    )
\ No newline at end of file
@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+from postgrest.exceptions import APIError
+from reflex.config import get_config
+from app.services import metrics
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Supabase while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` failures in a row the breaker opens and every
+    call fails fast for ``reset_timeout`` seconds. It then lets a single
+    probe through (half-open); a success closes it again, a failure re-opens
+    it for another ``reset_timeout``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected_calls = 0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected_calls += 1
+                return False
+            self.state = self.HALF_OPEN
+        if self._probe_in_flight:
+            self.rejected_calls += 1
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self):
+        """Forget an in-flight probe whose call was cancelled before it finished."""
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if (
+            self.state == self.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            if self.state != self.OPEN:
+                self.times_opened += 1
+                logging.warning(
+                    f"Supabase circuit breaker opened after {self.consecutive_failures} failures."
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def metrics(self) -> dict[str, int | str]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected_calls": self.rejected_calls,
+        }
+
+
+class RetryBudget:
+    """Caps retries at a fraction of recent calls so retries cannot snowball.
+
+    Each call deposits ``ratio`` tokens (up to ``max_tokens``) and each retry
+    spends one, so at most roughly ``ratio`` of traffic is ever retries.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.retries = 0
+        self.exhausted = 0
+
+    def record_call(self):
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.tokens < 1:
+            self.exhausted += 1
+            return False
+        self.tokens -= 1
+        self.retries += 1
+        return True
+
+    def metrics(self) -> dict[str, int | float]:
+        return {
+            "tokens": self.tokens,
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+        }
+
+
+_config = get_config()
+supabase_breaker = CircuitBreaker(
+    failure_threshold=getattr(_config, "supabase_breaker_failure_threshold", 5),
+    reset_timeout=getattr(_config, "supabase_breaker_reset_seconds", 30),
+)
+retry_budget = RetryBudget(
+    ratio=getattr(_config, "supabase_retry_budget_ratio", 0.2),
+    max_tokens=getattr(_config, "supabase_retry_budget_max_tokens", 10),
+)
+DEFAULT_DEADLINE = getattr(_config, "supabase_call_timeout", 5.0)
+OPERATION_DEADLINES: dict[str, float] = getattr(
+    _config, "supabase_operation_timeouts", {}
+)
+# SQLSTATE / PostgREST codes that mean the database side is unhealthy rather
+# than that the request was invalid: statement timeout, and PostgREST being
+# unable to reach or use its connection pool.
+UPSTREAM_FAILURE_CODES = {"57014", "PGRST000", "PGRST001", "PGRST002", "PGRST003"}
+MAX_RETRIES = getattr(_config, "supabase_max_retries", 2)
+RETRY_BASE_DELAY = 0.05
+
+
+def _is_upstream_failure(error: APIError) -> bool:
+    if isinstance(error.code, int):
+        return error.code >= 500
+    return error.code in UPSTREAM_FAILURE_CODES
+
+
+def is_rejection(error: BaseException) -> bool:
+    """Whether Supabase answered and refused the request itself.
+
+    Such a request fails the same way every time, unlike a timeout, an open
+    circuit or an unhealthy upstream, which may succeed later.
+    """
+    return isinstance(error, APIError) and not _is_upstream_failure(error)
+
+
+async def _timed_attempt(
+    operation: str, fn: Callable[[], Awaitable[T]], timeout: float
+) -> T:
+    record, token = metrics.start_call()
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(fn(), timeout)
+    except BaseException:
+        metrics.finish_call(
+            token, record, operation, time.perf_counter() - start, error=True
+        )
+        raise
+    metrics.finish_call(token, record, operation, time.perf_counter() - start, result)
+    return result
+
+
+async def resilient_call(
+    operation: str, fn: Callable[[], Awaitable[T]], idempotent: bool = False
+) -> T:
+    """Run one Supabase request with a deadline, retries and the circuit breaker.
+
+    Only ``idempotent`` calls are retried, with jittered exponential backoff
+    and only while the shared retry budget allows it. Raises CircuitOpenError
+    without touching the network while the breaker is open.
+    """
+    timeout = OPERATION_DEADLINES.get(operation, DEFAULT_DEADLINE)
+    # postgrest retries GETs answered with 503/520 on its own, sleeping 1-4 s
+    # between tries where neither the budget nor the breaker can see it.
+    builder = getattr(fn, "__self__", None)
+    if hasattr(builder, "retry"):
+        builder.retry(False)
+    attempts = 1 + (MAX_RETRIES if idempotent else 0)
+    retry_budget.record_call()
+    attempt = 0
+    while True:
+        if not supabase_breaker.allow():
+            raise CircuitOpenError(f"Supabase circuit open; skipped {operation}")
+        try:
+            result = await _timed_attempt(operation, fn, timeout)
+        except asyncio.CancelledError:
+            supabase_breaker.release_probe()
+            raise
+        except APIError as e:
+            if not _is_upstream_failure(e):
+                # PostgREST answered and rejected the request itself, so the
+                # upstream is healthy and retrying would not change anything.
+                supabase_breaker.record_success()
+                raise
+            failure = e
+        except Exception as e:
+            failure = e
+        else:
+            supabase_breaker.record_success()
+            return result
+        supabase_breaker.record_failure()
+        attempt += 1
+        if attempt >= attempts or not retry_budget.try_spend():
+            raise failure
+        await asyncio.sleep(
+            RETRY_BASE_DELAY * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+        )
+
+
+def resilience_metrics() -> dict[str, Any]:
+    return {
+        "breaker": supabase_breaker.metrics(),
+        "retry_budget": retry_budget.metrics(),
+    }
\ No newline at end of file
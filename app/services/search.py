@@ -0,0 +1,318 @@
+import bisect
+import heapq
+import math
+import re
+from collections.abc import Callable
+
+_TOKEN_RE = re.compile(r"\w+")
+SEARCH_FIELDS = ("name", "location", "category")
+# How much a query term is worth when it only matches a token as a prefix
+# or through a typo, relative to an exact token match.
+PREFIX_MATCH_WEIGHT = 0.8
+FUZZY_MATCH_WEIGHTS = {1: 0.6, 2: 0.35}
+# Terms shorter than this are never fuzzy-matched: "tv" is one edit away
+# from far too many tokens to be useful.
+FUZZY_MIN_LENGTH = 4
+BM25_K1 = 1.2
+BM25_B = 0.75
+RATING_BOOST = 0.5
+FEATURED_BOOST = 1.25
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def provider_tokens(provider: dict) -> tuple[str, ...]:
+    return tuple(
+        tokenize(" ".join(str(provider.get(field, "")) for field in SEARCH_FIELDS))
+    )
+
+
+def trigrams(token: str) -> set[str]:
+    padded = f"${token}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance between ``a`` and ``b``, or ``limit + 1`` once it
+    is known to exceed ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class ProviderSearchIndex:
+    """Typo-tolerant, ranked search over provider name, location and category.
+
+    An inverted index maps each token to the catalog positions containing
+    it, and a trigram index over the token vocabulary proposes typo
+    candidates that are then confirmed by edit distance. Each query term is
+    matched exactly, as a prefix (the user may still be typing) or with up
+    to one or two typos; a provider must match every term. Matches are
+    scored with BM25 and boosted by rating and featured status.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, set[int]] = {}
+        self._trigrams: dict[str, set[str]] = {}
+        self._tokens: list[str] = []
+        self._doc_tokens: dict[int, tuple[str, ...]] = {}
+        self._providers: dict[int, dict] = {}
+        self._positions: dict[int, int] = {}
+        self._next_position = 0
+        self._total_length = 0
+        self._average_length = 1.0
+        self._doc_factors: dict[int, float] = {}
+        # Postings ordered by doc factor, best first, for one-term queries.
+        self._ranked: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._providers)
+
+    def rebuild(self, providers: list[dict]):
+        self.__init__()
+        for position, provider in enumerate(providers):
+            tokens = provider_tokens(provider)
+            self._positions[provider["id"]] = position
+            self._providers[position] = provider
+            self._doc_tokens[position] = tokens
+            self._total_length += len(tokens)
+            for token in tokens:
+                self._postings.setdefault(token, set()).add(position)
+        self._next_position = len(providers)
+        self._average_length = self._total_length / len(providers) if providers else 1.0
+        for position, provider in self._providers.items():
+            self._doc_factors[position] = self._doc_factor(provider, position)
+        self._tokens = sorted(self._postings)
+        for token in self._tokens:
+            for gram in trigrams(token):
+                self._trigrams.setdefault(gram, set()).add(token)
+            self._ranked_postings(token)
+
+    def sync(self, providers: list[dict]):
+        """Bring the index in line with a reloaded catalog.
+
+        Only providers that are new or changed are re-tokenized, so the
+        periodic catalog refresh does not pay for a full rebuild.
+        """
+        if not self._providers:
+            self.rebuild(providers)
+            return
+        seen = set()
+        for provider in providers:
+            seen.add(provider["id"])
+            position = self._positions.get(provider["id"])
+            if position is not None and self._providers[position] == provider:
+                self._providers[position] = provider
+            else:
+                self.add(provider)
+        for provider_id in self._positions.keys() - seen:
+            self.remove(provider_id)
+
+    def add(self, provider: dict):
+        """Index ``provider``, replacing any previous version with its id."""
+        position = self._positions.get(provider["id"])
+        if position is None:
+            position = self._next_position
+            self._next_position += 1
+            self._positions[provider["id"]] = position
+        else:
+            self._unindex(position)
+        tokens = provider_tokens(provider)
+        self._providers[position] = provider
+        self._doc_tokens[position] = tokens
+        self._total_length += len(tokens)
+        self._doc_factors[position] = self._doc_factor(provider, position)
+        for token in tokens:
+            self._ranked.pop(token, None)
+            positions = self._postings.get(token)
+            if positions is None:
+                positions = self._postings[token] = set()
+                bisect.insort(self._tokens, token)
+                for gram in trigrams(token):
+                    self._trigrams.setdefault(gram, set()).add(token)
+            positions.add(position)
+
+    def remove(self, provider_id: int):
+        position = self._positions.pop(provider_id, None)
+        if position is not None:
+            self._unindex(position)
+
+    def _unindex(self, position: int):
+        del self._providers[position]
+        del self._doc_factors[position]
+        tokens = self._doc_tokens.pop(position)
+        self._total_length -= len(tokens)
+        for token in set(tokens):
+            self._ranked.pop(token, None)
+            positions = self._postings[token]
+            positions.discard(position)
+            if positions:
+                continue
+            del self._postings[token]
+            del self._tokens[bisect.bisect_left(self._tokens, token)]
+            for gram in trigrams(token):
+                vocabulary = self._trigrams[gram]
+                vocabulary.discard(token)
+                if not vocabulary:
+                    del self._trigrams[gram]
+
+    def _doc_factor(self, provider: dict, position: int) -> float:
+        """The query-independent part of a provider's score.
+
+        Every token counts once per provider, so BM25's term-frequency
+        saturation reduces to a length normalisation shared by all terms.
+        The average length is fixed at the last rebuild; incremental edits
+        barely move it.
+        """
+        length = len(self._doc_tokens[position])
+        factor = (BM25_K1 + 1) / (
+            1 + BM25_K1 * (1 - BM25_B + BM25_B * length / self._average_length)
+        )
+        factor *= 1 + RATING_BOOST * float(provider.get("rating") or 0) / 5
+        if provider.get("featured"):
+            factor *= FEATURED_BOOST
+        return factor
+
+    def _ranked_postings(self, token: str) -> list[int]:
+        ranked = self._ranked.get(token)
+        if ranked is None:
+            ranked = self._ranked[token] = sorted(
+                self._postings[token], key=self._doc_factors.__getitem__, reverse=True
+            )
+        return ranked
+
+    def _expand(self, term: str) -> dict[str, float]:
+        """Vocabulary tokens ``term`` can stand for, with their match weight."""
+        matches = {}
+        i = bisect.bisect_left(self._tokens, term)
+        while i < len(self._tokens) and self._tokens[i].startswith(term):
+            token = self._tokens[i]
+            matches[token] = 1.0 if token == term else PREFIX_MATCH_WEIGHT
+            i += 1
+        if len(term) < FUZZY_MIN_LENGTH:
+            return matches
+        limit = 1 if len(term) <= 5 else 2
+        grams = trigrams(term)
+        shared: dict[str, int] = {}
+        for gram in grams:
+            for token in self._trigrams.get(gram, ()):
+                shared[token] = shared.get(token, 0) + 1
+        # Each edit touches at most three trigrams.
+        required = max(1, len(grams) - 3 * limit)
+        for token, count in shared.items():
+            if count < required or token in matches:
+                continue
+            distance = edit_distance(term, token, limit)
+            if distance <= limit:
+                matches[token] = FUZZY_MATCH_WEIGHTS[distance]
+        return matches
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = None,
+        accept: Callable[[dict], bool] | None = None,
+    ) -> list[dict] | None:
+        """The providers matching ``query``, best match first.
+
+        Only providers passing ``accept`` are returned, and with ``limit``
+        only the best ``limit`` of them, picked without sorting every match.
+        Returns None when the query has no searchable tokens, meaning "no
+        text constraint" rather than "no matches".
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return None
+        total = len(self._providers)
+        expansions = [self._expand(term) for term in terms]
+        if len(expansions) == 1 and limit is not None:
+            return self._top_for_term(expansions[0], limit, accept)
+        # Start from the most selective term so later terms only have to
+        # look at providers that can still match.
+        expansions.sort(key=lambda tokens: sum(len(self._postings[t]) for t in tokens))
+        scores: dict[int, float] | None = None
+        for tokens in expansions:
+            # Apply the weakest matches first so that a provider matching
+            # the term several ways keeps its best weight.
+            term_scores: dict[int, float] = {}
+            for token, weight in sorted(tokens.items(), key=lambda m: m[1]):
+                positions = self._postings[token]
+                if scores is not None:
+                    positions = scores.keys() & positions
+                term_scores.update(dict.fromkeys(positions, weight))
+            if not term_scores:
+                return []
+            frequency = min(total, sum(len(self._postings[t]) for t in tokens))
+            idf = math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+            if scores is None:
+                scores = {p: weight * idf for p, weight in term_scores.items()}
+            else:
+                scores = {
+                    p: scores[p] + weight * idf for p, weight in term_scores.items()
+                }
+        factors = self._doc_factors
+        providers = self._providers
+        candidates = (
+            scores if accept is None else [p for p in scores if accept(providers[p])]
+        )
+        if limit is None:
+            ranked = sorted(candidates, key=lambda p: -scores[p] * factors[p])
+        else:
+            ranked = heapq.nlargest(
+                limit, candidates, key=lambda p: scores[p] * factors[p]
+            )
+        return [providers[position] for position in ranked]
+
+    def _top_for_term(
+        self,
+        tokens: dict[str, float],
+        limit: int,
+        accept: Callable[[dict], bool] | None,
+    ) -> list[dict]:
+        """The best ``limit`` matches of a one-term query, found lazily.
+
+        With one term the idf is the same for every match, so a provider
+        ranks by its best token weight times its doc factor. Merging the
+        matching tokens' factor-ordered postings yields providers best
+        first, and the walk stops at the ``limit``-th accepted one instead
+        of scoring every match (a single typed letter matches most of the
+        catalog).
+        """
+        streams = [
+            _weighted(self._ranked_postings(token), weight, self._doc_factors)
+            for token, weight in tokens.items()
+        ]
+        providers = self._providers
+        seen = set()
+        top = []
+        for _, position in heapq.merge(*streams):
+            if position in seen:
+                continue
+            seen.add(position)
+            provider = providers[position]
+            if accept is None or accept(provider):
+                top.append(provider)
+                if len(top) == limit:
+                    break
+        return top
+
+
+def _weighted(ranked: list[int], weight: float, factors: dict[int, float]):
+    for position in ranked:
+        yield -weight * factors[position], position
\ No newline at end of file
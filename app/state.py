@@ -1,5 +1,8 @@
 import reflex as rx
+import asyncio
+import copy
 from typing import TypedDict, Any
+from app.services.columns import ProviderColumns
 
 
 class ServiceCategory(TypedDict):
@@ -32,68 +35,193 @@ class ProviderApplication(TypedDict):
     plan: str
 
 
+DEFAULT_APP_SETTINGS: dict[str, str | list[ServiceCategory]] = {
+    "app_name": "Urban Hand",
+    "hero_title": "Connecting Local Hands to Local Needs.",
+    "hero_subtitle": "Find trusted local service providers in your city, with just a few clicks.",
+    "get_listed_text": "Get Listed",
+    "accent_color": "#14b8a6",
+    "service_categories": [
+        {"id": "1", "name": "Electrician", "icon": "zap", "enabled": True},
+        {"id": "2", "name": "Plumber", "icon": "droplet", "enabled": True},
+        {"id": "3", "name": "Tailor", "icon": "scissors", "enabled": True},
+        {"id": "4", "name": "Carpenter", "icon": "hammer", "enabled": True},
+        {
+            "id": "5",
+            "name": "Tiffin",
+            "icon": "utensils-crossed",
+            "enabled": True,
+        },
+        {"id": "6", "name": "Tutor", "icon": "book-user", "enabled": True},
+        {
+            "id": "7",
+            "name": "Photographer",
+            "icon": "camera",
+            "enabled": True,
+        },
+        {"id": "8", "name": "Others", "icon": "ellipsis", "enabled": True},
+    ],
+}
+
+
+def without_cached_vars(
+    state: rx.State, state_dict: dict[str, Any], var_names: tuple[str, ...]
+) -> dict[str, Any]:
+    """Drop the cached values of ``var_names`` from a state being pickled.
+
+    Vars derived from the shared provider catalog are cheap to recompute
+    from the worker's snapshot, so persisting them would only put a copy of
+    the catalog back into every serialized session.
+    """
+    for name in var_names:
+        state_dict.pop(state.computed_vars[name]._cache_attr, None)
+    return state_dict
+
+
+# Search results rendered per "show more" step; only this many are ranked
+# and sent to the client, however many providers match.
+SEARCH_PAGE_SIZE = 24
+CATALOG_VARS = (
+    "featured_providers",
+    "top_rated_providers",
+    "filtered_providers",
+)
+
+
 class UIState(rx.State):
     """The UI state for the app."""
 
     service_categories: list[ServiceCategory] = []
-    providers: list[Provider] = []
+    catalog_version: int = 0
     search_query: str = ""
     category_filter: str = "All"
     rating_filter: float = 0.0
     open_now_filter: bool = False
+    search_result_limit: int = SEARCH_PAGE_SIZE
     new_review_text: str = ""
     new_review_rating: int = 0
     app_settings: dict[str, str | list[ServiceCategory]] = {}
+    current_provider: Provider | None = None
 
-    @rx.event
-    async def load_initial_data(self):
-        """Load initial data from the database for the main UI."""
-        from app.states.admin_settings_state import AdminSettingsState
-        from app.services.firebase_service import get_providers, get_app_settings
-
-        admin_settings = await self.get_state(AdminSettingsState)
-        await admin_settings.initialize_settings()
-        db_settings = await get_app_settings()
-        db_providers = await get_providers()
+    def _apply_settings(self, db_settings: dict):
+        if not db_settings:
+            db_settings = copy.deepcopy(DEFAULT_APP_SETTINGS)
         self.app_settings = db_settings
         retrieved_categories = db_settings.get("service_categories", [])
         if isinstance(retrieved_categories, list):
             self.service_categories = retrieved_categories
-        self.providers = db_providers
+
+    @rx.event
+    async def load_initial_data(self):
+        """Load settings and the provider catalog for the public pages.
+
+        Both are fetched concurrently (and usually straight from the service
+        caches), without pulling the admin settings state into the session.
+        """
+        from app.services.firebase_service import (
+            get_providers,
+            get_app_settings,
+            get_catalog_version,
+        )
+        from app.services.metrics import page_budget
+
+        route = "/search" if self.router.page.path == "/search" else "/"
+        with page_budget(route):
+            db_settings, db_providers = await asyncio.gather(
+                get_app_settings(), get_providers()
+            )
+        self._apply_settings(db_settings)
+        if db_providers:
+            self.catalog_version = get_catalog_version()
+
+    @rx.event
+    async def load_business_page(self):
+        """Load the profile in the route, then count a view of it.
+
+        Only the one provider is looked up (from the catalog if this worker
+        has it, else a cached single-row fetch), so a deep link resolves
+        without the visitor having loaded the home page first.
+        """
+        from app.services.firebase_service import get_app_settings, get_provider
+        from app.services.metrics import page_budget
+        from app.states.analytics_state import AnalyticsState
+
+        provider_id = self.router.page.params.get("id", "")
+        with page_budget("/business/[id]"):
+            if provider_id.isdigit():
+                db_settings, provider = await asyncio.gather(
+                    get_app_settings(), get_provider(int(provider_id))
+                )
+            else:
+                db_settings, provider = await get_app_settings(), None
+        self._apply_settings(db_settings)
+        self.current_provider = provider
+        if provider:
+            return AnalyticsState.track_page_view(provider["id"])
+
+    def __getstate__(self):
+        return without_cached_vars(self, super().__getstate__(), CATALOG_VARS)
+
+    def _catalog(self) -> ProviderColumns | None:
+        """The worker's shared catalog, once this session has loaded it.
+
+        Sessions only store ``catalog_version``; the providers themselves
+        are read from the process-wide snapshot.
+        """
+        from app.services.firebase_service import catalog_columns
+
+        if not self.catalog_version:
+            return None
+        return catalog_columns()
 
     @rx.var
     def featured_providers(self) -> list[Provider]:
-        return [p for p in self.providers if p["featured"]]
+        columns = self._catalog()
+        return columns.featured_providers() if columns is not None else []
 
     @rx.var
     def top_rated_providers(self) -> list[Provider]:
-        return sorted(
-            [p for p in self.providers if not p["featured"]],
-            key=lambda x: x["rating"],
-            reverse=True,
-        )
+        columns = self._catalog()
+        return columns.top_rated() if columns is not None else []
 
     @rx.var
     def filtered_providers(self) -> list[Provider]:
         """Return a list of providers filtered by the search and filter options."""
-        return [
-            p
-            for p in self.providers
-            if (
-                self.search_query.lower() in p["name"].lower()
-                or self.search_query.lower() in p["location"].lower()
+        from app.services.firebase_service import search_catalog
+
+        columns = self._catalog()
+        if columns is None:
+            return []
+        if self.search_query.strip():
+            matches = search_catalog(
+                self.search_query,
+                self.search_result_limit,
+                columns.accepts(self.category_filter, self.rating_filter),
             )
-            and (self.category_filter == "All" or p["category"] == self.category_filter)
-            and (p["rating"] >= self.rating_filter)
-        ]
+            if matches is not None:
+                return matches
+        return columns.filter(
+            self.category_filter, self.rating_filter, limit=self.search_result_limit
+        )
 
-    @rx.var
-    def current_provider(self) -> Provider | None:
-        """The currently viewed provider."""
-        provider_id = self.router.page.params.get("id", "")
-        if not provider_id:
-            return None
-        for p in self.providers:
-            if str(p["id"]) == provider_id:
-                return p
-        return None
\ No newline at end of file
+    # The filter setters start the results over at the first page, so a
+    # session that paged deep into one search does not carry that limit
+    # into the next.
+    @rx.event
+    def set_search_query(self, value: str):
+        self.search_query = value
+        self.search_result_limit = SEARCH_PAGE_SIZE
+
+    @rx.event
+    def set_category_filter(self, value: str):
+        self.category_filter = value
+        self.search_result_limit = SEARCH_PAGE_SIZE
+
+    @rx.event
+    def set_rating_filter(self, value: float):
+        self.rating_filter = value
+        self.search_result_limit = SEARCH_PAGE_SIZE
+
+    @rx.event
+    def show_more_results(self):
+        self.search_result_limit += SEARCH_PAGE_SIZE
\ No newline at end of file
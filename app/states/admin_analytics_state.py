@@ -1,10 +1,12 @@
 import reflex as rx
+import asyncio
 from typing import TypedDict
 from app.services.firebase_service import (
-    get_business_analytics,
     get_recent_user_activity,
     get_providers,
 )
+from app.services.analytics_service import get_live_business_analytics
+from app.services.metrics import page_budget
 import datetime
 
 
@@ -25,6 +27,21 @@ class UserActivity(TypedDict):
     provider_name: str
 
 
+def _with_provider_names(
+    activity: list[dict], provider_names: dict[int, str] | None
+) -> list[dict]:
+    """Label activity rows with provider names, blank until the names load."""
+    return [
+        {
+            **row,
+            "provider_name": ""
+            if provider_names is None
+            else provider_names.get(row.get("provider_id"), "Unknown"),
+        }
+        for row in activity
+    ]
+
+
 class AdminAnalyticsState(rx.State):
     """State for the admin analytics dashboard."""
 
@@ -35,17 +52,38 @@ class AdminAnalyticsState(rx.State):
 
     @rx.event
     async def on_load(self):
-        """Load all analytics data from the database."""
-        providers = await get_providers()
-        self.provider_map = {p["id"]: p["name"] for p in providers}
-        stats_data = await get_business_analytics()
-        self.business_stats = stats_data
-        activity_data = await get_recent_user_activity(limit=20)
-        for activity in activity_data:
-            activity["provider_name"] = self.provider_map.get(
-                activity.get("provider_id"), "Unknown"
-            )
-        self.recent_activity = activity_data
+        """Load all analytics data from the database.
+
+        The three datasets are fetched concurrently and each is pushed to the
+        client as soon as it arrives, in whatever order that is, so the stat
+        cards never wait for the activity feed or the other way round.
+        """
+        activity_data: list[dict] = []
+        provider_names: dict[int, str] | None = None
+        with page_budget("/admin/dashboard/analytics"):
+            pending = {
+                asyncio.create_task(get_live_business_analytics()): "stats",
+                asyncio.create_task(get_providers()): "providers",
+                asyncio.create_task(get_recent_user_activity(limit=20)): "activity",
+            }
+            while pending:
+                done, _ = await asyncio.wait(
+                    set(pending), return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    dataset = pending.pop(task)
+                    if dataset == "stats":
+                        self.business_stats = task.result()
+                    elif dataset == "providers":
+                        provider_names = {p["id"]: p["name"] for p in task.result()}
+                        self.provider_map = provider_names
+                    else:
+                        activity_data = task.result()
+                    if dataset == "activity" or activity_data:
+                        self.recent_activity = _with_provider_names(
+                            activity_data, provider_names
+                        )
+                yield
 
     @rx.var
     def total_views(self) -> int:
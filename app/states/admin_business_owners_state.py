@@ -1,4 +1,5 @@
 import reflex as rx
+import asyncio
 import bcrypt
 import uuid
 from typing import TypedDict, Any
@@ -6,8 +7,12 @@ from app.services.firebase_service import (
     get_business_owners,
     save_business_owners,
     get_providers,
+    get_catalog_version,
+    catalog_columns,
     update_owner_password,
 )
+from app.services.metrics import page_budget
+from app.state import without_cached_vars
 
 
 class BusinessOwner(TypedDict):
@@ -20,8 +25,7 @@ class BusinessOwner(TypedDict):
 
 class AdminBusinessOwnersState(rx.State):
     owners: list[BusinessOwner] = []
-    providers: list[dict] = []
-    provider_map: dict[int, str] = {}
+    catalog_version: int = 0
     show_add_modal: bool = False
     show_reset_password_modal: bool = False
     selected_owner: BusinessOwner | None = None
@@ -30,14 +34,40 @@ class AdminBusinessOwnersState(rx.State):
 
     @rx.event
     async def load_data(self):
-        self.owners = await get_business_owners()
-        self.providers = await get_providers()
-        self.provider_map = {p["id"]: p["name"] for p in self.providers}
+        """Load owner accounts and the catalog the link picker offers.
+
+        Both are fetched concurrently and each is pushed to the client as
+        soon as it arrives, so the owners table never waits on the catalog.
+        """
+        with page_budget("/admin/dashboard/owners"):
+            pending = {
+                asyncio.create_task(get_business_owners()): "owners",
+                asyncio.create_task(get_providers()): "providers",
+            }
+            while pending:
+                done, _ = await asyncio.wait(
+                    set(pending), return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if pending.pop(task) == "owners":
+                        self.owners = task.result()
+                    elif task.result():
+                        self.catalog_version = get_catalog_version()
+                yield
+
+    def __getstate__(self):
+        return without_cached_vars(
+            self, super().__getstate__(), ("unlinked_providers", "provider_name_map")
+        )
+
+    def _providers(self) -> list[dict]:
+        columns = catalog_columns() if self.catalog_version else None
+        return columns.filter() if columns is not None else []
 
     @rx.var
     def unlinked_providers(self) -> list[dict]:
         linked_provider_ids = {owner["provider_id"] for owner in self.owners}
-        return [p for p in self.providers if p["id"] not in linked_provider_ids]
+        return [p for p in self._providers() if p["id"] not in linked_provider_ids]
 
     @rx.event
     def open_add_modal(self):
@@ -90,4 +120,4 @@ class AdminBusinessOwnersState(rx.State):
 
     @rx.var
     def provider_name_map(self) -> dict[int, str]:
-        return {p["id"]: p["name"] for p in self.providers}
\ No newline at end of file
+        return {p["id"]: p["name"] for p in self._providers()}
\ No newline at end of file
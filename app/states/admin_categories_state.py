@@ -54,7 +54,7 @@ class AdminCategoriesState(rx.State):
         admin_settings = await self.get_state(AdminSettingsState)
         admin_settings.app_settings["service_categories"] = self.service_categories
         yield admin_settings.save_settings
-        yield UIState.on_load
+        yield UIState.load_initial_data
 
     @rx.event
     def open_add_modal(self):
@@ -1,15 +1,23 @@
 import reflex as rx
 from typing import Any
-from app.state import Provider, UIState, ServiceCategory
+from app.state import Provider, UIState, ServiceCategory, without_cached_vars
 from app.states.admin_categories_state import AdminCategoriesState
-from app.services.firebase_service import get_providers, save_providers
+from app.services.firebase_service import (
+    get_providers,
+    get_catalog_version,
+    catalog_columns,
+    insert_provider,
+    upsert_provider,
+    delete_provider,
+)
+from app.services.metrics import page_budget
 import uuid
 
 
 class AdminListingsState(rx.State):
     """State for managing business listings in the admin dashboard."""
 
-    all_listings: list[Provider] = []
+    catalog_version: int = 0
     search_query: str = ""
     category_filter: str = "All"
     status_filter: str = "All"
@@ -34,7 +42,8 @@ class AdminListingsState(rx.State):
 
     @rx.event
     async def load_listings(self):
-        self.all_listings = await get_providers()
+        with page_budget("/admin/dashboard/listings"):
+            await get_providers()
         yield AdminListingsState.sync_ui_state_providers
 
     @rx.event
@@ -80,9 +89,6 @@ class AdminListingsState(rx.State):
     @rx.event
     async def save_listing(self):
         listing_data = {
-            "id": int(self.modal_listing_id)
-            if self.modal_is_editing
-            else len(self.all_listings) + 2,
             "name": self.modal_business_name,
             "category": self.modal_category,
             "location": self.modal_address,
@@ -93,16 +99,9 @@ class AdminListingsState(rx.State):
             "featured": self.modal_featured,
         }
         if self.modal_is_editing:
-            index_to_update = -1
-            for i, p in enumerate(self.all_listings):
-                if str(p["id"]) == self.modal_listing_id:
-                    index_to_update = i
-                    break
-            if index_to_update != -1:
-                self.all_listings[index_to_update] = listing_data
+            await upsert_provider({"id": int(self.modal_listing_id), **listing_data})
         else:
-            self.all_listings.append(listing_data)
-        await save_providers(self.all_listings)
+            await insert_provider(listing_data)
         self.close_listing_modal()
         yield AdminListingsState.sync_ui_state_providers
 
@@ -117,24 +116,32 @@ class AdminListingsState(rx.State):
 
     @rx.event
     async def delete_listing(self):
-        self.all_listings = [
-            p for p in self.all_listings if str(p["id"]) != self.listing_to_delete_id
-        ]
-        await save_providers(self.all_listings)
+        if self.listing_to_delete_id.isdigit():
+            await delete_provider(int(self.listing_to_delete_id))
         self.cancel_delete()
         yield AdminListingsState.sync_ui_state_providers
 
     @rx.var
     def filtered_listings(self) -> list[Provider]:
+        columns = catalog_columns() if self.catalog_version else None
+        if columns is None:
+            return []
+        listings = columns.filter(self.category_filter)
         query = self.search_query.lower()
+        if not query:
+            return listings
         return [
             p
-            for p in self.all_listings
-            if (query in p["name"].lower() or query in p["location"].lower())
-            and (self.category_filter == "All" or p["category"] == self.category_filter)
+            for p in listings
+            if query in p["name"].lower() or query in p["location"].lower()
         ]
 
+    def __getstate__(self):
+        return without_cached_vars(self, super().__getstate__(), ("filtered_listings",))
+
     @rx.event
     async def sync_ui_state_providers(self):
+        """Point this session and its public UI state at the current catalog."""
+        self.catalog_version = get_catalog_version()
         ui_state = await self.get_state(UIState)
-        ui_state.providers = self.all_listings
\ No newline at end of file
+        ui_state.catalog_version = self.catalog_version
\ No newline at end of file
@@ -2,6 +2,7 @@ import reflex as rx
 from typing import TypedDict, Any
 import uuid
 from app.services.firebase_service import get_pricing_plans, save_pricing_plans
+from app.services.metrics import page_budget
 
 
 class PricingPlan(TypedDict):
@@ -36,7 +37,8 @@ class AdminPaymentPlansState(rx.State):
 
     @rx.event
     async def load_default_plans(self):
-        plans = await get_pricing_plans()
+        with page_budget("/admin/dashboard/plans"):
+            plans = await get_pricing_plans()
         if plans:
             self.pricing_plans = plans
         elif not self.pricing_plans:
@@ -4,8 +4,11 @@ import datetime
 import uuid
 from app.services.firebase_service import (
     get_payment_submissions,
-    save_payment_submissions,
+    insert_payment_submission,
+    update_payment_submission,
+    insert_provider,
 )
+from app.services.metrics import page_budget
 
 
 class PaymentSubmission(TypedDict):
@@ -29,10 +32,12 @@ class AdminPaymentSubmissionsState(rx.State):
     show_review_modal: bool = False
     selected_submission: PaymentSubmission | None = None
     rejection_notes: str = ""
+    review_error: str = ""
 
     @rx.event
     async def on_load(self):
-        self.payment_submissions = await get_payment_submissions()
+        with page_budget("/admin/dashboard/payments"):
+            self.payment_submissions = await get_payment_submissions()
 
     @rx.event
     async def add_submission(self, application_data: dict, screenshot_file: str):
@@ -58,12 +63,19 @@ class AdminPaymentSubmissionsState(rx.State):
             application_data=application_data,
         )
         self.payment_submissions.append(submission)
-        await save_payment_submissions(self.payment_submissions)
+        await insert_payment_submission(submission)
+
+    def _store_submission(self, submission: PaymentSubmission):
+        for i, s in enumerate(self.payment_submissions):
+            if s["id"] == submission["id"]:
+                self.payment_submissions[i] = submission
+                break
 
     @rx.event
     def open_review_modal(self, submission: PaymentSubmission):
         self.selected_submission = submission
         self.rejection_notes = ""
+        self.review_error = ""
         self.show_review_modal = True
 
     @rx.event
@@ -74,13 +86,11 @@ class AdminPaymentSubmissionsState(rx.State):
     @rx.event
     async def approve_payment(self):
         if self.selected_submission:
-            self.selected_submission["status"] = "Approved"
             from app.states.admin_listings_state import AdminListingsState
 
             listing_state = await self.get_state(AdminListingsState)
             app_data = self.selected_submission["application_data"]
             listing_data = {
-                "id": len(listing_state.all_listings) + 1,
                 "name": app_data["business_name"],
                 "category": app_data["category"],
                 "location": app_data["address"],
@@ -89,9 +99,15 @@ class AdminPaymentSubmissionsState(rx.State):
                 "image_url": f"https://api.dicebear.com/9.x/notionists/svg?seed={app_data['business_name'].replace(' ', '')}",
                 "featured": self.selected_submission["plan_selected"] != "Basic",
             }
-            listing_state.all_listings.append(listing_data)
+            if await insert_provider(listing_data) is None:
+                # Nothing was listed, so the submission stays Pending and
+                # the admin can approve it again.
+                self.review_error = "Could not create the listing. Please try again."
+                return
+            self.selected_submission["status"] = "Approved"
             yield listing_state.sync_ui_state_providers
-            await save_payment_submissions(self.payment_submissions)
+            self._store_submission(self.selected_submission)
+            await update_payment_submission(self.selected_submission)
             self.close_review_modal()
 
     @rx.event
@@ -99,7 +115,8 @@ class AdminPaymentSubmissionsState(rx.State):
         if self.selected_submission:
             self.selected_submission["status"] = "Rejected"
             self.selected_submission["notes"] = self.rejection_notes
-            await save_payment_submissions(self.payment_submissions)
+            self._store_submission(self.selected_submission)
+            await update_payment_submission(self.selected_submission)
             self.close_review_modal()
 
     @rx.var
@@ -1,6 +1,7 @@
 import reflex as rx
+import copy
 from typing import Any
-from app.state import ServiceCategory
+from app.state import ServiceCategory, DEFAULT_APP_SETTINGS
 from app.services.firebase_service import get_app_settings, save_app_settings
 
 
@@ -15,33 +16,7 @@ class AdminSettingsState(rx.State):
         if settings:
             self.app_settings = settings
         else:
-            self.app_settings = {
-                "app_name": "Urban Hand",
-                "hero_title": "Connecting Local Hands to Local Needs.",
-                "hero_subtitle": "Find trusted local service providers in your city, with just a few clicks.",
-                "get_listed_text": "Get Listed",
-                "accent_color": "#14b8a6",
-                "service_categories": [
-                    {"id": "1", "name": "Electrician", "icon": "zap", "enabled": True},
-                    {"id": "2", "name": "Plumber", "icon": "droplet", "enabled": True},
-                    {"id": "3", "name": "Tailor", "icon": "scissors", "enabled": True},
-                    {"id": "4", "name": "Carpenter", "icon": "hammer", "enabled": True},
-                    {
-                        "id": "5",
-                        "name": "Tiffin",
-                        "icon": "utensils-crossed",
-                        "enabled": True,
-                    },
-                    {"id": "6", "name": "Tutor", "icon": "book-user", "enabled": True},
-                    {
-                        "id": "7",
-                        "name": "Photographer",
-                        "icon": "camera",
-                        "enabled": True,
-                    },
-                    {"id": "8", "name": "Others", "icon": "ellipsis", "enabled": True},
-                ],
-            }
+            self.app_settings = copy.deepcopy(DEFAULT_APP_SETTINGS)
             await save_app_settings(self.app_settings)
         await self.sync_ui_state()
 
@@ -58,13 +33,12 @@ class AdminSettingsState(rx.State):
     @rx.event
     async def sync_ui_state(self):
         from app.state import UIState
-        from app.services.firebase_service import get_providers
+        from app.services.firebase_service import get_providers, get_catalog_version
 
         ui_state = await self.get_state(UIState)
         ui_state.app_settings = self.app_settings
         retrieved_categories = self.app_settings.get("service_categories", [])
         if isinstance(retrieved_categories, list):
             ui_state.service_categories = retrieved_categories
-        db_providers = await get_providers()
-        if db_providers:
-            ui_state.providers = db_providers
\ No newline at end of file
+        if await get_providers():
+            ui_state.catalog_version = get_catalog_version()
\ No newline at end of file
@@ -26,8 +26,11 @@ class AdminState(rx.State):
             return rx.redirect("/admin/login")
         from app.states.admin_settings_state import AdminSettingsState
 
+        from app.services.metrics import page_budget
+
         settings_state = await self.get_state(AdminSettingsState)
-        await settings_state.initialize_settings()
+        with page_budget("/admin/dashboard"):
+            await settings_state.initialize_settings()
         if not self.current_page:
             self.current_page = "App Settings"
 
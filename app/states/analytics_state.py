@@ -1,34 +1,30 @@
+import json
 import reflex as rx
-from app.services.analytics_service import log_event, update_business_stats
+from reflex.config import get_config
+from app.services.analytics_service import track_event
 
 
-class AnalyticsState(rx.State):
-    """State for handling analytics and user event tracking."""
+def track_beacon(event_type: str, provider_id: rx.Var | int) -> rx.event.EventSpec:
+    """Report an event straight to the tracking endpoint with navigator.sendBeacon.
 
-    @rx.event(background=True)
-    async def track_page_view(self, provider_id: int):
-        """Track a view event for a business profile."""
-        async with self:
-            await log_event(event_type="page_view", provider_id=provider_id)
-            await update_business_stats(provider_id, "total_views")
+    The event never enters the websocket queue, so it cannot delay other
+    events from the same session.
+    """
+    url = json.dumps(f"{get_config().api_url}/api/track")
+    return rx.call_script(
+        f"navigator.sendBeacon({url}, JSON.stringify({{event_type: {json.dumps(event_type)}, provider_id: {provider_id}}}))"
+    )
 
-    @rx.event(background=True)
-    async def track_call_click(self, provider_id: int):
-        """Track a 'Call Now' button click."""
-        async with self:
-            await log_event(event_type="call_click", provider_id=provider_id)
-            await update_business_stats(provider_id, "total_calls")
 
-    @rx.event(background=True)
-    async def track_whatsapp_click(self, provider_id: int):
-        """Track a 'Chat on WhatsApp' button click."""
-        async with self:
-            await log_event(event_type="whatsapp_click", provider_id=provider_id)
-            await update_business_stats(provider_id, "total_whatsapp")
+class AnalyticsState(rx.State):
+    """State for handling analytics and user event tracking.
+
+    Page views only queue work for the analytics writers, so they run as a
+    background event without taking the session's state lock. Button clicks
+    bypass the websocket entirely through ``track_beacon``.
+    """
 
     @rx.event(background=True)
-    async def track_share_click(self, provider_id: int):
-        """Track a 'Share Profile' button click."""
-        async with self:
-            await log_event(event_type="share_click", provider_id=provider_id)
-            await update_business_stats(provider_id, "total_shares")
\ No newline at end of file
+    async def track_page_view(self, provider_id: int):
+        """Track a view event for a business profile."""
+        await track_event("page_view", provider_id)
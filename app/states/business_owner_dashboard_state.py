@@ -1,6 +1,9 @@
 import reflex as rx
+import asyncio
 from typing import TypedDict
-from app.services.firebase_service import get_business_analytics, get_providers
+from app.services.firebase_service import get_providers
+from app.services.analytics_service import get_live_business_analytics
+from app.services.metrics import page_budget
 from app.states.business_owner_auth_state import BusinessOwnerAuthState
 
 
@@ -22,16 +25,35 @@ class BusinessOwnerDashboardState(rx.State):
         auth_state = await self.get_state(BusinessOwnerAuthState)
         if auth_state.logged_in_owner:
             provider_id = auth_state.logged_in_owner["provider_id"]
-            all_stats = await get_business_analytics()
-            for stat in all_stats:
-                if stat["provider_id"] == provider_id:
-                    self.owner_stats = stat
-                    break
-            all_providers = await get_providers()
-            for p in all_providers:
-                if p["id"] == provider_id:
-                    self.provider_name = p["name"]
-                    break
+            with page_budget("/owner/dashboard"):
+                pending = {
+                    asyncio.create_task(get_live_business_analytics()): "stats",
+                    asyncio.create_task(get_providers()): "providers",
+                }
+                while pending:
+                    done, _ = await asyncio.wait(
+                        set(pending), return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        if pending.pop(task) == "stats":
+                            self.owner_stats = next(
+                                (
+                                    stat
+                                    for stat in task.result()
+                                    if stat["provider_id"] == provider_id
+                                ),
+                                None,
+                            )
+                        else:
+                            self.provider_name = next(
+                                (
+                                    p["name"]
+                                    for p in task.result()
+                                    if p["id"] == provider_id
+                                ),
+                                "",
+                            )
+                    yield
 
     @rx.var
     def total_views(self) -> int:
@@ -1,3 +1,70 @@
+import os
 import reflex as rx
 
-config = rx.Config(app_name="app", plugins=[rx.plugins.TailwindV3Plugin()])
+config = rx.Config(
+    app_name="app",
+    plugins=[rx.plugins.TailwindV3Plugin()],
+    supabase_http2=os.environ.get("SUPABASE_HTTP2", "1") == "1",
+    supabase_max_connections=int(os.environ.get("SUPABASE_MAX_CONNECTIONS", "20")),
+    supabase_max_keepalive_connections=int(
+        os.environ.get("SUPABASE_MAX_KEEPALIVE_CONNECTIONS", "10")
+    ),
+    supabase_keepalive_expiry=float(os.environ.get("SUPABASE_KEEPALIVE_EXPIRY", "30")),
+    supabase_timeout=float(os.environ.get("SUPABASE_TIMEOUT", "10")),
+    supabase_connect_timeout=float(os.environ.get("SUPABASE_CONNECT_TIMEOUT", "5")),
+    settings_cache_ttl_seconds=float(
+        os.environ.get("SETTINGS_CACHE_TTL_SECONDS", "300")
+    ),
+    catalog_cache_ttl_seconds=float(os.environ.get("CATALOG_CACHE_TTL_SECONDS", "60")),
+    provider_cache_ttl_seconds=float(
+        os.environ.get("PROVIDER_CACHE_TTL_SECONDS", "60")
+    ),
+    provider_missing_ttl_seconds=float(
+        os.environ.get("PROVIDER_MISSING_TTL_SECONDS", "10")
+    ),
+    provider_cache_max_entries=int(
+        os.environ.get("PROVIDER_CACHE_MAX_ENTRIES", "1000")
+    ),
+    prerender_ttl_seconds=float(os.environ.get("PRERENDER_TTL_SECONDS", "300")),
+    prerender_max_age_seconds=int(os.environ.get("PRERENDER_MAX_AGE_SECONDS", "60")),
+    single_flight_timeout_seconds=float(
+        os.environ.get("SINGLE_FLIGHT_TIMEOUT_SECONDS", "15")
+    ),
+    supabase_call_timeout=float(os.environ.get("SUPABASE_CALL_TIMEOUT", "5")),
+    supabase_operation_timeouts={
+        "get_providers": 10.0,
+        "query_providers": 5.0,
+        "upsert_providers": 15.0,
+        "delete_providers": 15.0,
+        "log_event": 10.0,
+        "increment_business_stats": 10.0,
+    },
+    supabase_max_retries=int(os.environ.get("SUPABASE_MAX_RETRIES", "2")),
+    supabase_retry_budget_ratio=float(
+        os.environ.get("SUPABASE_RETRY_BUDGET_RATIO", "0.2")
+    ),
+    supabase_breaker_failure_threshold=int(
+        os.environ.get("SUPABASE_BREAKER_FAILURE_THRESHOLD", "5")
+    ),
+    supabase_breaker_reset_seconds=float(
+        os.environ.get("SUPABASE_BREAKER_RESET_SECONDS", "30")
+    ),
+    supabase_slow_query_ms=float(os.environ.get("SUPABASE_SLOW_QUERY_MS", "500")),
+    page_budget_strict=os.environ.get("PAGE_BUDGET_STRICT", "0") == "1",
+    state_size_budget_bytes=int(os.environ.get("STATE_SIZE_BUDGET_BYTES", "64000")),
+    state_size_budgets={
+        "AdminPaymentSubmissionsState": 256_000,
+    },
+    state_budget_strict=os.environ.get("STATE_BUDGET_STRICT", "0") == "1",
+    analytics_batch_size=int(os.environ.get("ANALYTICS_BATCH_SIZE", "100")),
+    analytics_flush_interval_ms=int(
+        os.environ.get("ANALYTICS_FLUSH_INTERVAL_MS", "1000")
+    ),
+    analytics_max_queue_size=int(os.environ.get("ANALYTICS_MAX_QUEUE_SIZE", "10000")),
+    analytics_stats_flush_interval_ms=int(
+        os.environ.get("ANALYTICS_STATS_FLUSH_INTERVAL_MS", "5000")
+    ),
+    analytics_stats_max_pending_keys=int(
+        os.environ.get("ANALYTICS_STATS_MAX_PENDING_KEYS", "50000")
+    ),
+)
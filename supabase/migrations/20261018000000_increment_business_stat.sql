@@ -0,0 +1,72 @@
+-- Atomic increment-or-insert for the per-provider counters in business_analytics.
+-- Applied in bulk by increment_business_stats (the next migration).
+
+-- The old select-then-insert path could race and leave several rows per
+-- provider. Fold them into one row (summing the counters) before the unique
+-- constraint goes on. The lock keeps new duplicates out meanwhile; every
+-- step is a no-op on a second run.
+LOCK TABLE business_analytics IN SHARE ROW EXCLUSIVE MODE;
+
+CREATE TEMP TABLE business_analytics_merged AS
+SELECT
+  provider_id,
+  MIN(ctid) AS keep,
+  SUM(COALESCE(total_views, 0)) AS total_views,
+  SUM(COALESCE(total_calls, 0)) AS total_calls,
+  SUM(COALESCE(total_whatsapp, 0)) AS total_whatsapp,
+  SUM(COALESCE(total_shares, 0)) AS total_shares,
+  MAX(last_viewed) AS last_viewed
+FROM business_analytics
+GROUP BY provider_id
+HAVING COUNT(*) > 1;
+
+UPDATE business_analytics AS ba
+SET total_views = m.total_views,
+    total_calls = m.total_calls,
+    total_whatsapp = m.total_whatsapp,
+    total_shares = m.total_shares,
+    last_viewed = m.last_viewed
+FROM business_analytics_merged AS m
+WHERE ba.ctid = m.keep;
+
+DELETE FROM business_analytics AS ba
+USING business_analytics_merged AS m
+WHERE ba.provider_id = m.provider_id AND ba.ctid <> m.keep;
+
+DROP TABLE business_analytics_merged;
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_constraint
+    WHERE conname = 'business_analytics_provider_id_key'
+      AND conrelid = 'business_analytics'::regclass
+  ) THEN
+    ALTER TABLE business_analytics
+      ADD CONSTRAINT business_analytics_provider_id_key UNIQUE (provider_id);
+  END IF;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION increment_business_stat(
+  p_provider_id INTEGER,
+  p_stat TEXT,
+  p_amount INTEGER DEFAULT 1
+) RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF p_stat NOT IN ('total_views', 'total_calls', 'total_whatsapp', 'total_shares') THEN
+    RAISE EXCEPTION 'Unknown business stat: %', p_stat;
+  END IF;
+
+  EXECUTE format(
+    'INSERT INTO business_analytics AS ba (provider_id, %1$I, last_viewed)
+     VALUES ($1, $2, CASE WHEN %2$L = ''total_views'' THEN NOW() END)
+     ON CONFLICT (provider_id) DO UPDATE
+       SET %1$I = COALESCE(ba.%1$I, 0) + EXCLUDED.%1$I,
+           last_viewed = CASE WHEN %2$L = ''total_views'' THEN NOW() ELSE ba.last_viewed END',
+    p_stat, p_stat
+  ) USING p_provider_id, p_amount;
+END;
+$$;
@@ -0,0 +1,19 @@
+-- Bulk variant of increment_business_stat used to flush merged counter deltas.
+-- Element i of each array describes one (provider, stat, amount) increment;
+-- all of them are applied in a single transaction.
+
+CREATE OR REPLACE FUNCTION increment_business_stats(
+  p_provider_ids INTEGER[],
+  p_stats TEXT[],
+  p_amounts INTEGER[]
+) RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  i INTEGER;
+BEGIN
+  FOR i IN 1 .. COALESCE(array_length(p_provider_ids, 1), 0) LOOP
+    PERFORM increment_business_stat(p_provider_ids[i], p_stats[i], p_amounts[i]);
+  END LOOP;
+END;
+$$;
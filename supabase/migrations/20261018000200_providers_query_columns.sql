@@ -0,0 +1,33 @@
+-- Real, indexable columns for the provider catalog, mirrored from the JSON
+-- `data` blob so filters, sorting and pagination can run in Postgres.
+-- The new columns are nullable and a trigger keeps them in sync for every
+-- write from now on. Existing rows are filled in by
+-- supabase/scripts/providers_backfill.sql, which commits in small batches and
+-- so has to run outside the migration transaction.
+
+ALTER TABLE providers
+  ADD COLUMN IF NOT EXISTS name TEXT,
+  ADD COLUMN IF NOT EXISTS category TEXT,
+  ADD COLUMN IF NOT EXISTS location TEXT,
+  ADD COLUMN IF NOT EXISTS rating REAL,
+  ADD COLUMN IF NOT EXISTS reviews INTEGER,
+  ADD COLUMN IF NOT EXISTS featured BOOLEAN;
+
+CREATE OR REPLACE FUNCTION providers_sync_columns() RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  NEW.name := COALESCE(NEW.data->>'name', '');
+  NEW.category := COALESCE(NEW.data->>'category', '');
+  NEW.location := COALESCE(NEW.data->>'location', '');
+  NEW.rating := COALESCE((NEW.data->>'rating')::REAL, 0);
+  NEW.reviews := COALESCE((NEW.data->>'reviews')::INTEGER, 0);
+  NEW.featured := COALESCE((NEW.data->>'featured')::BOOLEAN, FALSE);
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS providers_sync_columns ON providers;
+CREATE TRIGGER providers_sync_columns
+  BEFORE INSERT OR UPDATE OF data ON providers
+  FOR EACH ROW EXECUTE FUNCTION providers_sync_columns();
@@ -0,0 +1,5 @@
+-- Trigram support for the name/location search in query_providers. The
+-- indexes themselves are built concurrently by
+-- supabase/scripts/providers_query_indexes.sql, outside the migration flow.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
@@ -0,0 +1,25 @@
+-- New listings take their id from a sequence instead of max(id) + 1 over a
+-- worker's catalog snapshot, which two concurrent creations could share.
+-- The id is also stamped into the `data` blob, which is what the app reads.
+
+CREATE SEQUENCE IF NOT EXISTS providers_id_seq OWNED BY providers.id;
+SELECT setval(
+  'providers_id_seq',
+  GREATEST((SELECT MAX(id) FROM providers), 0) + 1,
+  false
+);
+ALTER TABLE providers ALTER COLUMN id SET DEFAULT nextval('providers_id_seq');
+
+CREATE OR REPLACE FUNCTION providers_stamp_id() RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  NEW.data := jsonb_set(COALESCE(NEW.data, '{}'::jsonb), '{id}', to_jsonb(NEW.id));
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS providers_stamp_id ON providers;
+CREATE TRIGGER providers_stamp_id
+  BEFORE INSERT ON providers
+  FOR EACH ROW EXECUTE FUNCTION providers_stamp_id();
@@ -0,0 +1,44 @@
+-- Lets a flush of merged counter deltas be retried safely. The caller tags
+-- each batch with an id and sends the same batch again when it cannot tell
+-- whether an earlier attempt committed (a timeout or a lost response); an id
+-- that was already applied is skipped instead of counted twice.
+
+CREATE TABLE IF NOT EXISTS business_stats_batches (
+  batch_id UUID PRIMARY KEY,
+  applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS business_stats_batches_applied_at
+  ON business_stats_batches (applied_at);
+
+-- Replaced rather than overloaded: with both signatures present PostgREST
+-- could not tell which one a three-argument call means.
+DROP FUNCTION IF EXISTS increment_business_stats(INTEGER[], TEXT[], INTEGER[]);
+
+CREATE OR REPLACE FUNCTION increment_business_stats(
+  p_provider_ids INTEGER[],
+  p_stats TEXT[],
+  p_amounts INTEGER[],
+  p_batch_id UUID DEFAULT NULL
+) RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  i INTEGER;
+BEGIN
+  IF p_batch_id IS NOT NULL THEN
+    -- A concurrent attempt with the same id waits here for the first one
+    -- to commit or roll back.
+    INSERT INTO business_stats_batches (batch_id) VALUES (p_batch_id)
+      ON CONFLICT (batch_id) DO NOTHING;
+    IF NOT FOUND THEN
+      RETURN;
+    END IF;
+    -- Retries arrive within minutes; older ids are no longer needed.
+    DELETE FROM business_stats_batches
+      WHERE applied_at < NOW() - INTERVAL '1 day';
+  END IF;
+  FOR i IN 1 .. COALESCE(array_length(p_provider_ids, 1), 0) LOOP
+    PERFORM increment_business_stat(p_provider_ids[i], p_stats[i], p_amounts[i]);
+  END LOOP;
+END;
+$$;
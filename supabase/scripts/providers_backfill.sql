@@ -0,0 +1,23 @@
+-- Backfill the query columns added in 20261018000200_providers_query_columns
+-- for rows written before the sync trigger existed. Rewriting `data` fires
+-- the trigger; each batch of 1000 rows is committed on its own so no long
+-- lock is held on the table.
+--
+-- COMMIT inside DO only works outside a transaction block, so run this after
+-- the migration with autocommit on, e.g.
+--   psql "$DATABASE_URL" -f supabase/scripts/providers_backfill.sql
+-- It is safe to re-run; finished rows are skipped.
+
+DO $$
+DECLARE
+  updated INTEGER;
+BEGIN
+  LOOP
+    UPDATE providers SET data = data
+    WHERE id IN (SELECT id FROM providers WHERE name IS NULL LIMIT 1000);
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    EXIT WHEN updated = 0;
+    COMMIT;
+  END LOOP;
+END;
+$$;
@@ -0,0 +1,21 @@
+-- Indexes behind firebase_service.query_providers, built without blocking
+-- writes. CREATE INDEX CONCURRENTLY cannot run inside a transaction block,
+-- so this is applied outside the migration flow, after the backfill:
+--   psql "$DATABASE_URL" -f supabase/scripts/providers_query_indexes.sql
+-- If a build is interrupted it leaves an INVALID index that IF NOT EXISTS
+-- would skip; drop it before re-running.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS providers_rating_idx
+  ON providers (rating DESC, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS providers_category_rating_idx
+  ON providers (category, rating DESC, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS providers_featured_rating_idx
+  ON providers (rating DESC, id) WHERE featured;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS providers_name_idx
+  ON providers (name, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS providers_reviews_idx
+  ON providers (reviews DESC, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS providers_name_trgm_idx
+  ON providers USING GIN (name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS providers_location_trgm_idx
+  ON providers USING GIN (location gin_trgm_ops);
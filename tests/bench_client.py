@@ -0,0 +1,82 @@
+"""Per-call Supabase latency: a client per call versus the pooled client.
+
+Run with ``python -m tests.bench_client [calls]``. Serves a one-row
+``app_settings`` table over real HTTP on localhost and times the same
+query made the way the app used to (``create_client`` and a blocking
+``execute`` on every call) and through the worker's pooled async client.
+Localhost has no TLS and next to no round-trip time, so against Supabase
+the gap is wider by a handshake per call.
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from supabase import create_client
+from app.services import firebase_service
+
+SETTINGS_ROW = json.dumps({"settings": {"app_name": "Urban Hand"}}).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(SETTINGS_ROW)))
+        self.end_headers()
+        self.wfile.write(SETTINGS_ROW)
+
+    def log_message(self, *args):
+        pass
+
+
+def _summary(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))]
+    return f"p50 {statistics.median(ordered) * 1000:6.2f} ms  p99 {p99 * 1000:6.2f} ms"
+
+
+def _per_call_client(url: str, calls: int) -> list[float]:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        client = create_client(url, "bench-key")
+        client.table("app_settings").select("settings").single().execute()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def _pooled_client(calls: int) -> list[float]:
+    samples = []
+    supabase = await firebase_service.get_supabase_client()
+    for _ in range(calls):
+        start = time.perf_counter()
+        await supabase.table("app_settings").select("settings").single().execute()
+        samples.append(time.perf_counter() - start)
+    await firebase_service.close_supabase_client()
+    return samples
+
+
+def main(calls: int):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ["SUPABASE_URL"] = url
+    os.environ["SUPABASE_KEY"] = "bench-key"
+    try:
+        print(f"{calls} calls against {url}")
+        print(f"  client per call  {_summary(_per_call_client(url, calls))}")
+        print(f"  pooled client    {_summary(asyncio.run(_pooled_client(calls)))}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
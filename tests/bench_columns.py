@@ -0,0 +1,78 @@
+"""Catalog filter and sort cost at scale, columns versus lists of dicts.
+
+Run with ``python -m tests.bench_columns [providers ...]`` (10k, 100k and 1M
+by default). For each size it times building the columnar view and the
+page queries it serves next to the list comprehensions and sorts they
+replaced, and reports the memory per provider of the dicts and of the
+columns built on top of them.
+"""
+
+import sys
+import time
+import tracemalloc
+from app.services.columns import ProviderColumns
+from tests.bench_search import _best_of, make_catalog
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+
+def _dict_queries(providers: list[dict]) -> dict:
+    return {
+        "featured": lambda: [p for p in providers if p["featured"]],
+        "top rated": lambda: sorted(
+            [p for p in providers if not p["featured"]],
+            key=lambda p: p["rating"],
+            reverse=True,
+        ),
+        "category + rating": lambda: [
+            p for p in providers if p["category"] == "Tailor" and p["rating"] >= 4.0
+        ],
+        "ranked category": lambda: sorted(
+            [p for p in providers if p["category"] == "Tailor"],
+            key=lambda p: p["rating"],
+            reverse=True,
+        ),
+    }
+
+
+def _column_queries(columns: ProviderColumns) -> dict:
+    return {
+        "featured": columns.featured_providers,
+        "top rated": columns.top_rated,
+        "category + rating": lambda: columns.filter("Tailor", 4.0),
+        "ranked category": lambda: columns.ranked("Tailor"),
+    }
+
+
+def _allocated(build):
+    tracemalloc.start()
+    try:
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def main(count: int):
+    providers, dict_bytes = _allocated(lambda: make_catalog(count))
+    start = time.perf_counter()
+    columns = ProviderColumns(providers)
+    build = time.perf_counter() - start
+    _, column_bytes = _allocated(lambda: ProviderColumns(providers))
+    print(f"{count} providers, columns built in {build * 1000:.0f} ms")
+    print(
+        f"  memory per provider: dicts {dict_bytes / count:.0f} B, "
+        f"columns on top {column_bytes / count:.0f} B"
+    )
+    print(f"  {'query':18} {'dicts':>10} {'columns':>10}")
+    baseline = _dict_queries(providers)
+    for name, query in _column_queries(columns).items():
+        print(
+            f"  {name:18} {_best_of(baseline[name]) * 1000:7.1f} ms "
+            f"{_best_of(query) * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    for size in [int(arg) for arg in sys.argv[1:]] or SIZES:
+        main(size)
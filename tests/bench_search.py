@@ -0,0 +1,71 @@
+"""Search latency at catalog scale.
+
+Run with ``python -m tests.bench_search [providers]``. Times the index build
+and the search page's query path (match, filter, first page) for prefixes
+a user produces while typing.
+"""
+
+import asyncio
+import random
+import sys
+import time
+from app.services.cache import ProviderCatalog
+from app.state import SEARCH_PAGE_SIZE
+
+FIRST_NAMES = ("Ramesh", "Suresh", "Priya", "Anita", "Vijay", "Kiran", "Pooja")
+TRADES = ("Plumbing", "Electricals", "Tailors", "Carpentry", "Tutors", "Painters")
+CATEGORIES = ("Plumber", "Electrician", "Tailor", "Carpenter", "Tutor", "Painter")
+LOCATIONS = ("Malviya Nagar", "Pune", "Powai", "Bandra", "Lajpat Nagar", "Kothrud")
+QUERIES = ("p", "pl", "plu", "plumb", "plumber", "plumber pune", "plumbr", "ramesh")
+
+
+def make_catalog(count: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(TRADES)} {i}",
+            "category": rng.choice(CATEGORIES),
+            "location": rng.choice(LOCATIONS),
+            "rating": round(rng.uniform(3, 5), 1),
+            "reviews": rng.randrange(200),
+            "featured": rng.random() < 0.05,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def _best_of(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(count: int):
+    catalog = ProviderCatalog(ttl=60)
+    catalog.replace(make_catalog(count))
+    start = time.perf_counter()
+    asyncio.run(_prepare(catalog))
+    print(f"{count} providers, index build {time.perf_counter() - start:.2f} s")
+    columns = catalog.columns()
+    print(f"  {'query':16} {'first page':>10} {'all matches':>12}")
+    for query in QUERIES:
+
+        def page(limit: int | None = SEARCH_PAGE_SIZE):
+            return catalog.search(query, limit, columns.accepts("All", 4.0))
+
+        print(
+            f"  {query!r:16} {_best_of(page) * 1000:7.1f} ms "
+            f"{_best_of(lambda: page(None)) * 1000:9.1f} ms"
+        )
+
+
+async def _prepare(catalog: ProviderCatalog):
+    await catalog.prepare_search_index()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
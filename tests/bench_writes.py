@@ -0,0 +1,84 @@
+"""Cost of saving listing edits at catalog scale, old path versus new.
+
+Run with ``python -m tests.bench_writes [listings]`` (10k by default).
+Against the in-process PostgREST stand-in, it compares the old save
+(delete every row, then insert the whole catalog) with the single-row
+upsert an admin edit now makes and the batched upsert used for bulk
+changes. For each it reports round trips, rows written, delete requests,
+request bytes and client-side time.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+import httpx
+from app.services import firebase_service
+from tests.conftest import reset_services
+from tests.standin import PostgrestStandIn, SUPABASE_URL, make_providers
+
+
+async def _old_save(providers: list[dict]):
+    """The pre-change save_providers, verbatim apart from being async."""
+    supabase = await firebase_service.get_supabase_client()
+    await supabase.table("providers").delete().neq("id", -1).execute()
+    await (
+        supabase.table("providers")
+        .insert([{"id": p["id"], "data": p} for p in providers])
+        .execute()
+    )
+
+
+def _measure(name: str, count: int, save):
+    server = PostgrestStandIn()
+    server.seed_providers(make_providers(count))
+    firebase_service._build_http_client = lambda: httpx.AsyncClient(
+        transport=httpx.MockTransport(server.handle)
+    )
+    reset_services()
+
+    async def main():
+        await firebase_service.get_supabase_client()
+        start = time.perf_counter()
+        await save()
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(main())
+    written = sum(
+        len(json.loads(r.content)) if r.content.startswith(b"[") else 1
+        for r in server.requests
+        if r.method == "POST"
+    )
+    deletes = sum(r.method == "DELETE" for r in server.requests)
+    print(
+        f"  {name:22} {len(server.requests):4} round trips {written:6} written "
+        f"{deletes} deletes {sum(len(r.content) for r in server.requests):10} "
+        f"bytes {elapsed * 1000:8.1f} ms"
+    )
+
+
+def main(count: int):
+    os.environ.setdefault("SUPABASE_URL", SUPABASE_URL)
+    os.environ.setdefault("SUPABASE_KEY", "bench-key")
+    providers = make_providers(count)
+    edited = {**providers[count // 2], "name": "Renamed"}
+    bulk = [{**p, "rating": 5.0} for p in providers[:100]]
+    print(f"{count} listings")
+    _measure(
+        "old: one edit",
+        count,
+        lambda: _old_save(
+            [edited if p["id"] == edited["id"] else p for p in providers]
+        ),
+    )
+    _measure("new: one edit", count, lambda: firebase_service.upsert_provider(edited))
+    _measure(
+        "new: 100-row bulk edit",
+        count,
+        lambda: firebase_service.upsert_providers(bulk),
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
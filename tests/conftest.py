@@ -0,0 +1,52 @@
+"""Shared fixtures for the data-layer tests."""
+
+import asyncio
+import httpx
+import pytest
+from app.services import analytics_service, firebase_service, metrics, resilience
+from tests.standin import SUPABASE_URL, PostgrestStandIn
+
+
+def reset_services():
+    """Return every process-wide cache, breaker and writer to a cold start."""
+    fs = firebase_service
+    fs._supabase_client = None
+    fs._http_client = None
+    fs._client_lock = asyncio.Lock()
+    fs.settings_cache.__init__(fs.settings_cache.name, fs.settings_cache.ttl)
+    fs.provider_cache.__init__(
+        fs.provider_cache.name, fs.provider_cache.ttl, fs.provider_cache.max_entries
+    )
+    fs.provider_catalog.__init__(fs.provider_catalog.ttl)
+    fs.prerendered_pages.__init__(fs.prerendered_pages.ttl)
+    fs.single_flight.__init__(fs.single_flight.default_timeout)
+    breaker = resilience.supabase_breaker
+    breaker.__init__(breaker.failure_threshold, breaker.reset_timeout)
+    budget = resilience.retry_budget
+    budget.__init__(budget.ratio, budget.max_tokens)
+    metrics._operations.clear()
+    metrics._page_loads.clear()
+    metrics._page_budget_violations.clear()
+    metrics._state_sizes.clear()
+    metrics._delta_sizes.clear()
+    metrics._state_budget_violations.clear()
+    analytics_service._event_writer = None
+    analytics_service._stats_aggregator = None
+
+
+@pytest.fixture
+def standin(monkeypatch) -> PostgrestStandIn:
+    server = PostgrestStandIn()
+    monkeypatch.setenv("SUPABASE_URL", SUPABASE_URL)
+    monkeypatch.setenv("SUPABASE_KEY", "test-key")
+    monkeypatch.setattr(
+        firebase_service,
+        "_build_http_client",
+        lambda: httpx.AsyncClient(
+            transport=httpx.MockTransport(server.handle),
+            event_hooks={"response": [metrics.record_response_bytes]},
+        ),
+    )
+    reset_services()
+    yield server
+    reset_services()
@@ -0,0 +1,374 @@
+"""An in-process PostgREST stand-in for the data layer.
+
+The stand-in answers the Supabase client through ``httpx.MockTransport``,
+so every call still goes through the pooled client, ``resilient_call`` and
+the metrics hooks exactly as in production. Plain tables live in memory;
+``business_analytics`` and its increment RPCs run against SQLite so the
+counter semantics are real SQL rather than Python arithmetic.
+"""
+
+import asyncio
+import copy
+import json
+import re
+import sqlite3
+from dataclasses import dataclass
+import httpx
+
+SUPABASE_URL = "http://supabase.test"
+INT4_MAX = 2**31 - 1
+STAT_COLUMNS = ("total_views", "total_calls", "total_whatsapp", "total_shares")
+# Mirrors supabase/migrations/..._increment_business_stat.sql.
+INCREMENT_SQL = """
+INSERT INTO business_analytics (provider_id, {stat}, last_viewed)
+VALUES (?, ?, CASE WHEN ? = 'total_views' THEN datetime('now') END)
+ON CONFLICT (provider_id) DO UPDATE
+  SET {stat} = COALESCE(business_analytics.{stat}, 0) + excluded.{stat},
+      last_viewed = CASE WHEN ? = 'total_views' THEN datetime('now')
+                         ELSE business_analytics.last_viewed END
+"""
+
+
+RESERVED_PARAMS = ("select", "order", "limit", "offset", "columns", "on_conflict")
+
+
+class UnsupportedFilter(Exception):
+    """A filter the stand-in does not implement; answered with a 400 rather
+    than treated as a match, so an untested filter cannot pass silently."""
+
+
+def _split_top_level(text: str) -> list[str]:
+    """Split a PostgREST logic tree's members on commas outside quotes and
+    parentheses."""
+    parts, depth, quoted, start, i = [], 0, False, 0, 0
+    while i < len(text):
+        char = text[i]
+        if quoted and char == "\\":
+            i += 1
+        elif char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append(text[start:i])
+            start = i + 1
+        i += 1
+    parts.append(text[start:])
+    return parts
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+@dataclass
+class Fault:
+    """One injected failure for requests matching ``method`` and ``path``."""
+
+    method: str | None
+    path: str | None
+    status: int
+    code: str | None
+    delay: float
+    times: int
+    applied: bool
+
+
+class PostgrestStandIn:
+    """Just enough of PostgREST for the queries firebase_service makes."""
+
+    def __init__(self):
+        self.tables: dict[str, list[dict]] = {
+            "providers": [],
+            "app_settings": [],
+            "pricing_plans": [],
+            "payment_submissions": [],
+            "user_analytics": [],
+            "business_owners": [],
+        }
+        self.sql = sqlite3.connect(":memory:")
+        self.sql.execute(
+            "CREATE TABLE business_analytics ("
+            "provider_id INTEGER NOT NULL UNIQUE, "
+            + ", ".join(f"{stat} INTEGER DEFAULT 0" for stat in STAT_COLUMNS)
+            + ", last_viewed TEXT)"
+        )
+        self.sql.execute(
+            "CREATE TABLE business_stats_batches (batch_id TEXT PRIMARY KEY)"
+        )
+        self.requests: list[httpx.Request] = []
+        self.latency = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._faults: list[Fault] = []
+
+    def seed_providers(self, providers: list[dict]):
+        self.tables["providers"] = [
+            {"id": p["id"], "data": copy.deepcopy(p)} for p in providers
+        ]
+
+    def inject(
+        self,
+        method: str | None = None,
+        path: str | None = None,
+        status: int = 503,
+        code: str | None = "PGRST000",
+        delay: float = 0.0,
+        times: int = 1,
+        applied: bool = False,
+    ):
+        """Fail the next ``times`` matching requests (``status`` 0 = only delay).
+
+        With ``applied`` the request is carried out first and only its
+        response is replaced by the failure, as when a reply is lost.
+        """
+        self._faults.append(Fault(method, path, status, code, delay, times, applied))
+
+    def calls(self, path: str, method: str | None = None) -> int:
+        return sum(
+            1
+            for r in self.requests
+            if r.url.path == f"/rest/v1/{path}"
+            and (method is None or r.method == method)
+        )
+
+    def counters(self, provider_id: int) -> dict[str, int] | None:
+        row = self.sql.execute(
+            f"SELECT {', '.join(STAT_COLUMNS)} FROM business_analytics "
+            "WHERE provider_id = ?",
+            (provider_id,),
+        ).fetchone()
+        return dict(zip(STAT_COLUMNS, row)) if row else None
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            fault = self._take_fault(request)
+            delay = self.latency + (fault.delay if fault else 0.0)
+            if delay:
+                await asyncio.sleep(delay)
+            if fault and fault.status and not fault.applied:
+                return self._error(fault.status, fault.code, "injected fault")
+            try:
+                response = self._respond(request)
+            except UnsupportedFilter as e:
+                return self._error(400, "PGRST100", str(e))
+            if fault and fault.status:
+                return self._error(fault.status, fault.code, "injected fault")
+            return response
+        finally:
+            self.in_flight -= 1
+
+    def _respond(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/rest/v1/")
+        if path.startswith("rpc/"):
+            return self._rpc(path.removeprefix("rpc/"), json.loads(request.content))
+        if path == "business_analytics":
+            return self._analytics(request)
+        return self._table(path, request)
+
+    def _take_fault(self, request: httpx.Request) -> Fault | None:
+        for fault in self._faults:
+            if fault.method not in (None, request.method):
+                continue
+            if fault.path not in (None, request.url.path.removeprefix("/rest/v1/")):
+                continue
+            fault.times -= 1
+            if fault.times <= 0:
+                self._faults.remove(fault)
+            return fault
+        return None
+
+    @staticmethod
+    def _error(status: int, code: str | None, message: str) -> httpx.Response:
+        return httpx.Response(
+            status,
+            json={"code": code, "message": message, "details": None, "hint": None},
+        )
+
+    @staticmethod
+    def _value(row: dict, column: str):
+        if column in row:
+            return row[column]
+        return (row.get("data") or {}).get(column)
+
+    def _matches(self, row: dict, params: httpx.QueryParams) -> bool:
+        # Every filter is evaluated, so an unsupported one always surfaces.
+        matched = []
+        for column, condition in params.multi_items():
+            if column in RESERVED_PARAMS:
+                continue
+            if column in ("and", "or"):
+                matched.append(self._logic(row, column + condition))
+            else:
+                op, _, expected = condition.partition(".")
+                matched.append(self._compare(row, column, op, expected))
+        return all(matched)
+
+    def _logic(self, row: dict, tree: str) -> bool:
+        """Evaluate ``and(...)``/``or(...)`` trees and their ``col.op.value``
+        members."""
+        for name, combine in (("and", all), ("or", any)):
+            if tree.startswith(name + "(") and tree.endswith(")"):
+                members = _split_top_level(tree[len(name) + 1 : -1])
+                return combine([self._logic(row, member) for member in members])
+        column, op, expected = (tree.split(".", 2) + ["", ""])[:3]
+        return self._compare(row, column, op, expected)
+
+    def _compare(self, row: dict, column: str, op: str, expected: str) -> bool:
+        value = self._value(row, column)
+        if isinstance(value, bool):
+            value = str(value).lower()
+        if op == "in":
+            members = _split_top_level(expected.removeprefix("(").removesuffix(")"))
+            return str(value) in {_unquote(m) for m in members}
+        expected = _unquote(expected)
+        if op == "eq":
+            return str(value) == expected
+        if op == "neq":
+            return str(value) != expected
+        if op == "ilike":
+            pattern = ".*".join(re.escape(part) for part in expected.split("*"))
+            return value is not None and bool(
+                re.fullmatch(pattern, str(value), re.IGNORECASE | re.DOTALL)
+            )
+        if op in ("gt", "gte", "lt", "lte"):
+            if value is None:
+                return False
+            if isinstance(value, (int, float)):
+                expected = float(expected)
+            return {
+                "gt": value > expected,
+                "gte": value >= expected,
+                "lt": value < expected,
+                "lte": value <= expected,
+            }[op]
+        raise UnsupportedFilter(f"unsupported filter {column}={op}.{expected}")
+
+    def _select(self, rows: list[dict], params: httpx.QueryParams) -> list[dict]:
+        for clause in reversed(params.get("order", "").split(",")):
+            if clause:
+                column, _, direction = clause.partition(".")
+                rows = sorted(
+                    rows,
+                    key=lambda r: self._value(r, column),
+                    reverse=direction.startswith("desc"),
+                )
+        offset = int(params.get("offset", 0))
+        limit = params.get("limit")
+        rows = rows[offset : offset + int(limit) if limit else None]
+        columns = [c.strip() for c in params.get("select", "*").split(",")]
+        if columns == ["*"]:
+            return rows
+        return [{c: self._value(row, c) for c in columns} for row in rows]
+
+    def _table(self, table: str, request: httpx.Request) -> httpx.Response:
+        rows = self.tables.setdefault(table, [])
+        params = request.url.params
+        # Evaluated once up front so an unsupported filter fails on an empty
+        # table too.
+        self._matches({}, params)
+        if request.method == "GET":
+            selected = self._select(
+                [r for r in rows if self._matches(r, params)], params
+            )
+            if "vnd.pgrst.object" in request.headers.get("accept", ""):
+                if len(selected) != 1:
+                    return self._error(406, "PGRST116", "not exactly one row")
+                return httpx.Response(200, json=selected[0])
+            return httpx.Response(200, json=selected)
+        if request.method == "POST":
+            body = json.loads(request.content)
+            new_rows = body if isinstance(body, list) else [body]
+            merge = "merge-duplicates" in request.headers.get("prefer", "")
+            written = []
+            by_id = {r["id"]: r for r in rows if "id" in r}
+            for new_row in copy.deepcopy(new_rows):
+                if "id" not in new_row and table == "providers":
+                    # The column default and id-stamping trigger.
+                    new_row["id"] = max(by_id, default=0) + 1
+                    new_row["data"]["id"] = new_row["id"]
+                existing = by_id.get(new_row.get("id"))
+                if existing is not None and "id" in new_row:
+                    if not merge:
+                        return self._error(409, "23505", "duplicate key value")
+                    existing.update(new_row)
+                    written.append(existing)
+                else:
+                    rows.append(new_row)
+                    written.append(new_row)
+                    if "id" in new_row:
+                        by_id[new_row["id"]] = new_row
+            return httpx.Response(201, json=written)
+        if request.method == "PATCH":
+            changes = json.loads(request.content)
+            updated = [r for r in rows if self._matches(r, params)]
+            for row in updated:
+                row.update(copy.deepcopy(changes))
+            return httpx.Response(200, json=updated)
+        if request.method == "DELETE":
+            deleted = [r for r in rows if self._matches(r, params)]
+            self.tables[table] = [r for r in rows if r not in deleted]
+            return httpx.Response(200, json=deleted)
+        return self._error(405, None, request.method)
+
+    def _analytics(self, request: httpx.Request) -> httpx.Response:
+        cursor = self.sql.execute(
+            f"SELECT provider_id, {', '.join(STAT_COLUMNS)}, last_viewed "
+            "FROM business_analytics"
+        )
+        names = [d[0] for d in cursor.description]
+        return httpx.Response(200, json=[dict(zip(names, row)) for row in cursor])
+
+    def _rpc(self, function: str, args: dict) -> httpx.Response:
+        if function == "increment_business_stat":
+            increments = [(args["p_provider_id"], args["p_stat"], args["p_amount"])]
+        elif function == "increment_business_stats":
+            increments = list(
+                zip(args["p_provider_ids"], args["p_stats"], args["p_amounts"])
+            )
+        else:
+            return self._error(404, "PGRST202", f"unknown function {function}")
+        for provider_id, stat, amount in increments:
+            if not -INT4_MAX <= provider_id <= INT4_MAX:
+                return self._error(400, "22003", "value out of range for type integer")
+            if stat not in STAT_COLUMNS:
+                return self._error(400, "P0001", f"Unknown business stat: {stat}")
+        # One transaction per call, like the plpgsql function.
+        with self.sql:
+            batch_id = args.get("p_batch_id")
+            if batch_id is not None:
+                inserted = self.sql.execute(
+                    "INSERT OR IGNORE INTO business_stats_batches VALUES (?)",
+                    (batch_id,),
+                ).rowcount
+                if not inserted:
+                    return httpx.Response(200, json=None)
+            for provider_id, stat, amount in increments:
+                self.sql.execute(
+                    INCREMENT_SQL.format(stat=stat), (provider_id, amount, stat, stat)
+                )
+        return httpx.Response(200, json=None)
+
+
+def make_providers(count: int) -> list[dict]:
+    categories = ("Plumber", "Electrician", "Tailor", "Carpenter", "Tutor")
+    return [
+        {
+            "id": i,
+            "name": f"Provider {i}",
+            "category": categories[i % len(categories)],
+            "location": ("Pune", "Mumbai", "Delhi")[i % 3],
+            "rating": round(3 + (i % 20) / 10, 1),
+            "reviews": i % 50,
+            "image_url": "",
+            "featured": i % 10 == 0,
+        }
+        for i in range(1, count + 1)
+    ]
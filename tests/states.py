@@ -0,0 +1,20 @@
+"""Detached Reflex states for driving event handlers without a server."""
+
+import inspect
+from reflex.state import BaseState, State
+
+
+def new_state(state_cls: type[BaseState]) -> BaseState:
+    """A fresh instance of ``state_cls`` inside its own root state tree."""
+    root = State(_reflex_internal_init=True)
+    return root.get_substate(state_cls.get_full_name().split(".")[1:])
+
+
+async def run_handler(state: BaseState, handler, *args) -> list:
+    """Run an event handler to completion, returning whatever it yielded."""
+    result = handler.fn(state, *args)
+    if inspect.isasyncgen(result):
+        return [update async for update in result]
+    if inspect.isawaitable(result):
+        result = await result
+    return [] if result is None else [result]
@@ -0,0 +1,140 @@
+import asyncio
+from app.services import analytics_service
+from app.services.analytics_service import BusinessStatsAggregator
+from app.services.resilience import MAX_RETRIES
+
+
+def test_parallel_increments_are_counted_exactly(standin):
+    async def main():
+        return await asyncio.gather(
+            *(
+                analytics_service.increment_business_stats(
+                    {(7, "total_views" if i % 2 else "total_calls"): 1}
+                )
+                for i in range(1000)
+            )
+        )
+
+    asyncio.run(main())
+    assert standin.counters(7) == {
+        "total_views": 500,
+        "total_calls": 500,
+        "total_whatsapp": 0,
+        "total_shares": 0,
+    }
+
+
+def test_first_increment_creates_the_row(standin):
+    async def main():
+        await asyncio.gather(
+            *(
+                analytics_service.increment_business_stats(
+                    {(provider_id, "total_shares"): 2}
+                )
+                for provider_id in (1, 2, 2)
+            )
+        )
+
+    asyncio.run(main())
+    assert standin.counters(1)["total_shares"] == 2
+    assert standin.counters(2)["total_shares"] == 4
+
+
+def _aggregator(max_pending_keys: int = 1000) -> BusinessStatsAggregator:
+    return BusinessStatsAggregator(
+        flush_interval=3600, max_pending_keys=max_pending_keys
+    )
+
+
+def test_rejected_key_is_isolated_and_the_rest_flushed(standin):
+    aggregator = _aggregator()
+
+    async def main():
+        for provider_id in range(1, 9):
+            aggregator.add(provider_id, "total_views")
+        aggregator.add(10**12, "total_views")
+        await aggregator.flush()
+        await aggregator.close()
+
+    asyncio.run(main())
+    assert all(standin.counters(i)["total_views"] == 1 for i in range(1, 9))
+    metrics = aggregator.metrics()
+    assert metrics["pending_keys"] == 0
+    assert metrics["rejected_keys"] == 1
+    assert metrics["failed_flushes"] == 0
+
+
+def test_retryable_failure_keeps_deltas_for_the_next_flush(standin):
+    aggregator = _aggregator()
+    standin.inject(
+        path="rpc/increment_business_stats", status=503, times=1 + MAX_RETRIES
+    )
+
+    async def main():
+        aggregator.add(3, "total_calls")
+        aggregator.add(3, "total_calls")
+        await aggregator.flush()
+        pending = aggregator.pending(3)
+        await aggregator.flush()
+        await aggregator.close()
+        return pending
+
+    assert asyncio.run(main()) == {"total_calls": 2}
+    assert standin.counters(3)["total_calls"] == 2
+    assert aggregator.metrics()["failed_flushes"] == 1
+
+
+def test_pending_keys_are_capped(standin):
+    aggregator = _aggregator(max_pending_keys=5)
+
+    async def main():
+        for provider_id in range(1, 11):
+            aggregator.add(provider_id, "total_views")
+        aggregator.add(1, "total_views")
+        metrics = aggregator.metrics()
+        await aggregator.close()
+        return metrics
+
+    metrics = asyncio.run(main())
+    assert metrics["pending_keys"] == 5
+    assert metrics["pending_increments"] == 6
+    assert metrics["dropped_increments"] == 5
+
+
+def test_batch_applied_before_its_response_was_lost_is_not_counted_twice(standin):
+    aggregator = _aggregator()
+    # Every attempt of the first flush commits and then loses its response.
+    standin.inject(
+        path="rpc/increment_business_stats",
+        status=504,
+        times=1 + MAX_RETRIES,
+        applied=True,
+    )
+
+    async def main():
+        aggregator.add(4, "total_views")
+        await aggregator.flush()
+        unconfirmed = aggregator.metrics()["unconfirmed_batches"]
+        aggregator.add(4, "total_views")
+        await aggregator.flush()
+        await aggregator.close()
+        return unconfirmed
+
+    assert asyncio.run(main()) == 1
+    assert standin.counters(4)["total_views"] == 2
+    assert aggregator.metrics()["unconfirmed_batches"] == 0
+
+
+def test_increments_left_at_shutdown_are_counted(standin):
+    aggregator = _aggregator()
+    standin.inject(path="rpc/increment_business_stats", status=503, times=100)
+
+    async def main():
+        aggregator.add(5, "total_calls")
+        aggregator.add(6, "total_shares")
+        await aggregator.close()
+
+    asyncio.run(main())
+    metrics = aggregator.metrics()
+    assert metrics["abandoned_increments"] == 2
+    assert metrics["unconfirmed_batches"] == metrics["pending_keys"] == 0
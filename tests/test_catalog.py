@@ -0,0 +1,45 @@
+import asyncio
+from app.services import firebase_service
+from tests.standin import make_providers
+
+
+def test_failed_write_keeps_serving_the_last_good_catalog(standin):
+    standin.seed_providers(make_providers(5))
+
+    async def main():
+        await firebase_service.get_providers()
+        standin.inject(status=503, times=100)
+        await firebase_service.upsert_provider({**make_providers(1)[0], "name": "X"})
+        return await firebase_service.get_providers()
+
+    providers = asyncio.run(main())
+    assert [p["id"] for p in providers] == [1, 2, 3, 4, 5]
+    assert firebase_service.catalog_columns() is not None
+    assert not firebase_service.provider_catalog.is_fresh()
+
+
+def test_catalog_reloads_once_the_outage_is_over(standin):
+    standin.seed_providers(make_providers(5))
+
+    async def main():
+        await firebase_service.get_providers()
+        standin.inject(status=503, times=1)
+        await firebase_service.delete_provider(5)
+        standin.tables["providers"].pop()
+        return await firebase_service.get_providers()
+
+    assert [p["id"] for p in asyncio.run(main())] == [1, 2, 3, 4]
+    assert firebase_service.provider_catalog.is_fresh()
+
+
+def test_concurrent_readers_share_one_snapshot(standin):
+    standin.seed_providers(make_providers(50))
+
+    async def main():
+        return await asyncio.gather(
+            *(firebase_service.get_providers() for _ in range(100))
+        )
+
+    snapshots = asyncio.run(main())
+    assert standin.calls("providers", "GET") == 1
+    assert all(s[0] is snapshots[0][0] for s in snapshots)
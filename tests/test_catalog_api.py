@@ -0,0 +1,117 @@
+import asyncio
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from app.api import api
+from app.middleware import PathGZipMiddleware
+from app.services import cache, firebase_service
+from tests.conftest import reset_services
+from tests.standin import make_providers
+
+
+def _client(app=api) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://app.test"
+    )
+
+
+async def _catalog_etag() -> str:
+    await firebase_service.get_providers()
+    return await firebase_service.provider_catalog.etag()
+
+
+def test_etag_survives_reloads_and_restarts(standin):
+    standin.seed_providers(make_providers(20))
+
+    async def main():
+        first = await _catalog_etag()
+        firebase_service.provider_catalog.expire()
+        reloaded = await _catalog_etag()
+        async with _client() as client:
+            response = await client.get(
+                "/api/providers", headers={"if-none-match": first}
+            )
+        return first, reloaded, response.status_code
+
+    first, reloaded, status = asyncio.run(main())
+    assert reloaded == first
+    assert status == 304
+    reset_services()
+    assert asyncio.run(_catalog_etag()) == first
+
+
+def test_etag_follows_content_changes(standin):
+    providers = make_providers(5)
+    standin.seed_providers(providers)
+
+    async def main():
+        before = await _catalog_etag()
+        await firebase_service.upsert_provider({**providers[2], "name": "Renamed"})
+        after_write = await firebase_service.provider_catalog.etag()
+        catalog = firebase_service.provider_catalog
+        recomputed = cache._digest_rows(catalog.snapshot(), {})[1]
+        return before, after_write, f'"{recomputed:032x}"'
+
+    before, after_write, recomputed = asyncio.run(main())
+    assert after_write != before
+    assert after_write == recomputed
+
+
+def test_wildcard_validator_does_not_hide_a_missing_provider(standin):
+    standin.seed_providers(make_providers(3))
+
+    async def main():
+        await firebase_service.get_providers()
+        async with _client() as client:
+            missing = await client.get(
+                "/api/providers/999", headers={"if-none-match": "*"}
+            )
+            present = await client.get(
+                "/api/providers/2", headers={"if-none-match": "*"}
+            )
+        return missing.status_code, present.status_code
+
+    assert asyncio.run(main()) == (404, 304)
+
+
+def test_gzip_is_limited_to_the_given_prefixes():
+    async def body(request):
+        return PlainTextResponse("x" * 2000)
+
+    app = PathGZipMiddleware(
+        Starlette(routes=[Route("/api/data", body), Route("/page", body)]),
+        prefixes=("/api/",),
+        minimum_size=1000,
+    )
+
+    async def main():
+        async with _client(app) as client:
+            headers = {"accept-encoding": "gzip"}
+            api_response = await client.get("/api/data", headers=headers)
+            page_response = await client.get("/page", headers=headers)
+        return api_response, page_response
+
+    api_response, page_response = asyncio.run(main())
+    assert api_response.headers.get("content-encoding") == "gzip"
+    assert "content-encoding" not in page_response.headers
+    assert api_response.text == page_response.text
+
+
+def test_listing_reloads_an_expired_catalog(standin):
+    standin.seed_providers(make_providers(3))
+
+    async def main():
+        first = await _catalog_etag()
+        standin.tables["providers"][1]["data"]["name"] = "Renamed"
+        firebase_service.provider_catalog.expire()
+        async with _client() as client:
+            response = await client.get(
+                "/api/providers", headers={"if-none-match": first}
+            )
+        return response
+
+    response = asyncio.run(main())
+    assert response.status_code == 200
+    assert "Renamed" in [p["name"] for p in response.json()["items"]]
+    assert standin.calls("providers", "GET") == 2
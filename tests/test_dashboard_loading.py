@@ -0,0 +1,71 @@
+import asyncio
+from app.services import analytics_service
+from app.states.admin_analytics_state import AdminAnalyticsState
+from app.states.admin_business_owners_state import AdminBusinessOwnersState
+from tests.standin import make_providers
+from tests.states import new_state
+
+
+def _seed(standin):
+    standin.seed_providers(make_providers(5))
+    standin.tables["user_analytics"] = [
+        {"id": i, "event_type": "page_view", "provider_id": i, "timestamp": str(i)}
+        for i in (2, 9)
+    ]
+
+    async def count_views():
+        await analytics_service.increment_business_stats({(2, "total_views"): 4})
+
+    asyncio.run(count_views())
+    standin.requests.clear()
+
+
+def _pushes(state: AdminAnalyticsState) -> list[tuple[int, list[str]]]:
+    """Total views and activity names as of each update sent to the client."""
+
+    async def main():
+        pushes = []
+        async for _ in AdminAnalyticsState.on_load.fn(state):
+            names = [a["provider_name"] for a in state.recent_activity]
+            pushes.append((sum(s["total_views"] for s in state.business_stats), names))
+        return pushes
+
+    return asyncio.run(main())
+
+
+def test_slow_stats_do_not_hold_back_the_activity_feed(standin):
+    _seed(standin)
+    standin.inject(path="business_analytics", status=0, delay=0.3)
+
+    pushes = _pushes(new_state(AdminAnalyticsState))
+    assert pushes[0][0] == 0 and pushes[0][1]
+    assert pushes[-1] == (4, ["Unknown", "Provider 2"])
+
+
+def test_activity_is_named_once_the_providers_arrive(standin):
+    _seed(standin)
+    standin.inject(path="providers", status=0, delay=0.3)
+
+    pushes = _pushes(new_state(AdminAnalyticsState))
+    assert pushes[0][1] in ([], ["", ""])
+    assert ["", ""] in [names for _, names in pushes]
+    assert pushes[-1] == (4, ["Unknown", "Provider 2"])
+
+
+def test_slow_owners_do_not_hold_back_the_provider_picker(standin):
+    standin.seed_providers(make_providers(3))
+    standin.tables["business_owners"] = [
+        {"id": "o1", "provider_id": 2, "email": "a@b.c"}
+    ]
+    standin.inject(path="business_owners", status=0, delay=0.3)
+    state = new_state(AdminBusinessOwnersState)
+
+    async def main():
+        pushes = []
+        async for _ in AdminBusinessOwnersState.load_data.fn(state):
+            pushes.append(
+                (len(state.owners), [p["id"] for p in state.unlinked_providers])
+            )
+        return pushes
+
+    assert asyncio.run(main()) == [(0, [1, 2, 3]), (1, [1, 3])]
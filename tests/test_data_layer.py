@@ -0,0 +1,56 @@
+import asyncio
+import time
+from app.services import firebase_service
+
+
+async def _max_loop_stall(coro) -> tuple[object, float]:
+    """Run ``coro`` while measuring the longest the event loop went unserviced."""
+    stalls = [0.0]
+    done = asyncio.Event()
+
+    async def ticker():
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            stalls[0] = max(stalls[0], now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    try:
+        return await coro, stalls[0]
+    finally:
+        done.set()
+        await task
+
+
+def test_slow_reads_do_not_block_the_event_loop(standin):
+    standin.latency = 0.2
+    _, stall = asyncio.run(_max_loop_stall(firebase_service.get_payment_submissions()))
+    assert stall < 0.1
+
+
+def test_concurrent_reads_overlap_instead_of_queueing(standin):
+    standin.latency = 0.2
+
+    async def main():
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(firebase_service.get_payment_submissions() for _ in range(20))
+        )
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(main())
+    assert standin.calls("payment_submissions") == 20
+    assert standin.max_in_flight == 20
+    assert elapsed < 1.0
+
+
+def test_client_is_created_once_and_reused(standin):
+    async def main():
+        clients = await asyncio.gather(
+            *(firebase_service.get_supabase_client() for _ in range(50))
+        )
+        return {id(c) for c in clients}
+
+    assert len(asyncio.run(main())) == 1
@@ -0,0 +1,99 @@
+import asyncio
+from app.services.analytics_service import AnalyticsEventWriter
+
+
+def _writer(batch_size: int = 5, flush_interval: float = 3600) -> AnalyticsEventWriter:
+    return AnalyticsEventWriter(
+        batch_size=batch_size, flush_interval=flush_interval, max_queue_size=10
+    )
+
+
+def _events(count: int) -> list[dict]:
+    return [{"event_type": "page_view", "provider_id": i} for i in range(count)]
+
+
+def test_full_batches_are_written_without_waiting(standin):
+    writer = _writer(batch_size=5)
+
+    async def main():
+        for event in _events(7):
+            writer.enqueue(event)
+        await asyncio.sleep(0.05)
+        written = len(standin.tables["user_analytics"])
+        await writer.close()
+        return written
+
+    assert asyncio.run(main()) == 5
+    assert len(standin.tables["user_analytics"]) == 7
+    assert standin.calls("user_analytics", "POST") == 2
+
+
+def test_partial_batch_is_written_after_the_interval(standin):
+    writer = _writer(batch_size=100, flush_interval=0.05)
+
+    async def main():
+        for event in _events(3):
+            writer.enqueue(event)
+        await asyncio.sleep(0.01)
+        before = len(standin.tables["user_analytics"])
+        await asyncio.sleep(0.1)
+        after = len(standin.tables["user_analytics"])
+        await writer.close()
+        return before, after
+
+    assert asyncio.run(main()) == (0, 3)
+    assert standin.calls("user_analytics", "POST") == 1
+
+
+def test_retryable_failure_puts_the_batch_back(standin):
+    writer = _writer(batch_size=4, flush_interval=0.02)
+    standin.inject(path="user_analytics", status=503)
+
+    async def main():
+        for event in _events(4):
+            writer.enqueue(event)
+        await asyncio.sleep(0.2)
+        await writer.close()
+
+    asyncio.run(main())
+    assert sorted(e["provider_id"] for e in standin.tables["user_analytics"]) == [
+        0,
+        1,
+        2,
+        3,
+    ]
+    metrics = writer.metrics()
+    assert metrics["failed_flushes"] == 1
+    assert metrics["dropped_events"] == 0
+
+
+def test_rejected_batch_is_dropped(standin):
+    writer = _writer()
+    standin.inject(path="user_analytics", status=400, code="22P02")
+
+    async def main():
+        for event in _events(3):
+            writer.enqueue(event)
+        await writer.close()
+
+    asyncio.run(main())
+    assert standin.tables["user_analytics"] == []
+    assert writer.metrics()["queue_depth"] == 0
+
+
+def test_shutdown_writes_what_is_queued_and_counts_what_it_cannot(standin):
+    writer = _writer(batch_size=4)
+
+    async def main():
+        for event in _events(6):
+            writer.enqueue(event)
+        await writer.close()
+        standin.inject(path="user_analytics", status=503, times=100)
+        for event in _events(3):
+            writer.enqueue(event)
+        await writer.close()
+
+    asyncio.run(main())
+    assert len(standin.tables["user_analytics"]) == 6
+    assert writer.metrics()["dropped_events"] == 3
+    assert writer.metrics()["queue_depth"] == 0
@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+from reflex.istate.data import RouterData
+from app.services import metrics
+from app.state import UIState
+from app.states.admin_analytics_state import AdminAnalyticsState
+from app.states.admin_business_owners_state import AdminBusinessOwnersState
+from app.states.admin_listings_state import AdminListingsState
+from app.states.admin_payment_plans_state import AdminPaymentPlansState
+from app.states.admin_payment_submissions_state import AdminPaymentSubmissionsState
+from app.states.admin_state import AdminState
+from app.states.business_owner_auth_state import BusinessOwnerAuthState
+from app.states.business_owner_dashboard_state import BusinessOwnerDashboardState
+from tests.standin import make_providers
+from tests.states import new_state, run_handler
+
+OWNER = {
+    "id": "owner-1",
+    "provider_id": 3,
+    "email": "owner@example.com",
+    "password_hash": "",
+    "full_name": "Owner One",
+}
+
+# Route -> the state and handler that load it, and the router path it runs on.
+PAGE_LOADS = {
+    "/": (UIState, UIState.load_initial_data, "/"),
+    "/search": (UIState, UIState.load_initial_data, "/search"),
+    "/business/[id]": (UIState, UIState.load_business_page, "/business/[id]"),
+    "/admin/dashboard": (AdminState, AdminState.on_load_check_auth, ""),
+    "/admin/dashboard/analytics": (
+        AdminAnalyticsState,
+        AdminAnalyticsState.on_load,
+        "",
+    ),
+    "/admin/dashboard/listings": (
+        AdminListingsState,
+        AdminListingsState.load_listings,
+        "",
+    ),
+    "/admin/dashboard/plans": (
+        AdminPaymentPlansState,
+        AdminPaymentPlansState.load_default_plans,
+        "",
+    ),
+    "/admin/dashboard/payments": (
+        AdminPaymentSubmissionsState,
+        AdminPaymentSubmissionsState.on_load,
+        "",
+    ),
+    "/admin/dashboard/owners": (
+        AdminBusinessOwnersState,
+        AdminBusinessOwnersState.load_data,
+        "",
+    ),
+    "/owner/dashboard": (
+        BusinessOwnerDashboardState,
+        BusinessOwnerDashboardState.on_load,
+        "",
+    ),
+}
+
+
+def _seed(standin):
+    standin.seed_providers(make_providers(200))
+    standin.tables["app_settings"] = [{"id": 1, "settings": {"site_name": "Local"}}]
+    standin.tables["pricing_plans"] = [
+        {"id": "basic", "data": {"id": "basic", "name": "Basic", "price": 0}}
+    ]
+    standin.tables["payment_submissions"] = [
+        {"id": "s1", "data": {"id": "s1", "status": "Pending"}}
+    ]
+    standin.tables["business_owners"] = [OWNER]
+    standin.tables["user_analytics"] = [
+        {"id": i, "event_type": "page_view", "provider_id": 3, "timestamp": str(i)}
+        for i in range(30)
+    ]
+
+
+def _state_for(state_cls, path: str):
+    state = new_state(state_cls)
+    state.router = RouterData.from_router_data(
+        {"pathname": path, "query": {"id": "3"} if "[id]" in path else {}}
+    )
+    if state_cls is BusinessOwnerDashboardState:
+        auth = state.parent_state.get_substate(
+            BusinessOwnerAuthState.get_full_name().split(".")[1:]
+        )
+        auth.logged_in_owner = OWNER
+    return state
+
+
+def test_every_page_with_an_on_load_has_a_budget():
+    import app.app
+
+    routes = {
+        "/" if route == "index" else f"/{route}"
+        for route, page in app.app.app._unevaluated_pages.items()
+        if page.on_load is not None
+    }
+    assert routes <= metrics.PAGE_BUDGETS.keys()
+    assert metrics.PAGE_BUDGETS.keys() <= PAGE_LOADS.keys()
+
+
+@pytest.mark.parametrize("route", sorted(PAGE_LOADS))
+def test_cold_page_load_matches_its_budget(standin, monkeypatch, route):
+    monkeypatch.setattr(metrics, "PAGE_BUDGET_STRICT", True)
+    _seed(standin)
+    state_cls, handler, path = PAGE_LOADS[route]
+    state = _state_for(state_cls, path)
+
+    asyncio.run(run_handler(state, handler))
+    cold_round_trips = len(standin.requests)
+    asyncio.run(run_handler(_state_for(state_cls, path), handler))
+
+    # Strict mode would have raised on either load going over budget.
+    assert metrics._page_loads == {route: 2}
+    assert metrics._page_budget_violations == {}
+    # The budget is exactly what a cold load costs, so it catches regressions.
+    assert cold_round_trips == metrics.PAGE_BUDGETS[route][0]
@@ -0,0 +1,57 @@
+import asyncio
+from app.services import firebase_service
+from app.services.prerender import HOME_PATH, PrerenderCache, business_path
+
+
+def _provider(provider_id: int, rating: float, featured: bool = False) -> dict:
+    return {"id": provider_id, "rating": rating, "featured": featured}
+
+
+def _cache(
+    rating_floor: float | None = 4.5, cache: PrerenderCache | None = None
+) -> PrerenderCache:
+    cache = cache or PrerenderCache(ttl=60)
+    cache.set(HOME_PATH, "<home>", frozenset((1, 2)), rating_floor)
+    for provider_id in (1, 2, 3):
+        cache.set(business_path(provider_id), "<profile>", frozenset((provider_id,)))
+    return cache
+
+
+def _cached(cache: PrerenderCache) -> set[str]:
+    return {
+        path
+        for path in (HOME_PATH, business_path(1), business_path(2), business_path(3))
+        if cache.get(path) is not None
+    }
+
+
+def test_edit_drops_only_that_profile_and_a_home_page_showing_it():
+    cache = _cache()
+    cache.invalidate_providers(upserted=[_provider(3, 3.0)])
+    assert _cached(cache) == {HOME_PATH, business_path(1), business_path(2)}
+    cache.invalidate_providers(deleted_ids=[2])
+    assert _cached(cache) == {business_path(1)}
+
+
+def test_home_page_follows_the_rating_floor():
+    cache = _cache(rating_floor=4.5)
+    cache.invalidate_providers(upserted=[_provider(9, 4.4)])
+    assert HOME_PATH in _cached(cache)
+    cache.invalidate_providers(upserted=[_provider(9, 4.5)])
+    assert HOME_PATH not in _cached(cache)
+
+    cache = _cache(rating_floor=4.5)
+    cache.invalidate_providers(upserted=[_provider(9, 3.0, featured=True)])
+    assert HOME_PATH not in _cached(cache)
+
+    # A top-rated section that was not full can take any provider.
+    cache = _cache(rating_floor=None)
+    cache.invalidate_providers(upserted=[_provider(9, 1.0)])
+    assert HOME_PATH not in _cached(cache)
+
+
+def test_settings_change_drops_every_page(standin):
+    _cache(cache=firebase_service.prerendered_pages)
+    assert len(_cached(firebase_service.prerendered_pages)) == 4
+    asyncio.run(firebase_service.save_app_settings({"app_name": "Renamed"}))
+    assert _cached(firebase_service.prerendered_pages) == set()
@@ -0,0 +1,82 @@
+import asyncio
+import httpx
+from app.api import api
+from app.services import firebase_service
+from tests.standin import make_providers
+
+
+def _lookups(standin) -> int:
+    return sum(
+        1
+        for r in standin.requests
+        if r.url.path.endswith("/providers") and "id" in r.url.params
+    )
+
+
+def test_listing_created_elsewhere_is_found_while_the_catalog_is_loaded(standin):
+    standin.seed_providers(make_providers(3))
+
+    async def main():
+        await firebase_service.get_providers()
+        standin.tables["providers"].append(
+            {"id": 4, "data": {**make_providers(4)[3], "name": "Elsewhere"}}
+        )
+        return await firebase_service.get_provider(
+            4
+        ), await firebase_service.get_provider(4)
+
+    first, second = asyncio.run(main())
+    assert first["name"] == second["name"] == "Elsewhere"
+    assert _lookups(standin) == 1
+
+
+def test_unknown_ids_are_negatively_cached(standin):
+    standin.seed_providers(make_providers(3))
+
+    async def main():
+        await firebase_service.get_providers()
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=api), base_url="http://app.test"
+        ) as client:
+            return [
+                (await client.get("/prerendered/business/999")).status_code
+                for _ in range(5)
+            ]
+
+    assert asyncio.run(main()) == [404] * 5
+    assert _lookups(standin) == 1
+
+
+def test_negative_entries_expire_and_are_dropped_on_create(standin, monkeypatch):
+    monkeypatch.setattr(firebase_service, "PROVIDER_MISSING_TTL", 0.05)
+
+    async def main():
+        assert await firebase_service.get_provider(1) is None
+        await asyncio.sleep(0.1)
+        assert await firebase_service.get_provider(1) is None
+        created = await firebase_service.insert_provider({"name": "New"})
+        monkeypatch.setattr(firebase_service, "PROVIDER_MISSING_TTL", 60)
+        assert await firebase_service.get_provider(2) is None
+        await firebase_service.insert_provider({"name": "Second"})
+        return created, await firebase_service.get_provider(2)
+
+    created, second = asyncio.run(main())
+    assert created["id"] == 1
+    assert second["name"] == "Second"
+    assert _lookups(standin) == 4
+
+
+def test_expired_catalog_does_not_answer_lookups(standin):
+    standin.seed_providers(make_providers(3))
+
+    async def main():
+        await firebase_service.get_providers()
+        standin.tables["providers"][1]["data"]["name"] = "Renamed"
+        firebase_service.provider_catalog.expire()
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=api), base_url="http://app.test"
+        ) as client:
+            return (await client.get("/api/providers/2")).json()
+
+    assert asyncio.run(main())["name"] == "Renamed"
+    assert _lookups(standin) == 1
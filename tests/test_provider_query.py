@@ -0,0 +1,130 @@
+import asyncio
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+from app.api import api
+from app.services import firebase_service
+from tests.standin import make_providers
+
+
+def _get_pages(params: dict) -> list[dict]:
+    async def main():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=api), base_url="http://app.test"
+        ) as client:
+            pages = []
+            offset = 0
+            while offset is not None:
+                response = await client.get(
+                    "/api/providers", params={**params, "offset": offset}
+                )
+                pages.append(response.json())
+                offset = pages[-1]["next_offset"]
+            return pages
+
+    return asyncio.run(main())
+
+
+def test_cold_worker_pages_in_postgres_in_catalog_order(standin):
+    standin.seed_providers(make_providers(60))
+    params = {"category": "Plumber", "min_rating": 3.5, "limit": 4}
+
+    cold = _get_pages(params)
+    assert standin.calls("providers", "GET") == len(cold)
+    # One row past the page tells whether there is another.
+    assert all(r.url.params["limit"] == "5" for r in standin.requests)
+    assert not firebase_service.provider_catalog.loaded
+
+    asyncio.run(firebase_service.get_providers())
+    warm = _get_pages(params)
+    assert [p["items"] for p in cold] == [p["items"] for p in warm]
+    ratings = [item["rating"] for page in warm for item in page["items"]]
+    assert ratings == sorted(ratings, reverse=True)
+    assert all(
+        item["category"] == "Plumber" and item["rating"] >= 3.5
+        for page in warm
+        for item in page["items"]
+    )
+
+
+def test_featured_filter_is_pushed_down(standin):
+    standin.seed_providers(make_providers(30))
+
+    (page,) = _get_pages({"featured": "true"})
+    assert [p["id"] for p in page["items"]] == [10, 30, 20]
+    (request,) = standin.requests
+    assert request.url.params["featured"] == "eq.true"
+
+
+def _get_cursor_pages(params: dict) -> list[dict]:
+    async def main():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=api), base_url="http://app.test"
+        ) as client:
+            pages = [(await client.get("/api/providers", params=params)).json()]
+            while pages[-1]["next_cursor"] is not None:
+                response = await client.get(
+                    "/api/providers",
+                    params={**params, "cursor": pages[-1]["next_cursor"]},
+                )
+                pages.append(response.json())
+            return pages
+
+    return asyncio.run(main())
+
+
+def _ranked_ids(providers: list[dict]) -> list[int]:
+    return [p["id"] for p in sorted(providers, key=lambda p: (-p["rating"], p["id"]))]
+
+
+def test_cursor_pages_through_rating_ties_to_the_end(standin):
+    providers = make_providers(60)
+    standin.seed_providers(providers)
+    params = {"min_rating": 3.2, "limit": 7}
+    expected = _ranked_ids([p for p in providers if p["rating"] >= 3.2])
+
+    cold = _get_cursor_pages(params)
+    seeks = [r for r in standin.requests if "id.gt." in r.url.params.get("or", "")]
+    assert len(seeks) == len(cold) - 1
+    asyncio.run(firebase_service.get_providers())
+    warm = _get_cursor_pages(params)
+
+    for pages in (cold, warm):
+        assert [p["id"] for page in pages for p in page["items"]] == expected
+        assert all(len(page["items"]) == 7 for page in pages[:-1])
+        assert pages[-1]["next_cursor"] is None
+    assert [page["next_cursor"] for page in cold] == [
+        page["next_cursor"] for page in warm
+    ]
+
+
+def test_text_filter_combines_with_the_cursor(standin):
+    providers = make_providers(40)
+    # Matched by name only; its location is Mumbai.
+    providers[0]["name"] = "Pune Plumbing"
+    standin.seed_providers(providers)
+    expected = _ranked_ids(
+        [p for p in providers if "pune" in f"{p['name']} {p['location']}".lower()]
+    )
+
+    async def main():
+        ids, cursor = [], None
+        while True:
+            page, cursor = await firebase_service.query_providers(
+                text="pune", limit=3, cursor=cursor
+            )
+            ids += [p["id"] for p in page]
+            if cursor is None:
+                return ids
+
+    assert asyncio.run(main()) == expected
+    assert 1 in expected
+
+
+def test_stand_in_rejects_filters_it_does_not_implement(standin):
+    async def main():
+        supabase = await firebase_service.get_supabase_client()
+        await supabase.table("providers").select("*").like("name", "x").execute()
+
+    with pytest.raises(APIError, match="unsupported filter"):
+        asyncio.run(main())
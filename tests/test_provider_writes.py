@@ -0,0 +1,63 @@
+import asyncio
+from app.services import firebase_service
+from tests.standin import make_providers
+
+
+def _new_listing(name: str) -> dict:
+    return {
+        "name": name,
+        "category": "Plumber",
+        "location": "Pune",
+        "rating": 0.0,
+        "reviews": 0,
+        "image_url": "",
+        "featured": False,
+    }
+
+
+def test_concurrent_creations_get_distinct_database_ids(standin):
+    standin.seed_providers(make_providers(5))
+
+    async def main():
+        await firebase_service.get_providers()
+        return await asyncio.gather(
+            *(
+                firebase_service.insert_provider(_new_listing(f"New {i}"))
+                for i in range(10)
+            )
+        )
+
+    created = asyncio.run(main())
+    ids = [p["id"] for p in created]
+    assert len(set(ids)) == 10
+    assert len(standin.tables["providers"]) == 15
+    assert standin.calls("providers", "POST") == 10
+    stored = {row["id"]: row["data"] for row in standin.tables["providers"]}
+    assert all(stored[p["id"]]["name"] == p["name"] for p in created)
+
+
+def test_created_listing_is_visible_in_the_catalog(standin):
+    standin.seed_providers(make_providers(3))
+
+    async def main():
+        await firebase_service.get_providers()
+        created = await firebase_service.insert_provider(_new_listing("Fresh"))
+        return created, await firebase_service.get_providers()
+
+    created, providers = asyncio.run(main())
+    assert created in providers
+    assert firebase_service.catalog_columns().get(created["id"]) == created
+
+
+def test_edit_writes_only_the_changed_row(standin):
+    providers = make_providers(4)
+    standin.seed_providers(providers)
+    edited = {**providers[1], "name": "Renamed"}
+
+    asyncio.run(firebase_service.upsert_provider(edited))
+
+    (request,) = standin.requests
+    assert request.method == "POST"
+    assert b"Renamed" in request.content and b"Provider 1" not in request.content
+    stored = {row["id"]: row["data"]["name"] for row in standin.tables["providers"]}
+    assert stored == {p["id"]: p["name"] for p in providers} | {edited["id"]: "Renamed"}
@@ -0,0 +1,128 @@
+import asyncio
+import json
+from app.pages.get_listed import RegistrationState
+from app.states.admin_payment_submissions_state import AdminPaymentSubmissionsState
+from tests.standin import make_providers
+from tests.states import new_state, run_handler
+
+
+def _application(plan: str) -> dict:
+    return {
+        "full_name": "Asha Patil",
+        "business_name": "Asha Tailoring",
+        "category": "Tailor",
+        "phone_number": "9800000000",
+        "whatsapp_number": "9800000000",
+        "address": "Kothrud",
+        "city": "Pune",
+        "description": "",
+        "plan": plan,
+    }
+
+
+def test_basic_application_is_queued_for_review_not_published(standin):
+    standin.seed_providers(make_providers(3))
+    state = new_state(RegistrationState)
+    state.form_data = _application("basic")
+
+    asyncio.run(run_handler(state, RegistrationState.submit_application, {}))
+
+    assert state.form_submitted
+    assert standin.calls("providers", "POST") == 0
+    (submission,) = [row["data"] for row in standin.tables["payment_submissions"]]
+    assert submission["status"] == "Pending"
+    assert submission["plan_selected"] == "Basic"
+
+
+async def _submit_and_review(standin, handler, plan: str = "basic"):
+    """Register an applicant, then run ``handler`` on their submission."""
+    state = new_state(RegistrationState)
+    state.form_data = _application(plan)
+    await run_handler(state, RegistrationState.submit_application, {})
+    admin = state.parent_state.get_substate(
+        AdminPaymentSubmissionsState.get_full_name().split(".")[1:]
+    )
+    admin.selected_submission = admin.payment_submissions[0]
+    standin.requests.clear()
+    await run_handler(admin, handler)
+    return admin
+
+
+def test_approval_lists_the_business_under_a_database_id(standin):
+    standin.seed_providers(make_providers(3))
+
+    asyncio.run(
+        _submit_and_review(standin, AdminPaymentSubmissionsState.approve_payment)
+    )
+    listed = standin.tables["providers"][-1]
+    assert listed["id"] == 4 and listed["data"]["id"] == 4
+    assert listed["data"]["name"] == "Asha Tailoring"
+    assert not listed["data"]["featured"]
+
+
+def test_submissions_are_written_one_row_at_a_time(standin):
+    standin.seed_providers(make_providers(3))
+    for name in ("Ravi", "Meena"):
+        state = new_state(RegistrationState)
+        state.form_data = {**_application("basic"), "full_name": name}
+        asyncio.run(run_handler(state, RegistrationState.submit_application, {}))
+
+    # Each applicant costs one single-row insert; nothing is deleted.
+    assert standin.calls("payment_submissions", "POST") == 2
+    assert standin.calls("payment_submissions", "DELETE") == 0
+    bodies = [json.loads(r.content) for r in standin.requests if r.method == "POST"]
+    assert [set(body) for body in bodies] == [{"id", "data"}] * 2
+    assert len(standin.tables["payment_submissions"]) == 2
+
+
+def test_reviews_update_only_the_reviewed_row(standin):
+    standin.seed_providers(make_providers(3))
+    standin.tables["payment_submissions"] = [
+        {"id": f"old-{i}", "data": {"id": f"old-{i}", "status": "Pending"}}
+        for i in range(50)
+    ]
+
+    async def main():
+        admin = await _submit_and_review(
+            standin, AdminPaymentSubmissionsState.approve_payment
+        )
+        return admin, list(standin.requests)
+
+    admin, requests = asyncio.run(main())
+    (patch,) = [r for r in requests if r.url.path.endswith("/payment_submissions")]
+    assert patch.method == "PATCH"
+    assert patch.url.params["id"] == f"eq.{admin.payment_submissions[0]['id']}"
+    statuses = {
+        row["id"]: row["data"]["status"]
+        for row in standin.tables["payment_submissions"]
+    }
+    assert statuses.pop(admin.payment_submissions[0]["id"]) == "Approved"
+    assert set(statuses.values()) == {"Pending"}
+
+
+def test_rejection_updates_one_row(standin):
+    standin.seed_providers(make_providers(3))
+
+    admin = asyncio.run(
+        _submit_and_review(standin, AdminPaymentSubmissionsState.reject_payment)
+    )
+
+    assert [r.method for r in standin.requests] == ["PATCH"]
+    assert admin.payment_submissions[0]["status"] == "Rejected"
+    (row,) = standin.tables["payment_submissions"]
+    assert row["data"]["status"] == "Rejected"
+
+
+def test_failed_listing_insert_keeps_the_submission_pending(standin):
+    standin.seed_providers(make_providers(3))
+    standin.inject("POST", "providers", status=503)
+
+    admin = asyncio.run(
+        _submit_and_review(standin, AdminPaymentSubmissionsState.approve_payment)
+    )
+
+    assert len(standin.tables["providers"]) == 3
+    assert standin.calls("payment_submissions", "PATCH") == 0
+    assert admin.payment_submissions[0]["status"] == "Pending"
+    assert admin.selected_submission["status"] == "Pending"
+    assert admin.review_error
@@ -0,0 +1,123 @@
+import asyncio
+import time
+import httpx
+from app.api import api
+from app.services import firebase_service, resilience
+from tests.standin import make_providers
+
+
+def test_hanging_call_is_cut_off_at_the_deadline(standin, monkeypatch):
+    monkeypatch.setitem(resilience.OPERATION_DEADLINES, "get_providers", 0.1)
+    standin.seed_providers(make_providers(5))
+    standin.inject(path="providers", status=0, delay=5.0, times=10)
+
+    start = time.perf_counter()
+    providers = asyncio.run(firebase_service.get_providers())
+    assert providers == []
+    assert time.perf_counter() - start < 1.0
+    assert standin.calls("providers") == 1 + resilience.MAX_RETRIES
+
+
+def test_idempotent_read_is_retried_through_transient_failures(standin):
+    standin.seed_providers(make_providers(5))
+    standin.inject(path="providers", status=503, times=2)
+
+    assert len(asyncio.run(firebase_service.get_providers())) == 5
+    assert standin.calls("providers") == 3
+    assert resilience.retry_budget.retries == 2
+    assert resilience.supabase_breaker.state == "closed"
+
+
+def test_writes_are_not_retried(standin):
+    standin.seed_providers(make_providers(5))
+    standin.inject(method="POST", path="providers", status=503)
+
+    created = asyncio.run(
+        firebase_service.insert_provider({"name": "New", "category": "Tutor"})
+    )
+    assert created is None
+    assert standin.calls("providers", "POST") == 1
+    assert len(standin.tables["providers"]) == 5
+
+
+def test_retries_stop_when_the_budget_is_spent(standin):
+    standin.seed_providers(make_providers(5))
+    standin.inject(path="providers", status=503)
+    resilience.retry_budget.tokens = 0
+
+    assert asyncio.run(firebase_service.get_providers()) == []
+    assert standin.calls("providers") == 1
+    assert resilience.retry_budget.exhausted == 1
+
+
+def test_rejected_requests_do_not_trip_the_breaker(standin):
+    standin.inject(path="app_settings", status=400, code="22P02", times=20)
+
+    async def main():
+        for _ in range(10):
+            await firebase_service.get_app_settings()
+
+    asyncio.run(main())
+    assert standin.calls("app_settings") == 10
+    assert resilience.supabase_breaker.state == "closed"
+
+
+def test_open_breaker_fails_fast_and_serves_the_last_good_values(standin):
+    standin.seed_providers(make_providers(5))
+    standin.tables["app_settings"] = [{"id": 1, "settings": {"site_name": "Local"}}]
+
+    async def main():
+        await asyncio.gather(
+            firebase_service.get_providers(), firebase_service.get_app_settings()
+        )
+        firebase_service.provider_catalog.expire()
+        firebase_service.settings_cache.expire()
+        standin.inject(status=503, times=1000)
+        results = []
+        calls_when_opened = None
+        for _ in range(5):
+            results.append(
+                await asyncio.gather(
+                    firebase_service.get_providers(),
+                    firebase_service.get_app_settings(),
+                )
+            )
+            if (
+                calls_when_opened is None
+                and resilience.supabase_breaker.state == "open"
+            ):
+                calls_when_opened = len(standin.requests)
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=api), base_url="http://app.test"
+        ) as client:
+            gauges = (await client.get("/metrics")).text
+        return results, gauges, calls_when_opened, len(standin.requests)
+
+    results, gauges, calls_when_opened, calls = asyncio.run(main())
+    breaker = resilience.supabase_breaker
+    assert breaker.state == "open"
+    # Once open, nothing more reaches Supabase.
+    assert calls_when_opened is not None and calls == calls_when_opened
+    assert resilience.supabase_breaker.rejected_calls > 0
+    for providers, settings in results:
+        assert len(providers) == 5
+        assert settings["site_name"] == "Local"
+    assert "urbanhand_supabase_breaker_open 1" in gauges
+
+
+def test_breaker_closes_after_a_successful_probe(standin, monkeypatch):
+    standin.seed_providers(make_providers(5))
+    breaker = resilience.supabase_breaker
+    # Shorter than the backoff, so the last retry goes out as the probe.
+    monkeypatch.setattr(breaker, "reset_timeout", 0.01)
+    standin.inject(path="providers", status=503, times=breaker.failure_threshold)
+
+    async def main():
+        first = await firebase_service.get_providers()
+        return first, await firebase_service.get_providers()
+
+    first, second = asyncio.run(main())
+    assert first == [] and len(second) == 5
+    assert breaker.times_opened == 1
+    assert breaker.state == "closed"
+    assert standin.calls("providers") == breaker.failure_threshold + 1
@@ -0,0 +1,148 @@
+import asyncio
+import httpx
+import random
+import pytest
+from app.api import api
+from app.services import firebase_service
+from app.services.cache import ProviderCatalog
+from app.services.search import ProviderSearchIndex
+from app.state import SEARCH_PAGE_SIZE, UIState
+from tests.bench_search import make_catalog
+from tests.standin import make_providers
+from tests.states import new_state, run_handler
+
+
+def _catalog(count: int = 3000) -> ProviderCatalog:
+    providers = make_catalog(count)
+    rng = random.Random(3)
+    for provider in providers:
+        # Distinct ratings, so no two providers tie on score.
+        provider["rating"] = rng.uniform(3, 5)
+    catalog = ProviderCatalog(ttl=60)
+    catalog.replace(providers)
+    return catalog
+
+
+@pytest.mark.parametrize(
+    "query", ["p", "pl", "plumb", "plumbr", "ramesh", "kothrud", "priya pune"]
+)
+@pytest.mark.parametrize("category, min_rating", [("All", 0.0), ("Tailor", 4.5)])
+def test_first_page_is_the_head_of_the_full_ranking(query, category, min_rating):
+    catalog = _catalog()
+    columns = catalog.columns()
+    full = columns.filter(category, min_rating, catalog.search(query))
+    page = catalog.search(query, 10, columns.accepts(category, min_rating))
+    assert [p["id"] for p in page] == [p["id"] for p in full[:10]]
+
+
+def test_edits_are_reflected_in_one_term_rankings():
+    catalog = _catalog()
+    catalog.search("tailors", 5)
+    last = catalog.search("tailors")[-1]
+    catalog.apply(upserted=[{**last, "rating": 5.0, "featured": True}])
+    full = [p["id"] for p in catalog.search("tailors")]
+    rank = full.index(last["id"])
+    assert rank < len(full) - 1
+    assert [p["id"] for p in catalog.search("tailors", rank + 1)] == full[: rank + 1]
+    catalog.apply(deleted_ids=[last["id"]])
+    assert last["id"] not in {p["id"] for p in catalog.search("tailors", len(full))}
+
+
+def test_index_is_built_off_the_request_path(standin):
+    standin.seed_providers(make_providers(50))
+
+    async def main():
+        await firebase_service.get_providers()
+        catalog = firebase_service.provider_catalog
+        await catalog._index_task
+        return catalog._search_index_version == catalog.version
+
+    assert asyncio.run(main())
+
+
+def test_search_page_sends_one_page_at_a_time(standin):
+    standin.seed_providers(make_providers(100))
+    state = new_state(UIState)
+
+    async def main():
+        await firebase_service.get_providers()
+        state.catalog_version = firebase_service.get_catalog_version()
+        state.search_query = "provider"
+        first = len(state.filtered_providers)
+        state.show_more_results()
+        return first, len(state.filtered_providers)
+
+    assert asyncio.run(main()) == (SEARCH_PAGE_SIZE, 2 * SEARCH_PAGE_SIZE)
+
+
+def test_changing_the_search_starts_over_at_one_page(standin):
+    standin.seed_providers(make_providers(100))
+    state = new_state(UIState)
+
+    async def main():
+        await firebase_service.get_providers()
+        state.catalog_version = firebase_service.get_catalog_version()
+        sizes = []
+        for handler, value in (
+            (UIState.set_search_query, "provider"),
+            (UIState.set_category_filter, "Plumber"),
+            (UIState.set_rating_filter, 4.0),
+        ):
+            state.show_more_results()
+            state.show_more_results()
+            await run_handler(state, handler, value)
+            sizes.append(state.search_result_limit)
+        return sizes
+
+    assert asyncio.run(main()) == [SEARCH_PAGE_SIZE] * 3
+
+
+def test_search_api_pages_through_the_ranking(standin):
+    standin.seed_providers(make_providers(40))
+
+    async def main():
+        full = firebase_service.search_catalog("pune")
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=api), base_url="http://app.test"
+        ) as client:
+            response = await client.get(
+                "/api/providers/search",
+                params={"q": "pune", "limit": 5, "offset": 5},
+            )
+        return full, response.json()
+
+    asyncio.run(firebase_service.get_providers())
+    full, page = asyncio.run(main())
+    assert [p["id"] for p in page["items"]] == [p["id"] for p in full[5:10]]
+    assert page["next_offset"] == 10
+
+
+def test_reloads_only_reindex_changed_rows(standin, monkeypatch):
+    providers = make_providers(50)
+    standin.seed_providers(providers)
+    catalog = firebase_service.provider_catalog
+
+    async def reload():
+        catalog.expire()
+        await firebase_service.get_providers()
+        if catalog._index_task is not None:
+            await catalog._index_task
+
+    async def main():
+        await reload()
+        version = catalog.version
+        monkeypatch.setattr(
+            ProviderSearchIndex, "rebuild", lambda *_: pytest.fail("full rebuild")
+        )
+        await reload()
+        unchanged = catalog.version == version
+        standin.tables["providers"][4]["data"]["name"] = "Zanzibar Works"
+        standin.tables["providers"].pop()
+        await reload()
+        return unchanged, catalog.search("zanzibar"), catalog.search("provider 50")
+
+    unchanged, renamed, deleted = asyncio.run(main())
+    assert unchanged
+    assert [p["id"] for p in renamed] == [5]
+    assert 50 not in [p["id"] for p in deleted]
+    assert catalog._search_index_version == catalog.version
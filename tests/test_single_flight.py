@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+from app.services import firebase_service
+from app.services.cache import SingleFlight
+from app.state import UIState
+from tests.standin import make_providers
+from tests.states import new_state, run_handler
+
+
+def test_concurrent_cold_page_loads_fetch_each_resource_once(standin):
+    standin.seed_providers(make_providers(20))
+    standin.tables["app_settings"] = [{"id": 1, "settings": {"site_name": "Local"}}]
+    standin.latency = 0.2
+    states = [new_state(UIState) for _ in range(500)]
+
+    async def main():
+        await asyncio.gather(
+            *(run_handler(state, UIState.load_initial_data) for state in states)
+        )
+
+    asyncio.run(main())
+    assert standin.calls("providers", "GET") == 1
+    assert standin.calls("app_settings", "GET") == 1
+    assert {state.catalog_version for state in states} == {
+        firebase_service.get_catalog_version()
+    }
+    assert firebase_service.single_flight.metrics()["followers"] == 998
+
+
+def test_waiters_share_the_error_and_the_next_call_retries():
+    flight = SingleFlight(default_timeout=1.0)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        if calls == 1:
+            raise RuntimeError("upstream down")
+        return calls
+
+    async def main():
+        first = await asyncio.gather(
+            *(flight.do("key", fetch) for _ in range(10)), return_exceptions=True
+        )
+        return first, await flight.do("key", fetch)
+
+    first, second = asyncio.run(main())
+    assert all(isinstance(e, RuntimeError) for e in first)
+    assert second == 2
+
+
+def test_waiter_timeout_does_not_cancel_the_shared_fetch():
+    flight = SingleFlight(default_timeout=1.0, timeouts={"slow": 0.05})
+
+    async def fetch():
+        await asyncio.sleep(0.2)
+        return "done"
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await flight.do("slow", fetch)
+        future = flight._calls["slow"]
+        return await future
+
+    assert asyncio.run(main()) == "done"
@@ -0,0 +1,53 @@
+import asyncio
+import logging
+import pytest
+from reflex.event import Event
+from app.app import app
+from app.middleware import StateSizeMiddleware
+from app.services import metrics
+from app.state import UIState
+from tests.states import new_state
+
+
+def _send_event(handler: str, **payload):
+    """Process one event on a fresh UIState and pass its update through the
+    app's middleware, as the event loop does for a websocket event."""
+    state = new_state(UIState)
+    root = state.parent_state
+    event = Event(
+        token="test-token", name=f"{UIState.get_full_name()}.{handler}", payload=payload
+    )
+
+    async def main():
+        updates = []
+        async for update in root._process(event):
+            updates.append(await app._postprocess(root, event, update))
+        return updates
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def low_budget(monkeypatch):
+    monkeypatch.setattr(metrics, "DEFAULT_STATE_SIZE_BUDGET", 10)
+    monkeypatch.setattr(metrics, "STATE_SIZE_BUDGETS", {})
+
+
+def test_middleware_is_installed():
+    assert any(isinstance(m, StateSizeMiddleware) for m in app._middlewares)
+
+
+def test_state_over_budget_is_logged_and_counted(standin, low_budget, caplog):
+    with caplog.at_level(logging.WARNING):
+        _send_event("set_search_query", value="plumber")
+    assert "UIState serializes to" in caplog.text
+    assert metrics._state_budget_violations["UIState"] == 1
+    assert 'state_serialized_bytes_count{state="UIState"} 1' in (
+        metrics.render_prometheus()
+    )
+
+
+def test_state_over_budget_fails_in_strict_mode(standin, low_budget, monkeypatch):
+    monkeypatch.setattr(metrics, "STATE_BUDGET_STRICT", True)
+    with pytest.raises(metrics.StateBudgetExceeded, match="UIState"):
+        _send_event("set_search_query", value="plumber")
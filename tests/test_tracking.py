@@ -0,0 +1,72 @@
+import asyncio
+import json
+import time
+import httpx
+from app.api import api
+from app.services import analytics_service, firebase_service
+from tests.standin import make_providers
+
+
+async def _post_track(client: httpx.AsyncClient, event_type: str, provider_id) -> int:
+    response = await client.post(
+        "/api/track",
+        content=json.dumps({"event_type": event_type, "provider_id": provider_id}),
+        headers={"content-type": "text/plain"},
+    )
+    return response.status_code
+
+
+def _client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=api), base_url="http://app.test"
+    )
+
+
+def test_unknown_or_malformed_provider_ids_are_rejected(standin):
+    standin.seed_providers(make_providers(3))
+
+    async def main():
+        await firebase_service.get_providers()
+        async with _client() as client:
+            return [
+                await _post_track(client, "page_view", 2),
+                await _post_track(client, "page_view", 999),
+                await _post_track(client, "page_view", 10**12),
+                await _post_track(client, "page_view", "abc"),
+                await _post_track(client, "bogus_event", 2),
+            ]
+
+    assert asyncio.run(main()) == [204, 400, 400, 400, 400]
+    assert list(analytics_service.get_stats_aggregator().overlay([])) == [
+        {
+            "provider_id": 2,
+            "last_viewed": "",
+            "total_views": 1,
+            "total_calls": 0,
+            "total_whatsapp": 0,
+            "total_shares": 0,
+        }
+    ]
+
+
+def test_tracking_does_not_wait_for_supabase(standin):
+    standin.seed_providers(make_providers(3))
+
+    async def main():
+        await firebase_service.get_providers()
+        standin.latency = 0.5
+        async with _client() as client:
+            start = time.perf_counter()
+            statuses = await asyncio.gather(
+                *(_post_track(client, "call_click", 1 + i % 3) for i in range(200))
+            )
+            elapsed = time.perf_counter() - start
+        await analytics_service.close_event_writer()
+        await analytics_service.close_stats_aggregator()
+        return statuses, elapsed
+
+    statuses, elapsed = asyncio.run(main())
+    assert statuses == [204] * 200
+    assert elapsed < 0.5
+    assert len(standin.tables["user_analytics"]) == 200
+    assert sum(standin.counters(i)["total_calls"] for i in (1, 2, 3)) == 200